@@ -0,0 +1,126 @@
+import numpy as np
+
+# Polymarket's taker fee is charged per share as fee_rate * min(p, 1 - p);
+# fee_rate 0 disables fees (most markets).
+DEFAULT_FEE_RATE = 0.0
+
+
+def _fees(prices, fee_rate):
+    if not fee_rate:
+        return 0.0
+    return fee_rate * np.minimum(prices, 1.0 - prices)
+
+
+def size_pair(prices_1, sizes_1, prices_2, sizes_2, edge, side="BUY", fee_rate=DEFAULT_FEE_RATE, max_size=None, min_size=0.0):
+    """
+    Walks two ladders together and finds the largest size whose *marginal* pair still clears the edge.
+
+    BUY  (asks, best = lowest first):   1 - (p1 + p2) - fees > edge
+    SELL (bids, best = highest first):  (p1 + p2) - 1 - fees > edge
+
+    Ladders are cut at every cumulative-size breakpoint of either side; inside a
+    segment both legs fill at a single price, so the marginal edge is a step function
+    that only gets worse with depth and the profitable segments form a prefix.
+
+    Args:
+        prices_1, sizes_1: ladder of leg 1 (np.ndarray, best price first)
+        prices_2, sizes_2: ladder of leg 2 (np.ndarray, best price first)
+        edge: minimum edge per pair (same units as PolyArbitrage.edge)
+        side: "BUY" to lift both asks, "SELL" to hit both bids
+        fee_rate: taker fee rate, see _fees
+        max_size: optional cap on pairs
+        min_size: plans smaller than this return size 0
+
+    Returns:
+        dict: {
+            'size': pairs to trade (0 if none),
+            'vwap_1', 'vwap_2': average fill price per leg,
+            'limit_1', 'limit_2': worst price touched per leg (use as order limit),
+            'edge': average edge per pair after fees,
+            'plan_1', 'plan_2': (prices, sizes) arrays per level to take,
+        }
+    """
+    empty = {
+        'size': 0.0, 'vwap_1': 0.0, 'vwap_2': 0.0, 'limit_1': 0.0, 'limit_2': 0.0, 'edge': 0.0,
+        'plan_1': (prices_1[:0], sizes_1[:0]), 'plan_2': (prices_2[:0], sizes_2[:0]),
+    }
+    if len(prices_1) == 0 or len(prices_2) == 0:
+        return empty
+
+    cum_1 = np.cumsum(sizes_1)
+    cum_2 = np.cumsum(sizes_2)
+
+    # segment ends: every breakpoint of either ladder, up to the shallower total
+    # (duplicates only add zero-length segments)
+    total = min(cum_1[-1], cum_2[-1])
+    if max_size is not None:
+        total = min(total, max_size)
+    ends = np.sort(np.concatenate((cum_1, cum_2)))
+    n_seg = int(np.searchsorted(ends, total)) + 1
+    ends = ends[:n_seg]
+    ends[-1] = total
+
+    # level filled inside each segment (prev_end, end]
+    idx_1 = np.searchsorted(cum_1, ends)
+    idx_2 = np.searchsorted(cum_2, ends)
+    p1 = prices_1[idx_1]
+    p2 = prices_2[idx_2]
+
+    if side == "BUY":
+        marginal = 1.0 - (p1 + p2)
+    else:
+        marginal = (p1 + p2) - 1.0
+    if fee_rate:
+        marginal = marginal - _fees(p1, fee_rate) - _fees(p2, fee_rate)
+
+    # first losing segment ends the walk
+    losing = np.flatnonzero(marginal <= edge)
+    n_ok = int(losing[0]) if len(losing) else n_seg
+    if n_ok == 0:
+        return empty
+
+    size = float(ends[n_ok - 1])
+    if size <= 0 or size < min_size:
+        return empty
+
+    seg = ends[:n_ok].copy()
+    seg[1:] -= ends[:n_ok - 1]
+    vwap_1 = float(np.dot(p1[:n_ok], seg) / size)
+    vwap_2 = float(np.dot(p2[:n_ok], seg) / size)
+
+    # every level before the last one touched is taken whole
+    n_1 = int(idx_1[n_ok - 1]) + 1
+    n_2 = int(idx_2[n_ok - 1]) + 1
+    take_1 = sizes_1[:n_1].astype(float)
+    take_2 = sizes_2[:n_2].astype(float)
+    take_1[-1] = size - (cum_1[n_1 - 2] if n_1 > 1 else 0.0)
+    take_2[-1] = size - (cum_2[n_2 - 2] if n_2 > 1 else 0.0)
+
+    return {
+        'size': size,
+        'vwap_1': vwap_1,
+        'vwap_2': vwap_2,
+        'limit_1': float(prices_1[n_1 - 1]),
+        'limit_2': float(prices_2[n_2 - 1]),
+        'edge': float(np.dot(marginal[:n_ok], seg) / size),
+        'plan_1': (prices_1[:n_1], take_1),
+        'plan_2': (prices_2[:n_2], take_2),
+    }
+
+
+def size_from_books(book_1, book_2, edge, side="BUY", depth=50, **kwargs):
+    """
+    size_pair over two orderbook_store.TickBook ladders.
+
+    Args:
+        book_1, book_2: TickBook of each leg
+        side: "BUY" walks the asks, "SELL" walks the bids
+        depth: levels per ladder
+
+    Returns:
+        dict: see size_pair
+    """
+    book_side = "SELL" if side == "BUY" else "BUY"
+    prices_1, sizes_1 = book_1.levels_array(book_side, depth)
+    prices_2, sizes_2 = book_2.levels_array(book_side, depth)
+    return size_pair(prices_1, sizes_1, prices_2, sizes_2, edge, side=side, **kwargs)
@@ -3,104 +3,446 @@ import json
 import time
 import threading
 from datetime import datetime
-from logger import setup_logger
+from concurrent.futures import ThreadPoolExecutor, wait
+from logger import setup_logger, logger_arb
+from ticker_codec import decode_ticker, TICKER_BIN_SUFFIX
+from orderbook_store import OrderBookStore
+from arb_sizing import size_from_books
+from latency import LatencyRecorder
+from decision_log import DecisionLog, NONE, BUY, SELL, BUSY
+from ticker_board import TickerBoard
+from freshness import FreshnessModel, FRESH_MAX_AGE_MS, FRESH_MIN_AGE_MS, FRESH_INTERVAL_MULT
+from freshness import start_reporter as start_freshness_reporter
+from hedge_engine import HedgeEngine
 
 r = redis.Redis(host='localhost', port=6379, db=0)
 
+# minute % 15 values with no trading: the last minute of a slot and the first
+# of the next, i.e. minute % 15 in {14, 0}: xx:14–xx:16, xx:29–xx:31,
+# xx:44–xx:46 and xx:59–xx:01. poly_socket pre-subscribes the next slot and
+# swaps tickers at the boundary, so this can be narrowed or () via
+# params["blackout_minutes"].
+BLACKOUT_MINUTES = (14, 0)
+
 class PolyArbitrage:
-    def __init__(self, client, symbol, params, redis):
+    def __init__(self, client, symbol, params, redis, executor=None, book_store=None, latency=None, decision_log=None,
+                 hedger=None):
         self.client = client
         self.symbol = symbol
         self.edge = params["edge"]
         self.sleep = params.get("sleep_time", 0.01)
+        # "poll": GET both tickers every sleep_time
+        # "event": block on the feeder's pub/sub channels and evaluate on every update
+        self.mode = params.get("mode", "poll")
         self.logger = setup_logger(f"arbitrage_{symbol}", f'./logger/{symbol}_poly_arbitrage.log')
         self.redis = redis
 
-        self.key_up = f"{symbol}_up_15m_polymarket_ticker"
-        self.key_down = f"{symbol}_down_15m_polymarket_ticker"
+        # "json": feeder's JSON tickers; "binary": packed "<key>_bin" tickers
+        # (needs TICKER_ENCODING "binary"/"both" in poly_socket, see ticker_codec.py)
+        self.encoding = params.get("encoding", "json")
+        suffix = TICKER_BIN_SUFFIX if self.encoding == "binary" else ""
+        self.key_up = f"{symbol}_up_15m_polymarket_ticker{suffix}"
+        self.key_down = f"{symbol}_down_15m_polymarket_ticker{suffix}"
 
         self.up_id = None
         self.down_id = None
 
         self.last_trade_ts = 0
 
-    def _read(self, key):
-        raw = self.redis.get(key)
+        # long-lived pool for leg orders (shared across symbols by the engine)
+        self.executor = executor or ThreadPoolExecutor(max_workers=4, thread_name_prefix=f"arb_{symbol}")
+        # seconds to wait for the leg batch before logging it late; it is still
+        # settled (and hedged) when the ack arrives
+        self.leg_deadline = params.get("leg_deadline", 2.0)
+        self.execution = None
+
+        # dry_run only logs the legs; live legs go out as one place_orders batch
+        # signed from the client's order templates (built at rollover, see _on_rollover)
+        self.dry_run = params.get("dry_run", True)
+        self.signature_type = params.get("signature_type")
+        self.order_type = params.get("order_type", "FOK")
+        self.blackout_minutes = tuple(params.get("blackout_minutes", BLACKOUT_MINUTES))
+
+        # depth sizing walks both full books (OrderBookStore, fed by the feeder's
+        # PUBLISH_BOOK_EVENTS) instead of min(top sizes); falls back to top of book
+        # while a book is missing
+        self.book_store = book_store
+        self.depth_levels = params.get("depth_levels", 50)
+        self.fee_rate = params.get("fee_rate", 0.0)
+        self.max_size = params.get("max_size")
+        self.min_size = params.get("min_size", 0.0)
+
+        # tick-to-trade stage histograms (latency.LatencyRecorder, shared by the engine)
+        self.latency = latency
+        self.last_stamp = {}
+        self.read_ts = 0
+
+        # one binary record per evaluated tick (decision_log.DecisionLog, shared by the engine);
+        # poll mode only logs when a ticker changed or something fired
+        self.decision_log = decision_log
+        self.last_logged = None
+
+        # one-legged fills are flattened on the hedge engine's worker for this symbol
+        # (hedge_engine.py, shared by the engine); busy while it works a symbol
+        self.hedger = hedger or HedgeEngine(client, params, self.logger)
+
+        # skew-corrected, per-leg adaptive staleness (freshness.py)
+        self.freshness = FreshnessModel(
+            symbol,
+            max_age_ms=params.get("fresh_max_age_ms", FRESH_MAX_AGE_MS),
+            min_age_ms=params.get("fresh_min_age_ms", FRESH_MIN_AGE_MS),
+            interval_mult=params.get("fresh_interval_mult", FRESH_INTERVAL_MULT),
+        )
+
+    def _fresh(self, t, now_ms=None):
+        return self.freshness.fresh(t, now_ms)
+
+    def _parse(self, raw):
         if not raw:
             return None
-        t = json.loads(raw)
-        if time.time() * 1000 - t["ts"] > 500:
+        if self.encoding == "binary":
+            t = decode_ticker(raw)
+        else:
+            t = json.loads(raw)
+        t["ts_rd"] = time.time() * 1000
+        return t
+
+    def _read(self, key):
+        t = self._parse(self.redis.get(key))
+        if not self._fresh(t):
             return None
         return t
 
-    def _place_leg(self, market, side, size, price, result, key):
+    def _place_legs(self, legs):
+        """
+        Sends all legs in one batch (one POST /orders) and records send/ack
+        timestamps (ms) per leg.
+
+        Args:
+            legs (list): dicts with name, market ("UP"/"DOWN"), side, size, price
+
+        Returns:
+            dict: Leg records keyed by name
+        """
+        send_ts = time.time() * 1000
+        records = {
+            leg["name"]: {**leg, "send_ts": send_ts, "ack_ts": None, "resp": None, "ok": False}
+            for leg in legs
+        }
         try:
-            # resp = self.client.place_order(
-            #     market=market,
-            #     order_side=side,
-            #     quantity=size,
-            #     order_type="LIMIT",
-            #     price=price
-            # )
-            resp = {"code": 0}
-            result[key] = resp
+            if self.dry_run:
+                resps = [{"code": 0}] * len(legs)
+            else:
+                orders = [{
+                    "token_id": self.up_id if leg["market"] == "UP" else self.down_id,
+                    "side": leg["side"],
+                    "size": leg["size"],
+                    "price": leg["price"],
+                    "order_type": self.order_type,
+                } for leg in legs]
+                result = self.client.place_orders(orders, signature_type=self.signature_type)
+                resps = result["data"] if not result.get("error") else [result] * len(legs)
         except Exception as e:
-            result[key] = e
+            resps = [e] * len(legs)
+
+        ack_ts = time.time() * 1000
+        for leg, resp in zip(legs, resps):
+            record = records[leg["name"]]
+            record["resp"] = resp
+            record["ok"] = self._leg_ok(resp)
+            record["ack_ts"] = ack_ts
+        return records
+
+    def _leg_ok(self, resp):
+        # dry run: {"code": 0}; live: place_orders entry {"index", "input", "data"} or {"error"}
+        if not isinstance(resp, dict) or resp.get("error"):
+            return False
+        return resp.get("code") == 0 or bool(resp.get("data"))
+
+    def _on_rollover(self, retired=()):
+        """
+        New UP/DOWN tokens: drops the retired tokens' books, moves the hedge
+        engine to the new market and pre-builds the new order templates off
+        the hot path.
+
+        Args:
+            retired: previous (up, down) token ids (None before the first market)
+        """
+        self.logger.info(f"{self.symbol} rollover up={self.up_id} down={self.down_id}")
+        # latency stamps are per token; only the new pair is read from here on
+        self.last_stamp = {}
+        retired = [tid for tid in retired if tid and tid not in (self.up_id, self.down_id)]
+        if self.book_store is not None and retired:
+            self.book_store.drop(retired)
+        self.hedger.rollover(self.symbol, self.up_id, self.down_id)
+        if self.dry_run or not hasattr(self.client, "prepare_order_templates"):
+            return
+        self.executor.submit(
+            self.client.prepare_order_templates,
+            token_ids=[self.up_id, self.down_id],
+            signature_type=self.signature_type
+        )
+
+    def is_executing(self):
+        if self.hedger.busy(self.symbol):
+            return True
+        return self.execution is not None and not self.execution["done"].is_set()
 
     def _execute(self, mkt_1, mkt_2, side, size, buy_px, sell_px, edge):
+        """
+        Fires both legs as one batch on the shared executor and returns at once.
+
+        Returns:
+            dict: Execution record; "future" resolves to the leg records, "done" is
+                  set once the batch acked and was settled, even past the deadline (see _settle)
+        """
         ts = time.strftime("%H:%M:%S")
         self.logger.info(
             f"[{ts}] {self.symbol} ARB {side} edge={edge:.4f} size={size}"
         )
 
-        result = {}
+        execution = {
+            "symbol": self.symbol,
+            "side": side.upper(),
+            "size": size,
+            "edge": edge,
+            "signal_ts": time.time() * 1000,
+            "read_ts": self.read_ts,
+            "future": self.executor.submit(self._place_legs, [
+                {"name": "up", "market": mkt_1, "side": side.upper(), "size": size, "price": buy_px},
+                {"name": "down", "market": mkt_2, "side": side.upper(), "size": size, "price": sell_px},
+            ]),
+            "tokens": {"UP": self.up_id, "DOWN": self.down_id},
+            "results": {},
+            "status": "PENDING",
+            "done": threading.Event(),
+        }
+        self.execution = execution
+        self.executor.submit(self._settle, execution)
+        return execution
 
-        t_buy = threading.Thread(
-            target=self._place_leg,
-            args=(mkt_1, side.upper(), size, buy_px, result, side.lower()),
-            daemon=True
-        )
+    def _settle(self, execution):
+        """
+        Waits for both legs up to leg_deadline, then settles them (_finish).
 
-        t_sell = threading.Thread(
-            target=self._place_leg,
-            args=(mkt_2, side.upper(), size, sell_px, result, side.lower()),
-            daemon=True
-        )
+        A batch still in flight at the deadline may yet fill: the execution
+        stays open ("done" unset, so the symbol does not fire again) and is
+        settled, and hedged, from the future's callback when the ack arrives.
+        """
+        future = execution["future"]
+        wait([future], timeout=self.leg_deadline)
+
+        if not future.done():
+            execution["status"] = "LATE"
+            self.logger.error(f"{self.symbol} LEGS NOT ACKED after {self.leg_deadline}s → SETTLE ON ACK")
+            future.add_done_callback(lambda _: self._finish(execution))
+            return
 
-        t_buy.start()
-        t_sell.start()
+        self._finish(execution)
+
+    def _finish(self, execution):
+        """
+        Logs the outcome of an acked batch and hands any execution with a filled
+        leg to the hedge engine (which flattens single-leg and uneven partial fills).
+        """
+        try:
+            self._settle_results(execution)
+        except Exception as e:
+            self.logger.error(f"{self.symbol} settle error {e} line: {e.__traceback__.tb_lineno}")
+        finally:
+            execution["done"].set()
 
-        t_buy.join(timeout=2)
-        t_sell.join(timeout=2)
+    def _settle_results(self, execution):
+        future = execution["future"]
+        if future.exception() is None:
+            execution["results"] = future.result()
+        else:
+            error = future.exception()
+            execution["results"] = {name: {"ok": False, "resp": error} for name in ("up", "down")}
 
         # -------- logging & sanity --------
-        buy_ok = isinstance(result.get("buy"), dict) and result["buy"].get("code") == 0
-        sell_ok = isinstance(result.get("sell"), dict) and result["sell"].get("code") == 0
+        up_ok = execution["results"]["up"]["ok"]
+        down_ok = execution["results"]["down"]["ok"]
 
-        if buy_ok and sell_ok:
+        if up_ok and down_ok:
+            execution["status"] = "FILLED"
             self.logger.info(f"{self.symbol} BOTH LEGS OK")
-        elif buy_ok and not sell_ok:
-            self.logger.error(f"{self.symbol} BUY OK / SELL FAIL → HEDGE REQUIRED")
-        elif sell_ok and not buy_ok:
-            self.logger.error(f"{self.symbol} SELL OK / BUY FAIL → HEDGE REQUIRED")
+        elif up_ok or down_ok:
+            execution["status"] = "ONE_LEG"
+            filled, missing = ("up", "down") if up_ok else ("down", "up")
+            self.logger.error(f"{self.symbol} {filled.upper()} OK / {missing.upper()} FAIL → HEDGE")
         else:
+            execution["status"] = "FAILED"
             self.logger.error(f"{self.symbol} BOTH LEGS FAILED")
 
-    def check_run_time(self):
-        minute = datetime.now().minute
+        for name, leg in execution["results"].items():
+            if leg.get("ack_ts"):
+                self.logger.info(f"{self.symbol} leg={name} ack={leg['ack_ts'] - execution['signal_ts']:.1f}ms")
+
+        if up_ok or down_ok:
+            self._hedge(execution)
 
-        # 14–16, 29–31, 44–46, 59–01
-        if minute % 15 in (14, 15, 0):
+        # legs share one batch ack
+        ack_ts = max((leg.get("ack_ts") or 0) for leg in execution["results"].values())
+        if self.latency is not None and ack_ts and execution["read_ts"]:
+            self.latency.record(self.symbol, "read_ack", ack_ts - execution["read_ts"])
+
+    def _hedge(self, execution):
+        """
+        Queues the execution on the hedge engine; it resolves the real fills and
+        evens out UP/DOWN if they differ.
+        """
+        self.hedger.submit({
+            "symbol": self.symbol,
+            "side": execution["side"],
+            "tokens": execution["tokens"],
+            "legs": execution["results"],
+            "quote": self._quote,
+        })
+
+    def _quote(self, market):
+        """
+        Latest ticker of "UP"/"DOWN" for the hedge limit check (hedge thread:
+        bypasses the freshness model), None without Redis or older than 1s.
+        """
+        if self.redis is None:
+            return None
+        t = self._parse(self.redis.get(self.key_up if market == "UP" else self.key_down))
+        if t is None or time.time() * 1000 - t.get("ts_sv", t["ts"]) > 1000:
+            return None
+        return t
+
+    def _record_latency(self, up, down):
+        """Records feeder stages once per new ticker (poll mode re-reads the same one)."""
+        for t in (up, down):
+            stamp = t.get("ts_wr_us") or t.get("ts_sv")
+            if self.last_stamp.get(t["token_id"]) != stamp:
+                self.last_stamp[t["token_id"]] = stamp
+                self.latency.record_ticker(self.symbol, t)
+        self.read_ts = max(up.get("ts_rd", 0), down.get("ts_rd", 0))
+
+    def _depth_size(self, side):
+        """
+        Sizes one direction from the full UP/DOWN books.
+
+        Returns:
+            tuple: (size, up limit price, down limit price, edge), or None to use top of book
+        """
+        if self.book_store is None:
+            return None
+        book_up = self.book_store.get(self.up_id)
+        book_down = self.book_store.get(self.down_id)
+        if book_up is None or book_down is None:
+            return None
+        plan = size_from_books(
+            book_up, book_down, self.edge, side=side, depth=self.depth_levels,
+            fee_rate=self.fee_rate, max_size=self.max_size, min_size=self.min_size
+        )
+        return plan["size"], plan["limit_1"], plan["limit_2"], plan["edge"]
+
+    def check_run_time(self, now=None):
+        minute = (now or datetime.now()).minute
+
+        if minute % 15 in self.blackout_minutes:
+            return False
+
+        return True
+
+    def _paired(self, up, down):
+        """
+        True when up and down are the two tokens of one market: the same
+        slot_ts (every feeder encoding carries it) and slug (JSON only), and
+        never one token of a new market next to the other of the current one.
+        """
+        if up.get("slot_ts") != down.get("slot_ts") or up.get("slug") != down.get("slug"):
+            return False
+        if self.up_id is not None and (up["token_id"] == self.up_id) != (down["token_id"] == self.down_id):
             return False
+        return True
 
-        return True        
+    def _evaluate(self, up, down):
+        """
+        Checks both arbitrage directions on one UP/DOWN snapshot.
+
+        Returns:
+            bool: True if an execution was fired
+        """
+        # around a rollover the two keys can briefly hold different slots
+        if not self._paired(up, down):
+            return False
+
+        if up["token_id"] != self.up_id or down["token_id"] != self.down_id:
+            retired = (self.up_id, self.down_id)
+            self.up_id = up["token_id"]
+            self.down_id = down["token_id"]
+            self._on_rollover(retired)
+
+        if self.latency is not None:
+            self._record_latency(up, down)
+
+        miss_b = 1.0 - (up["bestAsk"] + down["bestAsk"])
+        miss_s = (up["bestBid"] + down["bestBid"]) - 1
+
+        # one execution in flight per symbol
+        if self.is_executing():
+            self._log_decision(up, down, miss_b, miss_s, BUSY)
+            return False
+
+        # ---------------- ARB BUY ----------------
+        if miss_b > self.edge:
+            size, up_px, down_px, edge = self._depth_size("BUY") or (
+                min(up["askSz"], down["askSz"]), up["bestAsk"], down["bestAsk"], miss_b
+            )
+            if size > 0:
+                self._execute(
+                    "UP", "DOWN",
+                    "BUY",
+                    size,
+                    up_px,
+                    down_px,
+                    edge
+                )
+                self._log_decision(up, down, miss_b, miss_s, BUY, size, edge)
+                return True  # prevent double fire same tick
+
+        # ---------------- ARB SELL ----------------
+        if miss_s > self.edge:
+            size, up_px, down_px, edge = self._depth_size("SELL") or (
+                min(down["bidSz"], up["bidSz"]), up["bestBid"], down["bestBid"], miss_s
+            )
+            if size > 0:
+                self._execute(
+                    "UP", "DOWN",
+                    "SELL",
+                    size,
+                    up_px,
+                    down_px,
+                    edge
+                )
+                self._log_decision(up, down, miss_b, miss_s, SELL, size, edge)
+                return True
+
+        self._log_decision(up, down, miss_b, miss_s, NONE)
+        return False
+
+    def _log_decision(self, up, down, miss_b, miss_s, decision, size=0.0, edge=0.0):
+        if self.decision_log is None:
+            return
+        stamp = (up.get("ts_sv"), down.get("ts_sv"), up["ts"], down["ts"])
+        if decision == NONE and stamp == self.last_logged:
+            return
+        self.last_logged = stamp
+        self.decision_log.write(self.symbol, up, down, miss_b, miss_s, decision, size, edge)
 
     def monitor(self):
-        self.logger.info(f"Start Running POLY ARBITRAGE {self.symbol}")
-        
+        self.logger.info(f"Start Running POLY ARBITRAGE {self.symbol} mode={self.mode}")
+
+        if self.mode == "event":
+            return self.monitor_events()
+
         while True:
             try:
-                if not self.check_run_time:
+                if not self.check_run_time():
                     time.sleep(10)
                     continue
                 
@@ -111,37 +453,8 @@ class PolyArbitrage:
                     time.sleep(self.sleep)
                     continue
 
-                self.up_id = up["token_id"]
-                self.down_id = down["token_id"]
-
-                # ---------------- ARB BUY ----------------
-                miss_b = 1.0 - (up["bestAsk"] + down["bestAsk"])
-                if miss_b > self.edge:
-                    size = min(up["askSz"], down["askSz"])
-                    if size > 0:
-                        self._execute(
-                            "UP", "DOWN",
-                            "BUY",
-                            size,
-                            up["bestAsk"],
-                            down["bestAsk"],
-                            miss_b
-                        )
-                        continue  # prevent double fire same tick
-
-                # ---------------- ARB SELL ----------------
-                miss_s = (up["bestBid"] + down["bestBid"]) - 1
-                if miss_s > self.edge:
-                    size = min(down["bidSz"], up["bidSz"])
-                    if size > 0:
-                        self._execute(
-                            "UP", "DOWN",
-                            "SELL",
-                            size,
-                            up["bestBid"],
-                            down["bestBid"],
-                            miss_s
-                        )
+                if self._evaluate(up, down):
+                    continue
 
                 time.sleep(self.sleep)
 
@@ -149,26 +462,247 @@ class PolyArbitrage:
                 self.logger.error(f"{self.symbol} error: {e}")
                 time.sleep(1)
 
+    def monitor_events(self):
+        """
+        Event-driven loop: blocks on the feeder's ticker channels (one channel per
+        ticker key) and evaluates the edge as soon as either side changes.
+        """
+        channels = {
+            self.key_up.encode(): self.key_up,
+            self.key_down.encode(): self.key_down,
+        }
+
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(*channels.values())
+
+                # seed with the current state so the first update on one side
+                # can be evaluated without waiting for the other side
+                latest = {
+                    self.key_up: self._parse(self.redis.get(self.key_up)),
+                    self.key_down: self._parse(self.redis.get(self.key_down)),
+                }
+
+                for msg in pubsub.listen():
+                    if msg["type"] != "message":
+                        continue
+
+                    key = channels.get(msg["channel"], msg["channel"])
+                    latest[key] = self._parse(msg["data"])
+
+                    if not self.check_run_time():
+                        continue
+
+                    up = latest[self.key_up]
+                    down = latest[self.key_down]
+                    if not self._fresh(up) or not self._fresh(down):
+                        continue
+
+                    self._evaluate(up, down)
+
+            except Exception as e:
+                self.logger.error(f"{self.symbol} event loop error: {e}")
+                time.sleep(1)
+            finally:
+                pubsub.close()
+
+
+
+
+class PolyArbitrageEngine:
+    """
+    Runs the arbitrage check for every symbol from a single thread.
+
+    In "poll" mode all UP/DOWN tickers are fetched with one MGET per cycle;
+    in "event" mode one pub/sub connection listens to every ticker channel.
+    Each symbol keeps its own PolyArbitrage for state, logging and execution.
+    """
+    def __init__(self, client, symbols, params, redis):
+        self.redis = redis
+        self.sleep = params.get("sleep_time", 0.01)
+        self.mode = params.get("mode", "poll")
+        self.logger = logger_arb
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=params.get("executor_workers", 3 * len(symbols)),
+            thread_name_prefix="arb_engine"
+        )
+        # one book store for all symbols when depth sizing is on
+        self.book_store = None
+        if params.get("depth_sizing", False):
+            self.book_store = OrderBookStore()
+            self.book_store.start(redis)
+        # per-symbol stage latencies: periodic log line, optional localhost /metrics
+        self.latency = None
+        if params.get("latency", True):
+            self.latency = LatencyRecorder(self.logger)
+            self.latency.start_reporter(params.get("latency_log_interval", 60))
+            if params.get("metrics_port"):
+                self.latency.serve(params["metrics_port"])
+
+        self.decision_log = None
+        if params.get("decision_log", True):
+            self.decision_log = DecisionLog(params.get("decision_log_prefix", "./logger/poly_decisions"))
+
+        # one hedge engine for all symbols (a worker thread per symbol), off the order executor
+        self.hedger = HedgeEngine(client, params, self.logger)
+
+        self.arbs = [
+            PolyArbitrage(
+                client, symbol, params, redis,
+                executor=self.executor, book_store=self.book_store, latency=self.latency,
+                decision_log=self.decision_log, hedger=self.hedger
+            )
+            for symbol in symbols
+        ]
+
+        # MGET order: [up_0, down_0, up_1, down_1, ...]
+        self.keys = []
+        for arb in self.arbs:
+            self.keys.append(arb.key_up)
+            self.keys.append(arb.key_down)
+
+        # poll mode reads the feeder's shared-memory board when it runs on this
+        # host (poly_socket TICKER_BOARD_PATH); MGET covers keys not on the board
+        self.board = None
+        if params.get("ticker_board"):
+            self.board = TickerBoard(params["ticker_board"])
+        self.board_keys = [key.removesuffix(TICKER_BIN_SUFFIX) for key in self.keys]
+
+        # per-symbol stale counters (freshness.FreshnessModel)
+        if params.get("freshness_log_interval", 60):
+            start_freshness_reporter(
+                [arb.freshness for arb in self.arbs], self.logger, params.get("freshness_log_interval", 60)
+            )
+
+    def check_run_time(self):
+        return self.arbs[0].check_run_time() if self.arbs else False
+
+    def run_once(self):
+        """
+        One polling cycle: a single MGET, then every symbol evaluated in one pass.
+
+        Returns:
+            int: Number of executions fired
+        """
+        tickers = self._read_all()
+        fired = 0
+
+        for i, arb in enumerate(self.arbs):
+            up = tickers[2 * i]
+            down = tickers[2 * i + 1]
+            if not arb._fresh(up) or not arb._fresh(down):
+                continue
+            try:
+                if arb._evaluate(up, down):
+                    fired += 1
+            except Exception as e:
+                self.logger.error(f"{arb.symbol} error: {e}")
+
+        return fired
+
+    def _read_all(self):
+        """
+        Latest ticker of every key, in MGET order: from the board when every
+        key is on it and every UP/DOWN pair is from one slot, else one MGET.
 
+        The feeder writes board slots one at a time, so around a rollover the
+        board can hold a new UP next to an old DOWN; the MGET side gets the
+        rollover in one MULTI/EXEC.
+
+        Returns:
+            list: Ticker dicts (None where missing)
+        """
+        if self.board is not None:
+            tickers = [self.board.read(key) for key in self.board_keys]
+            if None not in tickers and all(
+                tickers[i]["slot_ts"] == tickers[i + 1]["slot_ts"] for i in range(0, len(tickers), 2)
+            ):
+                return tickers
+
+        raws = self.redis.mget(self.keys)
+        return [self.arbs[i // 2]._parse(raw) for i, raw in enumerate(raws)]
+
+    def run(self):
+        self.logger.info(f"Start Running POLY ARBITRAGE ENGINE {[a.symbol for a in self.arbs]} mode={self.mode}")
+
+        if self.mode == "event":
+            return self.run_events()
+
+        while True:
+            try:
+                if not self.check_run_time():
+                    time.sleep(10)
+                    continue
+
+                if self.run_once():
+                    continue
+
+                time.sleep(self.sleep)
+
+            except Exception as e:
+                self.logger.error(f"engine error: {e}")
+                time.sleep(1)
+
+    def run_events(self):
+        """
+        Event-driven loop over every symbol on one pub/sub connection.
+        """
+        # channel -> (arb, is_up)
+        routes = {}
+        for arb in self.arbs:
+            routes[arb.key_up.encode()] = (arb, True)
+            routes[arb.key_down.encode()] = (arb, False)
+
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(*self.keys)
+
+                raws = self.redis.mget(self.keys)
+                latest = {}
+                for i, arb in enumerate(self.arbs):
+                    latest[arb.symbol] = [arb._parse(raws[2 * i]), arb._parse(raws[2 * i + 1])]
+
+                for msg in pubsub.listen():
+                    if msg["type"] != "message":
+                        continue
+
+                    route = routes.get(msg["channel"])
+                    if route is None:
+                        continue
+
+                    arb, is_up = route
+                    state = latest[arb.symbol]
+                    state[0 if is_up else 1] = arb._parse(msg["data"])
+
+                    if not self.check_run_time():
+                        continue
+
+                    up, down = state
+                    if not arb._fresh(up) or not arb._fresh(down):
+                        continue
+
+                    try:
+                        arb._evaluate(up, down)
+                    except Exception as e:
+                        self.logger.error(f"{arb.symbol} error: {e}")
+
+            except Exception as e:
+                self.logger.error(f"engine event loop error: {e}")
+                time.sleep(1)
+            finally:
+                pubsub.close()
 
 
 TICKERS = ["ETH", "BTC", "SOL", "XRP"]
-threads = []
 
-for symbol in TICKERS:
-    arb = PolyArbitrage(
+if __name__ == "__main__":
+    engine = PolyArbitrageEngine(
         client="client",                      # real client, not string
-        symbol=symbol,
-        params={"edge": 0.002, "sleep_time": 0.05},
+        symbols=TICKERS,
+        params={"edge": 0.002, "sleep_time": 0.05, "mode": "event", "encoding": "json"},
         redis=r
     )
-
-    th = threading.Thread(
-        target=arb.monitor,   
-        daemon=True
-    )
-    th.start()
-    threads.append(th)
-
-while True:
-    time.sleep(10)
\ No newline at end of file
+    engine.run()
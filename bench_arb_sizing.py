@@ -0,0 +1,156 @@
+"""
+Cost of depth-aware sizing (arb_sizing.size_pair) for two 50-level ladders.
+
+    python bench_arb_sizing.py
+
+--check compares size_pair with a level-by-level brute-force walk on random
+ladders (bid and ask sides, fees, max_size / min_size caps): size, VWAP,
+worst price, edge and plan must match.
+
+    python bench_arb_sizing.py --check [--cases 3000]
+"""
+import argparse
+import math
+import sys
+import time
+
+import numpy as np
+
+from arb_sizing import size_pair
+
+LEVELS = 50
+N = 20_000
+
+
+def _ladder(rng, best, step):
+    prices = np.round(best + step * np.arange(LEVELS), 3)
+    sizes = rng.uniform(5, 200, LEVELS).round(2)
+    return prices, sizes
+
+
+def brute_force(prices_1, sizes_1, prices_2, sizes_2, edge, side="BUY", fee_rate=0.0, max_size=None, min_size=0.0):
+    """
+    size_pair the slow way: take both legs level by level in chunks of
+    min(left on level 1, left on level 2, left under max_size) while the
+    chunk's pair clears the edge.
+    """
+    def fee(p):
+        return fee_rate * min(p, 1.0 - p) if fee_rate else 0.0
+
+    cap = math.inf if max_size is None else max_size
+    i = j = 0
+    left_1, left_2 = float(sizes_1[0]), float(sizes_2[0])
+    size = cost_1 = cost_2 = gained = 0.0
+    plan_1, plan_2 = {}, {}
+    while i < len(prices_1) and j < len(prices_2) and size < cap:
+        p1, p2 = float(prices_1[i]), float(prices_2[j])
+        marginal = (1.0 - (p1 + p2)) if side == "BUY" else ((p1 + p2) - 1.0)
+        marginal = marginal - fee(p1) - fee(p2)
+        if marginal <= edge:
+            break
+        chunk = min(left_1, left_2, cap - size)
+        if chunk > 0:
+            size += chunk
+            cost_1 += p1 * chunk
+            cost_2 += p2 * chunk
+            gained += marginal * chunk
+            plan_1[i] = plan_1.get(i, 0.0) + chunk
+            plan_2[j] = plan_2.get(j, 0.0) + chunk
+        left_1 -= chunk
+        left_2 -= chunk
+        if left_1 <= 0:
+            i += 1
+            left_1 = float(sizes_1[i]) if i < len(sizes_1) else 0.0
+        if left_2 <= 0:
+            j += 1
+            left_2 = float(sizes_2[j]) if j < len(sizes_2) else 0.0
+
+    if size <= 0 or size < min_size:
+        return {"size": 0.0, "plan_1": [], "plan_2": []}
+    return {
+        "size": size,
+        "vwap_1": cost_1 / size,
+        "vwap_2": cost_2 / size,
+        "limit_1": float(prices_1[max(plan_1)]),
+        "limit_2": float(prices_2[max(plan_2)]),
+        "edge": gained / size,
+        "plan_1": [(float(prices_1[k]), plan_1[k]) for k in sorted(plan_1)],
+        "plan_2": [(float(prices_2[k]), plan_2[k]) for k in sorted(plan_2)],
+    }
+
+
+def _random_case(rng):
+    side = "BUY" if rng.random() < 0.5 else "SELL"
+    legs = []
+    for _ in range(2):
+        n = int(rng.integers(1, 21))
+        # asks rise from the best price, bids fall; 0 steps give equal-priced levels
+        best = rng.uniform(0.3, 0.6) if side == "BUY" else rng.uniform(0.4, 0.7)
+        steps = rng.choice([0.0, 0.001, 0.01, 0.02], n) * (1 if side == "BUY" else -1)
+        steps[0] = 0.0
+        prices = np.clip(np.round(best + np.cumsum(steps), 3), 0.001, 0.999)
+        sizes = rng.uniform(1, 200, n).round(2)
+        legs += [prices, sizes]
+    kwargs = {
+        "side": side,
+        "fee_rate": float(rng.choice([0.0, 0.02, rng.uniform(0, 0.1)])),
+        "max_size": None if rng.random() < 0.5 else round(rng.uniform(1, 500), 2),
+        "min_size": 0.0 if rng.random() < 0.7 else round(rng.uniform(1, 100), 2),
+    }
+    return legs, float(rng.uniform(0, 0.03)), kwargs
+
+
+def check(cases):
+    """Random size_pair vs brute_force comparisons; returns the number of mismatches."""
+    rng = np.random.default_rng(12)
+    close = lambda a, b: math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    failures = traded = 0
+    for case in range(cases):
+        legs, edge, kwargs = _random_case(rng)
+        got = size_pair(*legs, edge, **kwargs)
+        want = brute_force(*legs, edge, **kwargs)
+
+        ok = close(got["size"], want["size"])
+        if ok and want["size"]:
+            traded += 1
+            ok = all(close(got[k], want[k]) for k in ("vwap_1", "vwap_2", "limit_1", "limit_2", "edge"))
+            for leg in ("plan_1", "plan_2"):
+                prices, sizes = got[leg]
+                ok = ok and len(prices) == len(want[leg]) and all(
+                    close(float(p), wp) and close(float(q), wq) for p, q, (wp, wq) in zip(prices, sizes, want[leg])
+                )
+        if not ok:
+            failures += 1
+            if failures <= 5:
+                print(f"case {case} {kwargs} edge={edge:.4f}\n  size_pair   {got}\n  brute_force {want}")
+    print(f"size_pair vs brute force: {cases} cases ({traded} traded), {failures} mismatches")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--cases", type=int, default=3000)
+    args = parser.parse_args()
+    if args.check:
+        sys.exit(1 if check(args.cases) else 0)
+
+    rng = np.random.default_rng(7)
+    up_p, up_s = _ladder(rng, 0.45, 0.01)
+    down_p, down_s = _ladder(rng, 0.50, 0.01)
+
+    plan = size_pair(up_p, up_s, down_p, down_s, edge=0.002)
+    top = min(up_s[0], down_s[0])
+    print(f"top-of-book size {top:.2f} -> depth size {plan['size']:.2f} "
+          f"(vwap {plan['vwap_1']:.4f} + {plan['vwap_2']:.4f}, edge {plan['edge']:.4f}, "
+          f"levels {len(plan['plan_1'][0])}/{len(plan['plan_2'][0])})")
+
+    for name, kwargs in (("no fees", {}), ("fee_rate 0.02", {"fee_rate": 0.02})):
+        start = time.perf_counter()
+        for _ in range(N):
+            size_pair(up_p, up_s, down_p, down_s, 0.002, **kwargs)
+        print(f"size_pair {LEVELS}x{LEVELS} {name:<14} {(time.perf_counter() - start) / N * 1e6:6.1f} us/op")
+
+
+if __name__ == "__main__":
+    main()
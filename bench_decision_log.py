@@ -0,0 +1,65 @@
+"""
+Cost of one decision record vs one formatted log line, and load time for 1M records.
+
+    python bench_decision_log.py
+"""
+import logging
+import os
+import tempfile
+import time
+
+from decision_log import DecisionLog, load_decisions, to_frame, NONE
+from logger import FORMAT
+
+N = 200_000
+LOAD_ROWS = 1_000_000
+
+
+def main():
+    tmp = tempfile.mkdtemp()
+    up = {"ts": 1766378123456, "ts_sv": 1766378123460, "bestBid": 0.45, "bestAsk": 0.47}
+    down = {"ts": 1766378123401, "ts_sv": 1766378123410, "bestBid": 0.51, "bestAsk": 0.53}
+    miss_b = 1.0 - (up["bestAsk"] + down["bestAsk"])
+    miss_s = (up["bestBid"] + down["bestBid"]) - 1
+
+    log = DecisionLog(os.path.join(tmp, "decisions"))
+    start = time.perf_counter()
+    for _ in range(N):
+        log.write("BTC", up, down, miss_b, miss_s, NONE)
+    write_us = (time.perf_counter() - start) / N * 1e6
+    log.close()
+
+    handler = logging.FileHandler(os.path.join(tmp, "text.log"))
+    handler.setFormatter(logging.Formatter(FORMAT))
+    text = logging.getLogger("bench_decision_text")
+    text.addHandler(handler)
+    text.propagate = False
+    text.setLevel(logging.DEBUG)
+    start = time.perf_counter()
+    for _ in range(N):
+        text.debug(f"BTC miss_b={miss_b:.4f} miss_s={miss_s:.4f} up={up['bestBid']}/{up['bestAsk']} down={down['bestBid']}/{down['bestAsk']}")
+    text_us = (time.perf_counter() - start) / N * 1e6
+    handler.close()
+    print(f"decision record {write_us:.2f} us/op vs formatted log line {text_us:.2f} us/op")
+
+    # 1M rows for the load test
+    log = DecisionLog(os.path.join(tmp, "load"))
+    for i in range(LOAD_ROWS):
+        log.write("BTC", up, down, miss_b, miss_s, NONE, ts=1766378123456 + i)
+    log.close()
+    path = [os.path.join(tmp, f) for f in os.listdir(tmp) if f.startswith("load_")][0]
+
+    start = time.perf_counter()
+    records = load_decisions(path)
+    load_s = time.perf_counter() - start
+    print(f"load {len(records)} records ({os.path.getsize(path) / 1e6:.0f} MB) in {load_s * 1000:.1f} ms")
+    try:
+        start = time.perf_counter()
+        to_frame(records)
+        print(f"to_frame in {(time.perf_counter() - start) * 1000:.1f} ms")
+    except ImportError:
+        print("pandas not installed, skipped to_frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Per-read cost of FreshnessModel.fresh vs the old fixed rule, and both rules
+on a simulated leg with exchange clock skew.
+
+The simulated leg updates ~20/s with occasional 1-2s stalls. A reader polls it
+every 10ms. For each skew (exchange clock minus local clock) the bench counts:
+
+  admitted stale    true age (local time since the exchange event) > 500ms, accepted
+  rejected fresh    true age <= 300ms (inside the feeder heartbeat), rejected
+
+    python bench_freshness.py
+"""
+import time
+
+import numpy as np
+
+from freshness import FreshnessModel
+
+N = 500_000
+SECONDS = 600
+SKEWS_MS = (-300, 0, 300)
+
+
+def old_fresh(t, now_ms):
+    return t is not None and now_ms - t["ts"] <= 500
+
+
+def simulate(rng, skew_ms):
+    """(poll times, ticker index per poll, tickers) for one leg."""
+    gaps = rng.exponential(50, SECONDS * 20)
+    stalls = rng.random(len(gaps)) < 0.002
+    gaps[stalls] += rng.uniform(1000, 2000, stalls.sum())
+    events = np.cumsum(gaps)
+    transit = rng.uniform(5, 30, len(events))
+    tickers = [
+        {"ts": int(e + skew_ms), "ts_sv": int(e + d), "token_id": "BTC0", "bestBid": 0.45, "bestAsk": 0.47}
+        for e, d in zip(events, transit)
+    ]
+    polls = np.arange(events[0] + transit[0], events[-1], 10.0)
+    latest = np.searchsorted(events + transit, polls, side="right") - 1
+    return events, polls, latest, tickers
+
+
+def main():
+    t = {"ts": 1766378123456, "ts_sv": 1766378123470, "token_id": "BTC0"}
+    now = 1766378123500.0
+    model = FreshnessModel("BTC")
+
+    start = time.perf_counter()
+    for _ in range(N):
+        old_fresh(t, now)
+    old_ns = (time.perf_counter() - start) / N * 1e9
+
+    start = time.perf_counter()
+    for _ in range(N):
+        model.fresh(t, now)
+    same_ns = (time.perf_counter() - start) / N * 1e9
+
+    tickers = [{"ts": t["ts"] + i, "ts_sv": t["ts_sv"] + i, "token_id": "BTC0"} for i in range(N)]
+    start = time.perf_counter()
+    for tk in tickers:
+        model.fresh(tk, now)
+    new_ns = (time.perf_counter() - start) / N * 1e9
+
+    print(f"old rule:             {old_ns:.0f} ns/read")
+    print(f"model, same ticker:   {same_ns:.0f} ns/read")
+    print(f"model, new ticker:    {new_ns:.0f} ns/read")
+    print()
+
+    rng = np.random.default_rng(1)
+    print(f"{'skew':>6} {'rule':>6} {'polls':>8} {'admitted stale':>15} {'rejected fresh':>15}")
+    for skew in SKEWS_MS:
+        events, polls, latest, tickers = simulate(rng, skew)
+        true_age = polls - events[latest]
+        model = FreshnessModel("BTC")
+        for name, fresh in (("old", old_fresh), ("model", model.fresh)):
+            ok = np.array([fresh(tickers[i], now_ms) for i, now_ms in zip(latest, polls)])
+            admitted_stale = int((ok & (true_age > 500)).sum())
+            rejected_fresh = int((~ok & (true_age <= 300)).sum())
+            print(f"{skew:>6} {name:>6} {len(polls):>8} {admitted_stale:>15} {rejected_fresh:>15}")
+    print(f"\nmodel offset={model.offset:.1f}ms interval={model.stats()['intervals_ms']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Replays a synthetic full day (4 symbols, UP+DOWN, ~5 updates/s each) through
+replay.ReplayEngine and reports the wall time.
+
+    python bench_replay.py [path]    # path: replay a real TickerRecorder file instead
+    python bench_replay.py --check   # prefilter vs FreshnessModel on skewed clocks
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from freshness import FreshnessModel
+from replay import ReplayEngine, _SymbolView
+from ticker_recorder import RECORD_DTYPE, load_recording
+
+SYMBOLS = ["ETH", "BTC", "SOL", "XRP"]
+RATE_HZ = 5
+SECONDS = 86_400
+
+
+def synthetic_day(path, seed=1):
+    rng = np.random.default_rng(seed)
+    start_ms = 1_766_361_600_000  # 00:00 UTC
+    n = SECONDS * RATE_HZ
+    chunks = []
+    for symbol in SYMBOLS:
+        clock = start_ms + np.sort(rng.uniform(0, SECONDS * 1000, n))
+        mid = np.clip(0.5 + np.cumsum(rng.normal(0, 0.002, n)), 0.05, 0.95)
+        # DOWN mirrors UP; occasional dislocations open a few cents of edge
+        dislocation = np.where(rng.random(n) < 0.002, rng.uniform(0.005, 0.03, n), 0.0)
+        for outcome, fair in ((0, mid), (1, 1.0 - mid)):
+            rows = np.zeros(n, dtype=RECORD_DTYPE)
+            rows["ts_rd"] = clock + outcome * 0.3
+            rows["symbol"] = symbol
+            rows["outcome"] = outcome
+            rows["bestAsk"] = np.round(fair + 0.01 - dislocation, 2)
+            rows["bestBid"] = np.round(fair - 0.01, 2)
+            rows["askSz"] = rng.uniform(5, 300, n).round(2)
+            rows["bidSz"] = rng.uniform(5, 300, n).round(2)
+            rows["ts"] = (clock - rng.uniform(5, 80, n)).astype(np.int64)
+            rows["ts_sv"] = (clock - 1).astype(np.int64)
+            rows["token_id"] = f"{symbol}{outcome}".encode()
+            chunks.append(rows)
+    day = np.concatenate(chunks)
+    day = day[np.argsort(day["ts_rd"], kind="stable")]
+    day.tofile(path)
+    return len(day)
+
+
+def skewed_symbol(n=20_000, seed=2):
+    """One symbol whose transit (ts_sv - ts) jumps between fast and slow, some rows without ts_sv."""
+    rng = np.random.default_rng(seed)
+    clock = 1_766_361_600_000 + np.sort(rng.uniform(0, n * 100, n))
+    rows = np.zeros(n, dtype=RECORD_DTYPE)
+    rows["ts_rd"] = clock
+    rows["symbol"] = "BTC"
+    rows["outcome"] = rng.integers(0, 2, n)
+    rows["bestAsk"] = 0.51
+    rows["bestBid"] = 0.49
+    transit = np.where(rng.random(n) < 0.2, rng.uniform(200, 900, n), rng.uniform(5, 40, n))
+    rows["ts"] = (clock - rng.uniform(0, 300, n) - transit).astype(np.int64)
+    rows["ts_sv"] = np.where(rng.random(n) < 0.05, 0, clock - rng.uniform(0, 300, n)).astype(np.int64)
+    rows["token_id"] = np.where(rows["outcome"] == 0, b"BTC0", b"BTC1")
+    return rows
+
+
+def check():
+    """
+    Feeds every row of skewed_symbol() through a FreshnessModel and asserts
+    each row it accepts survives ReplayEngine._candidates (edge and blackout
+    off), i.e. the prefilter never drops a row the live check would take.
+    """
+    view = _SymbolView(skewed_symbol())
+    engine = ReplayEngine(view.rows, {"edge": -np.inf, "blackout_minutes": ()})
+    candidates = set(engine._candidates(view).tolist())
+
+    model = FreshnessModel("BTC")
+    accepted = missed = 0
+    for i in range(len(view.rows)):
+        up, down = view.state(i)
+        now_ms = float(view.clock[i])
+        if model.fresh(up, now_ms) and model.fresh(down, now_ms):
+            accepted += 1
+            missed += i not in candidates
+    print(f"{len(view.rows)} rows: model accepts {accepted}, prefilter keeps {len(candidates)}, missed {missed}")
+    assert accepted and not missed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?", help="replay a real TickerRecorder file")
+    parser.add_argument("--check", action="store_true", help="prefilter vs FreshnessModel on skewed clocks")
+    args = parser.parse_args()
+    if args.check:
+        check()
+        return
+
+    if args.path:
+        path = args.path
+    else:
+        path = os.path.join(tempfile.gettempdir(), "bench_replay_day.bin")
+        t0 = time.perf_counter()
+        rows = synthetic_day(path)
+        print(f"synthetic day: {rows} rows, {os.path.getsize(path) / 1e6:.0f} MB in {time.perf_counter() - t0:.1f}s")
+
+    result = ReplayEngine(load_recording(path), {"edge": 0.002}, latency_ms=50.0, fee_rate=0.0).run()
+    print(f"replayed {result['rows']} rows, {result['candidates']} candidates, "
+          f"{len(result['trades'])} trades in {result['elapsed']:.2f}s")
+    for symbol, s in result["summary"].items():
+        print(f"  {symbol}: {s}")
+
+
+if __name__ == "__main__":
+    main()
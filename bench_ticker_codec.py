@@ -0,0 +1,48 @@
+"""
+Decode cost per ticker update: JSON (current feed) vs binary struct vs NumPy batch.
+
+    python bench_ticker_codec.py
+
+The Go side is benchmarked with `go test -bench Ticker -benchmem` in poly_socket.
+"""
+import json
+import time
+
+from ticker_codec import decode_ticker, decode_tickers, encode_ticker, np
+
+TOKEN_ID = "87142374061000861551796777015507582795011030012469790923844501037328154887367"
+N = 200_000
+
+
+def _bench(name, fn, n=N):
+    fn()
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {elapsed / n * 1e9:8.0f} ns/op")
+
+
+def main():
+    ticker = {
+        "bestBid": 0.45, "bidSz": 120.5, "bestAsk": 0.47, "askSz": 88.0,
+        "token_id": TOKEN_ID, "slug": "btc-updown-15m-1766377800",
+        "ts": 1766378123456, "ts_sv": 1766378123460,
+    }
+    raw_json = json.dumps(ticker).encode()
+    raw_bin = encode_ticker(0.45, 120.5, 0.47, 88.0, 1766378123456, 1766378123460, TOKEN_ID)
+    print(f"payload: json {len(raw_json)} B, binary {len(raw_bin)} B")
+
+    _bench("encode json.dumps", lambda: json.dumps(ticker))
+    _bench("encode struct", lambda: encode_ticker(0.45, 120.5, 0.47, 88.0, 1766378123456, 1766378123460, TOKEN_ID))
+    _bench("decode json.loads", lambda: json.loads(raw_json))
+    _bench("decode struct", lambda: decode_ticker(raw_bin))
+
+    if np is not None:
+        # one MGET worth of tickers (4 symbols x UP/DOWN) per call
+        batch = [raw_bin] * 8
+        _bench("decode numpy batch of 8", lambda: decode_tickers(batch), n=N // 8)
+
+
+if __name__ == "__main__":
+    main()
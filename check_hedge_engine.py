@@ -0,0 +1,231 @@
+"""
+Hedge engine harness: PolyArbitrage executions against a local fake CLOB with
+scripted partial, rejected, delayed and resting acknowledgements.
+
+Every scenario rolls the symbol over to a market of its own, fires one BUY
+arbitrage through PolyArbitrage._execute (live path, dry_run off), waits for
+the settle and the hedge, and checks the hedge status and the residual
+UP - DOWN inventory left on the symbol. The last residual must block the
+symbol until the next rollover, and a hedge stuck on one symbol must not
+delay another symbol's.
+
+    python check_hedge_engine.py
+"""
+import itertools
+import sys
+import threading
+import time
+
+from arbitrage_poly import PolyArbitrage
+from hedge_engine import HedgeEngine
+
+SYMBOL = "FAKE"
+SIZE = 10.0
+UP_PX = 0.48
+DOWN_PX = 0.49
+
+PARAMS = {
+    "edge": 0.01,
+    "dry_run": False,
+    "latency": False,
+    "leg_deadline": 0.5,
+    "hedge_retry_delay": 0.05,
+    "hedge_ack_timeout": 0.5,
+    "hedge_poll_interval": 0.02,
+}
+
+
+class FakeClob:
+    """
+    In-process stand-in for PolymarketPrivate's order calls.
+
+    Each (token_id, side) has a script of outcomes consumed one per order;
+    unscripted orders fill in full:
+
+      ("fill",)               matched in full
+      ("partial", frac)       matched for frac of the size, rest killed
+      ("reject",)             place_orders error entry
+      ("delay", s, frac)      "delayed" ack; frac of the size fills s seconds later
+      ("rest",)               "live" ack that never fills (until cancelled)
+
+    delay(s) holds the next place_orders batch for s seconds before it acks.
+    """
+
+    def __init__(self, ack_ms=5.0):
+        self.ack_ms = ack_ms
+        self.scripts = {}
+        self.orders = {}
+        self.sent = []
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.batch_delays = []
+
+    def script(self, token_id, side, *actions):
+        self.scripts.setdefault((token_id, side), []).extend(actions)
+
+    def delay(self, seconds):
+        self.batch_delays.append(seconds)
+
+    def place_orders(self, orders, signature_type=None):
+        time.sleep(self.batch_delays.pop(0) if self.batch_delays else self.ack_ms / 1000)
+        out = []
+        with self.lock:
+            for i, order in enumerate(orders):
+                self.sent.append(order)
+                script = self.scripts.get((order["token_id"], order["side"]))
+                action = script.pop(0) if script else ("fill",)
+                out.append({"index": i, "input": order, **self._ack(order, action)})
+        return {"data": out}
+
+    def _ack(self, order, action):
+        kind = action[0]
+        if kind == "reject":
+            return {"error": "not enough liquidity", "data": {"success": False, "errorMsg": "not enough liquidity"}}
+
+        order_id = f"0x{next(self.ids):x}"
+        size = float(order["size"])
+        if kind in ("fill", "partial"):
+            shares = size * (action[1] if kind == "partial" else 1.0)
+            usdc = shares * float(order["price"])
+            making, taking = (usdc, shares) if order["side"] == "BUY" else (shares, usdc)
+            return {"data": {"success": True, "orderID": order_id, "status": "matched",
+                             "makingAmount": f"{making:.6f}", "takingAmount": f"{taking:.6f}"}}
+
+        fill_at, fill = (time.time() + action[1], size * action[2]) if kind == "delay" else (None, 0.0)
+        self.orders[order_id] = {"size": size, "filled": 0.0, "fill_at": fill_at, "fill": fill, "canceled": False}
+        return {"data": {"success": True, "orderID": order_id, "status": "delayed" if kind == "delay" else "live",
+                         "makingAmount": "", "takingAmount": ""}}
+
+    def _update(self, order):
+        if not order["canceled"] and order["fill_at"] is not None and time.time() >= order["fill_at"]:
+            order["filled"] = order["fill"]
+            order["fill_at"] = None
+
+    def get_order_details(self, order_id):
+        with self.lock:
+            order = self.orders.get(order_id)
+            if order is None:
+                return {"data": None}
+            self._update(order)
+            if order["canceled"]:
+                status = "CANCELED"
+            elif order["filled"] >= order["size"]:
+                status = "FILLED"
+            else:
+                status = "PARTIALLY_FILLED" if order["filled"] else "NEW"
+            return {"data": {"orderId": order_id, "status": status, "fillQuantity": str(order["filled"])}}
+
+    def cancel_order(self, order_id):
+        with self.lock:
+            order = self.orders.get(order_id)
+            if order is None:
+                return {"data": {"canceled": [], "not_canceled": {order_id: "not found"}}}
+            self._update(order)
+            order["canceled"] = True
+            return {"data": {"canceled": [order_id], "not_canceled": {}}}
+
+
+# name, scripts [(leg, side, actions)], expected hedge status, expected residual;
+# a leg "batch" entry delays the leg batch past leg_deadline
+SCENARIOS = [
+    ("both_fill", [], "BALANCED", 0.0),
+    ("complete_missing", [("down", "BUY", [("reject",), ("fill",)])], "HEDGED", 0.0),
+    ("complete_rejected_unwind", [("down", "BUY", [("reject",), ("reject",)])], "HEDGED", 0.0),
+    ("partial_complete", [("down", "BUY", [("reject",), ("partial", 0.6)])], "HEDGED", 0.0),
+    ("partial_leg", [("up", "BUY", [("partial", 0.5)])], "HEDGED", 0.0),
+    ("delayed_hedge_ack", [("down", "BUY", [("reject",), ("delay", 0.2, 1.0)])], "HEDGED", 0.0),
+    ("resting_hedge_cancelled", [("down", "BUY", [("reject",), ("rest",)])], "HEDGED", 0.0),
+    ("delayed_leg_ack", [("up", "BUY", [("delay", 0.2, 1.0)]), ("down", "BUY", [("reject",)])], "HEDGED", 0.0),
+    ("delayed_leg_never_fills", [("up", "BUY", [("rest",)]), ("down", "BUY", [("reject",)])], "BALANCED", 0.0),
+    ("late_batch_ack", [("batch", 1.0, []), ("down", "BUY", [("reject",)])], "HEDGED", 0.0),
+    ("all_rejected", [("down", "BUY", [("reject",)] * 4), ("up", "SELL", [("reject",)] * 3)], "RESIDUAL", SIZE),
+]
+
+
+def run_scenario(arb, clob, name, scripts):
+    tokens = {"up": f"{name}-up", "down": f"{name}-down"}
+    retired = (arb.up_id, arb.down_id)
+    arb.up_id, arb.down_id = tokens["up"], tokens["down"]
+    arb._on_rollover(retired)
+    for leg, side, actions in scripts:
+        if leg == "batch":
+            clob.delay(side)
+            continue
+        clob.script(tokens[leg], side, *actions)
+
+    done = len(arb.hedger.history)
+    execution = arb._execute("UP", "DOWN", "BUY", SIZE, UP_PX, DOWN_PX, 0.03)
+    if not execution["done"].wait(PARAMS["leg_deadline"] + 0.1):
+        # late batch: the symbol stays busy until the ack is settled
+        assert arb.is_executing(), "late batch released the symbol"
+    execution["done"].wait(10)
+    deadline = time.time() + 10
+    while time.time() < deadline and not (arb.hedger.idle() and len(arb.hedger.history) > done):
+        time.sleep(0.005)
+    hedge = arb.hedger.history[-1] if len(arb.hedger.history) > done else None
+    return execution, hedge
+
+
+def check_isolation(clob, hedger):
+    """Hedge time (ms) of a one-legged FAST execution fired while SLOW's hedge waits on a resting order."""
+    arbs = {}
+    for name in ("SLOW", "FAST"):
+        arb = arbs[name] = PolyArbitrage(clob, name, PARAMS, redis=None, hedger=hedger)
+        arb.up_id, arb.down_id = f"{name}-up", f"{name}-down"
+        arb._on_rollover()
+    clob.script("SLOW-down", "BUY", ("reject",), ("rest",))
+    clob.script("FAST-down", "BUY", ("reject",))
+
+    done = len(hedger.history)
+    for arb in arbs.values():
+        arb._execute("UP", "DOWN", "BUY", SIZE, UP_PX, DOWN_PX, 0.03)["done"].wait(10)
+    deadline = time.time() + 10
+    while time.time() < deadline and not (hedger.idle() and len(hedger.history) >= done + 2):
+        time.sleep(0.005)
+    fast = [h for h in hedger.history[done:] if h["symbol"] == "FAST"]
+    return fast[0]["done_ts"] - fast[0]["submit_ts"] if fast else float("inf")
+
+
+def main():
+    clob = FakeClob()
+    hedger = HedgeEngine(clob, PARAMS)
+    arb = PolyArbitrage(clob, SYMBOL, PARAMS, redis=None, hedger=hedger)
+
+    failures = 0
+    print(f"{'scenario':<26} {'legs':<9} {'hedge':<9} {'orders':>6} {'residual':>8} {'react ms':>8} {'total ms':>8}")
+    for name, scripts, want_status, want_residual in SCENARIOS:
+        execution, hedge = run_scenario(arb, clob, name, scripts)
+        status = hedge["status"] if hedge else "NONE"
+        residual = hedger.residual(SYMBOL)
+        react = hedge["orders"][0]["send_ts"] - hedge["submit_ts"] if hedge and hedge["orders"] else 0.0
+        total = hedge["done_ts"] - hedge["submit_ts"] if hedge else 0.0
+        ok = status == want_status and abs(residual - want_residual) < 1e-9
+        failures += not ok
+        print(f"{name:<26} {execution['status']:<9} {status:<9} {len(hedge['orders']) if hedge else 0:>6} "
+              f"{residual:>8g} {react:>8.1f} {total:>8.1f}{'' if ok else '  FAIL want ' + want_status + f' {want_residual:g}'}")
+
+    busy = arb.is_executing()
+    print(f"\nresidual above max_residual blocks the symbol: {busy}")
+    print(f"inventory: {hedger.inventory()}")
+    print(f"expired markets: {len(hedger.expired)}")
+
+    retired = (arb.up_id, arb.down_id)
+    arb.up_id, arb.down_id = "next-up", "next-down"
+    arb._on_rollover(retired)
+    released = not arb.is_executing()
+    print(f"rollover releases the symbol: {released} (expired {hedger.expired[-1]['positions']})")
+
+    hedger._record(SYMBOL, "next-up", "BUY", SIZE)
+    hedger.reset(SYMBOL)
+    cleared = not arb.is_executing() and not hedger.inventory()
+    print(f"reset clears the symbol: {cleared}")
+
+    fast_ms = check_isolation(clob, hedger)
+    isolated = fast_ms < PARAMS["hedge_ack_timeout"] * 1000 / 2
+    print(f"hedge next to a stuck symbol: {fast_ms:.1f}ms (isolated: {isolated})")
+    if failures or not busy or not released or not cleared or not isolated:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
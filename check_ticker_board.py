@@ -0,0 +1,127 @@
+"""
+Torn-read harness for the shared-memory ticker board (ticker_board.py, poly_socket/board.go).
+
+Writer processes hammer the same few slots with self-consistent records (every
+field derived from one counter n) while a reader checks every read:
+
+  checked    TickerBoard.read_tuple (seqlock): must never see a torn record
+  unchecked  the same payload unpacked with no seq check: the control, shows
+             what the harness catches without the seqlock
+
+    python check_ticker_board.py [--writers 4] [--slots 4] [--seconds 5] [--go]
+
+--go runs the writers as the feeder's Go code (go test -run TestBoardHarnessWriter
+in poly_socket) instead of Python processes.
+"""
+import argparse
+import multiprocessing as mp
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from ticker_board import TickerBoard, BOARD_HEADER_SIZE, BOARD_SLOT_SIZE, BOARD_PAYLOAD_OFF, _PAYLOAD
+
+KEYS = [f"H{i}_up_15m_polymarket_ticker" for i in range(64)]
+
+
+def record(n):
+    """The ticker written for counter n; check() recomputes it from bestBid."""
+    return {
+        "bestBid": float(n), "bidSz": float(n + 1), "bestAsk": float(n + 2), "askSz": float(n + 3),
+        "ts": n, "ts_sv": n, "slot_ts": n, "ts_wr_us": n, "token_id": str(n),
+    }
+
+
+def check(values):
+    ts_wr_us, best_bid, bid_sz, best_ask, ask_sz, ts, ts_sv, slot_ts, token = values
+    n = int(best_bid)
+    return (
+        bid_sz == n + 1 and best_ask == n + 2 and ask_sz == n + 3
+        and ts == n and ts_sv == n and slot_ts == n and ts_wr_us == n
+        and token.rstrip(b"\x00") == str(n).encode()
+    )
+
+
+def python_writer(path, writer_id, slots, seconds):
+    board = TickerBoard(path, writable=True)
+    n = writer_id * 1_000_000_000 + 1
+    end = time.time() + seconds
+    while time.time() < end:
+        for key in KEYS[:slots]:
+            board.write(key, record(n))
+            n += 1
+    board.close()
+
+
+def go_writer(path, writer_id, slots, seconds):
+    env = dict(os.environ, BOARD_HARNESS_PATH=path, BOARD_HARNESS_ID=str(writer_id),
+               BOARD_HARNESS_SLOTS=str(slots), BOARD_HARNESS_SECONDS=str(seconds))
+    cwd = os.path.join(os.path.dirname(os.path.abspath(__file__)), "poly_socket")
+    return subprocess.Popen(["go", "test", "-count=1", "-run", "TestBoardHarnessWriter", "."], cwd=cwd, env=env)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--slots", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--go", action="store_true")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "harness.board")
+    board = TickerBoard(path, writable=True)
+    # claim the slots in key order before the writers start
+    for key in KEYS[:args.slots]:
+        board.write(key, record(0))
+
+    if args.go:
+        procs = [go_writer(path, w + 1, args.slots, args.seconds) for w in range(args.writers)]
+        time.sleep(2.0)  # go test build
+    else:
+        procs = [mp.Process(target=python_writer, args=(path, w + 1, args.slots, args.seconds)) for w in range(args.writers)]
+        for p in procs:
+            p.start()
+
+    slots = [board.slot(key) for key in KEYS[:args.slots]]
+    reads = torn = failed = unchecked = unchecked_torn = 0
+    seen = set()
+    read_ns = 0
+    end = time.time() + args.seconds
+    while time.time() < end:
+        for i in slots:
+            start = time.perf_counter_ns()
+            values = board.read_tuple(i)
+            read_ns += time.perf_counter_ns() - start
+            reads += 1
+            if values is None:
+                failed += 1
+            elif not check(values):
+                torn += 1
+            else:
+                seen.add(int(values[1]) // 1_000_000_000)
+
+            raw = _PAYLOAD.unpack_from(board.mm, BOARD_HEADER_SIZE + i * BOARD_SLOT_SIZE + BOARD_PAYLOAD_OFF)
+            unchecked += 1
+            if not check(raw):
+                unchecked_torn += 1
+
+    for p in procs:
+        if args.go:
+            p.wait()
+        else:
+            p.join()
+    final = [board.read_tuple(i) for i in slots]
+    board.close()
+
+    print(f"writers={args.writers} ({'go' if args.go else 'python'}) slots={args.slots} seconds={args.seconds}")
+    print(f"checked   reads={reads} torn={torn} unstable={failed} writers_seen={sorted(seen - {0})} {read_ns / max(reads, 1):.0f} ns/read")
+    print(f"unchecked reads={unchecked} torn={unchecked_torn}")
+    print(f"final records consistent: {all(v is not None and check(v) for v in final)}")
+    if torn:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
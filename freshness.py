@@ -0,0 +1,164 @@
+import threading
+import time
+from logger import logger_arb
+
+# A ticker carries two clocks:
+#   ts     exchange timestamp (exchange clock)
+#   ts_sv  feeder receive time (local clock; the feeder runs on the consumer's host)
+# ts_sv - ts is the exchange-to-local clock offset plus transit. Its lower
+# envelope, tracked online, is the offset plus the fastest transit seen, so
+#   age = now - ts - offset
+# is the time since the exchange event in local time with the skew removed
+# (and any transit beyond the fastest still counted against the ticker).
+#
+# The age limit adapts per leg: FRESH_INTERVAL_MULT x the EWMA of the gap
+# between successive updates, clamped to [min_age_ms, max_age_ms]. The floor
+# stays above the feeder's heartbeat (TICKER_HEARTBEAT_MS = 250 in
+# poly_socket/ticker.go): an unchanged top of book is only rewritten that often.
+FRESH_MAX_AGE_MS = 500
+FRESH_MIN_AGE_MS = 300
+FRESH_INTERVAL_MULT = 4.0
+
+# EWMA weight of one inter-update gap
+INTERVAL_ALPHA = 0.05
+# the offset follows lower samples quickly and higher ones slowly, so it
+# stays at the fast-transit envelope but still tracks clock drift / steps
+OFFSET_FALL = 0.5
+OFFSET_RISE = 0.001
+
+# legs tracked per model before the table is dropped (tokens change every 15m rollover)
+MAX_LEGS = 16
+
+
+class FreshnessModel:
+    """
+    Per-symbol ticker staleness check (PolyArbitrage._fresh).
+
+    Learns only from tickers it has not seen before (a new ts_sv for the
+    token), so re-reading the same ticker every poll costs a dict lookup and
+    a few float ops. Not thread-safe: one model per evaluating thread.
+    """
+
+    def __init__(self, symbol, max_age_ms=FRESH_MAX_AGE_MS, min_age_ms=FRESH_MIN_AGE_MS,
+                 interval_mult=FRESH_INTERVAL_MULT):
+        """
+        Args:
+            symbol: e.g. "BTC" (log lines only)
+            max_age_ms: age limit before a leg's interval is known, and the cap
+            min_age_ms: floor of the adaptive limit
+            interval_mult: adaptive limit in multiples of the leg's update interval
+        """
+        self.symbol = symbol
+        self.max_age_ms = max_age_ms
+        self.min_age_ms = min_age_ms
+        self.interval_mult = interval_mult
+
+        # exchange -> local offset estimate (ms), None until the first ts_sv
+        self.offset = None
+        # token_id -> [last ts_sv, interval EWMA ms (0: unknown)]
+        self.legs = {}
+
+        self.reads = 0
+        self.stale = 0
+        self.missing = 0
+
+    def _observe(self, tid, ts, ts_sv):
+        """Updates offset and interval from a ticker; returns the leg state."""
+        leg = self.legs.get(tid)
+        if leg is not None and leg[0] == ts_sv:
+            return leg
+
+        if leg is None:
+            if len(self.legs) >= MAX_LEGS:
+                self.legs.clear()
+            leg = self.legs[tid] = [ts_sv, 0.0]
+        else:
+            if ts_sv > leg[0]:
+                gap = min(ts_sv - leg[0], self.max_age_ms)
+                leg[1] = gap if not leg[1] else leg[1] + INTERVAL_ALPHA * (gap - leg[1])
+            leg[0] = ts_sv
+
+        sample = ts_sv - ts
+        if self.offset is None:
+            self.offset = sample
+        elif sample < self.offset:
+            self.offset += OFFSET_FALL * (sample - self.offset)
+        else:
+            self.offset += OFFSET_RISE * (sample - self.offset)
+        return leg
+
+    def limit(self, interval):
+        """Age limit (ms) for a leg updating every `interval` ms (0: unknown)."""
+        if not interval:
+            return self.max_age_ms
+        return min(self.max_age_ms, max(self.min_age_ms, self.interval_mult * interval))
+
+    def fresh(self, t, now_ms=None):
+        """
+        Args:
+            t: parsed ticker (ts, optionally ts_sv and token_id), or None
+            now_ms: local clock (ms); defaults to time.time()
+
+        Returns:
+            bool: False for a missing or stale ticker (counted in stats())
+        """
+        if t is None:
+            self.missing += 1
+            return False
+        if now_ms is None:
+            now_ms = time.time() * 1000
+        self.reads += 1
+
+        ts = t["ts"]
+        ts_sv = t.get("ts_sv")
+        if ts_sv:
+            leg = self._observe(t.get("token_id"), ts, ts_sv)
+            ok = now_ms - ts - self.offset <= self.limit(leg[1])
+        else:
+            # no feeder clock: raw exchange age
+            ok = now_ms - ts <= self.max_age_ms
+
+        if not ok:
+            self.stale += 1
+        return ok
+
+    def stats(self):
+        """
+        Returns:
+            dict: {'reads', 'stale', 'missing', 'stale_pct', 'offset_ms', 'intervals_ms' {token_id: ms}}
+        """
+        return {
+            "reads": self.reads,
+            "stale": self.stale,
+            "missing": self.missing,
+            "stale_pct": round(100.0 * self.stale / self.reads, 3) if self.reads else 0.0,
+            "offset_ms": None if self.offset is None else round(self.offset, 1),
+            "intervals_ms": {tid: round(leg[1], 1) for tid, leg in list(self.legs.items())},
+        }
+
+    def log(self, logger=None):
+        """One line: cumulative stale counters, offset and per-leg intervals."""
+        s = self.stats()
+        intervals = "/".join(f"{v:g}" for v in s["intervals_ms"].values()) or "-"
+        (logger or logger_arb).info(
+            f"[FRESHNESS] {self.symbol} reads={s['reads']} stale={s['stale']} ({s['stale_pct']}%) "
+            f"missing={s['missing']} offset={s['offset_ms']}ms interval={intervals}ms"
+        )
+
+
+def start_reporter(models, logger=None, interval=60):
+    """Logs every model's counters every `interval` seconds on a daemon thread."""
+    logger = logger or logger_arb
+
+    def loop():
+        while True:
+            time.sleep(interval)
+            for model in models:
+                try:
+                    model.log(logger)
+                except Exception as e:
+                    logger.error(f"freshness reporter error {e} line: {e.__traceback__.tb_lineno}")
+
+    thread = threading.Thread(target=loop, name="freshness_reporter", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,367 @@
+import queue
+import threading
+import time
+from logger import logger_arb
+
+# Hedge orders go out marketable at a bounded price: the leg's signal price
+# moved against us by at most HEDGE_MAX_SLIPPAGE to complete the missing leg,
+# or HEDGE_UNWIND_SLIPPAGE to flatten the filled one. "FAK" takes whatever is
+# inside the bound and leaves the rest for the next attempt.
+HEDGE_ORDER_TYPE = "FAK"
+HEDGE_MAX_SLIPPAGE = 0.02
+HEDGE_UNWIND_SLIPPAGE = 0.05
+HEDGE_MAX_ATTEMPTS = 3
+HEDGE_RETRY_DELAY = 0.2
+# how long a delayed / resting hedge order may stay open before it is cancelled (s)
+HEDGE_ACK_TIMEOUT = 2.0
+HEDGE_POLL_INTERVAL = 0.05
+# leftover below this many shares counts as hedged
+HEDGE_MIN_SIZE = 0.01
+
+MIN_PRICE = 0.01
+MAX_PRICE = 0.99
+
+# get_order_details statuses (poly_exchange convert_order_status) that no longer change
+DONE_STATUSES = ("FILLED", "CANCELED")
+
+
+def leg_fill(resp, side, size):
+    """
+    Filled shares of one order from its place_orders entry.
+
+    Args:
+        resp: {"code": 0} (dry run), a place_orders entry ({"data": exchange
+              response} or {"error"}), or an exception
+        side: "BUY" / "SELL"
+        size: order size, reported when the response does not say otherwise
+
+    Returns:
+        tuple: (filled shares, order id or None, pending) where pending means the
+               order was accepted but not matched yet ("delayed" / "live")
+    """
+    if not isinstance(resp, dict) or resp.get("error"):
+        return 0.0, None, False
+    if resp.get("code") == 0:
+        return float(size), None, False
+
+    data = resp.get("data")
+    if not isinstance(data, dict):
+        return (float(size) if data else 0.0), None, False
+
+    order_id = data.get("orderID")
+    status = str(data.get("status", "")).lower()
+    if status == "matched":
+        # BUY takes shares for USDC, SELL makes shares
+        amount = data.get("takingAmount" if side == "BUY" else "makingAmount")
+        try:
+            return min(float(amount), float(size)), order_id, False
+        except (TypeError, ValueError):
+            return float(size), order_id, False
+    if status in ("delayed", "live"):
+        return 0.0, order_id, order_id is not None
+    if status:
+        return 0.0, order_id, False
+    return float(size), order_id, False
+
+
+class HedgeEngine:
+    """
+    Flattens one-legged arbitrage fills off the main loop.
+
+    PolyArbitrage hands every execution with a filled leg to submit(); a
+    worker thread of the symbol's own (not the shared order executor, and not
+    shared with other symbols, so a slow hedge never delays another symbol's)
+    resolves the real fills (partial and delayed acks included) and, while the
+    UP and DOWN fills differ, alternates two bounded marketable orders:
+
+      complete  the missing leg, same side, at its signal price +- max_slippage
+      unwind    the excess leg, opposite side, at its signal price -+ unwind_slippage
+
+    Positions are tracked per symbol and token; residual() is the unpaired
+    UP - DOWN shares of the symbol's current market, and busy() keeps the
+    symbol from firing while a hedge is queued or running or the residual is
+    above max_residual. A market's positions are moved to `expired` when the
+    symbol rolls over to the next one (rollover()), so a residual left on a
+    resolved market does not block the new one; reset() clears a symbol by hand.
+    """
+
+    def __init__(self, client, params, logger=None):
+        """
+        Args:
+            client: PolymarketPrivate-like (place_orders, get_order_details, cancel_order)
+            params: strategy params; reads dry_run, signature_type and hedge_* keys
+            logger: defaults to logger_arb
+        """
+        self.client = client
+        self.logger = logger or logger_arb
+        self.dry_run = params.get("dry_run", True)
+        self.signature_type = params.get("signature_type")
+        self.order_type = params.get("hedge_order_type", HEDGE_ORDER_TYPE)
+        self.max_slippage = params.get("hedge_max_slippage", HEDGE_MAX_SLIPPAGE)
+        self.unwind_slippage = params.get("hedge_unwind_slippage", HEDGE_UNWIND_SLIPPAGE)
+        self.max_attempts = params.get("hedge_max_attempts", HEDGE_MAX_ATTEMPTS)
+        self.retry_delay = params.get("hedge_retry_delay", HEDGE_RETRY_DELAY)
+        self.ack_timeout = params.get("hedge_ack_timeout", HEDGE_ACK_TIMEOUT)
+        self.poll_interval = params.get("hedge_poll_interval", HEDGE_POLL_INTERVAL)
+        self.min_size = params.get("hedge_min_size", HEDGE_MIN_SIZE)
+        self.max_residual = params.get("hedge_max_residual", 0.0)
+
+        self.lock = threading.Lock()
+        # symbol -> (job queue, worker thread), started on the symbol's first submit
+        self.workers = {}
+        # symbol -> {token_id: shares}
+        self.positions = {}
+        # symbol -> (up token, down token) of the current market
+        self.pairs = {}
+        # symbol -> jobs queued or running
+        self.active = {}
+        # finished hedges, newest last (see _hedge)
+        self.history = []
+        # positions of rolled-over markets, newest last (see _expire)
+        self.expired = []
+
+    def start(self, symbol):
+        """Returns the symbol's job queue, starting its worker if needed."""
+        with self.lock:
+            worker = self.workers.get(symbol)
+            if worker is None:
+                jobs = queue.Queue()
+                thread = threading.Thread(target=self._loop, args=(jobs,), name=f"hedge_{symbol}", daemon=True)
+                worker = self.workers[symbol] = (jobs, thread)
+                thread.start()
+        return worker[0]
+
+    def stop(self):
+        with self.lock:
+            workers = list(self.workers.values())
+            self.workers = {}
+        for jobs, _ in workers:
+            jobs.put(None)
+        for _, thread in workers:
+            thread.join()
+
+    def submit(self, job):
+        """
+        Queues one execution on the symbol's hedge worker and returns at once.
+
+        Args:
+            job (dict): symbol, side ("BUY"/"SELL"), tokens {"UP": id, "DOWN": id},
+                        legs {"up"/"down": _place_legs record (market, size, price, resp)},
+                        optional quote(market) -> ticker dict or None
+        """
+        with self.lock:
+            self.active[job["symbol"]] = self.active.get(job["symbol"], 0) + 1
+            # the current market is set by rollover(); a late job of an old
+            # market must not bring it back
+            self.pairs.setdefault(job["symbol"], (job["tokens"]["UP"], job["tokens"]["DOWN"]))
+        job["submit_ts"] = time.time() * 1000
+        self.start(job["symbol"]).put(job)
+
+    def rollover(self, symbol, up, down):
+        """
+        Makes (up, down) the symbol's current market and moves the positions
+        of every other token to `expired`: the old market resolves, so its
+        residual no longer blocks the symbol.
+        """
+        with self.lock:
+            self.pairs[symbol] = (up, down)
+            self._expire(symbol)
+
+    def reset(self, symbol):
+        """Drops the symbol's positions and current market (operator reset after a manual flatten)."""
+        with self.lock:
+            held = self.positions.pop(symbol, {})
+            self.pairs.pop(symbol, None)
+        self.logger.warning(f"{symbol} HEDGE reset positions={held}")
+
+    def busy(self, symbol):
+        with self.lock:
+            if self.active.get(symbol):
+                return True
+        return abs(self.residual(symbol)) > max(self.max_residual, self.min_size)
+
+    def residual(self, symbol):
+        """Unpaired UP - DOWN shares of the symbol's current market."""
+        with self.lock:
+            pair = self.pairs.get(symbol)
+            if pair is None:
+                return 0.0
+            held = self.positions.get(symbol, {})
+            return held.get(pair[0], 0.0) - held.get(pair[1], 0.0)
+
+    def inventory(self):
+        """
+        Returns:
+            dict: {symbol: {'positions': {token_id: shares}, 'residual': shares}}
+        """
+        out = {}
+        with self.lock:
+            for symbol, held in self.positions.items():
+                pair = self.pairs.get(symbol)
+                residual = held.get(pair[0], 0.0) - held.get(pair[1], 0.0) if pair else 0.0
+                out[symbol] = {"positions": dict(held), "residual": residual}
+        return out
+
+    def idle(self):
+        with self.lock:
+            return not any(self.active.values())
+
+    def _expire(self, symbol):
+        """Moves the symbol's positions outside its current pair to `expired`. Callers hold lock."""
+        pair = self.pairs.get(symbol, ())
+        held = self.positions.get(symbol, {})
+        old = {tid: shares for tid, shares in held.items() if tid not in pair}
+        if not old:
+            return
+        for tid in old:
+            del held[tid]
+        self.expired.append({"symbol": symbol, "positions": old, "ts": time.time() * 1000})
+        if len(self.expired) > 1000:
+            del self.expired[:500]
+        if any(abs(shares) >= self.min_size for shares in old.values()):
+            self.logger.warning(f"{symbol} HEDGE expired positions={old}")
+
+    def _record(self, symbol, token_id, side, shares):
+        if not shares:
+            return
+        with self.lock:
+            held = self.positions.setdefault(symbol, {})
+            held[token_id] = held.get(token_id, 0.0) + (shares if side == "BUY" else -shares)
+
+    def _loop(self, jobs):
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            try:
+                self._hedge(job)
+            except Exception as e:
+                self.logger.error(f"{job['symbol']} hedge error {e} line: {e.__traceback__.tb_lineno}")
+            finally:
+                with self.lock:
+                    self.active[job["symbol"]] -= 1
+
+    def _hedge(self, job):
+        symbol = job["symbol"]
+        side = job["side"]
+        legs = job["legs"]
+        tokens = job["tokens"]
+
+        filled = {}
+        for name, leg in legs.items():
+            filled[name] = self._resolve(leg.get("resp"), side, leg.get("size", 0.0))
+            self._record(symbol, tokens[leg["market"]], side, filled[name])
+
+        gap = filled["up"] - filled["down"]
+        result = {
+            "symbol": symbol, "side": side, "filled": dict(filled), "orders": [],
+            "submit_ts": job["submit_ts"], "status": "BALANCED",
+        }
+        if abs(gap) >= self.min_size:
+            excess, missing = ("up", "down") if gap > 0 else ("down", "up")
+            qty = abs(gap)
+            self.logger.info(f"{symbol} HEDGE {side} {excess.upper()}={filled[excess]} {missing.upper()}={filled[missing]} qty={qty}")
+
+            unwind_side = "SELL" if side == "BUY" else "BUY"
+            for attempt in range(self.max_attempts):
+                if attempt:
+                    time.sleep(self.retry_delay)
+
+                leg = legs[missing]
+                limit = self._bound(leg["price"], side, self.max_slippage)
+                if self._reachable(job, leg["market"], side, limit):
+                    qty -= self._place(job, result, "complete", leg["market"], side, qty, limit)
+                if qty < self.min_size:
+                    break
+
+                leg = legs[excess]
+                limit = self._bound(leg["price"], unwind_side, self.unwind_slippage)
+                qty -= self._place(job, result, "unwind", leg["market"], unwind_side, qty, limit)
+                if qty < self.min_size:
+                    break
+
+            result["status"] = "HEDGED" if qty < self.min_size else "RESIDUAL"
+
+        with self.lock:
+            held = self.positions.get(symbol, {})
+            result["residual"] = held.get(tokens["UP"], 0.0) - held.get(tokens["DOWN"], 0.0)
+            # the symbol rolled over while this hedge ran on the old market
+            if self.pairs.get(symbol) != (tokens["UP"], tokens["DOWN"]):
+                self._expire(symbol)
+        result["done_ts"] = time.time() * 1000
+        self.history.append(result)
+        if len(self.history) > 1000:
+            del self.history[:500]
+        if result["status"] != "BALANCED":
+            log = self.logger.info if result["status"] == "HEDGED" else self.logger.error
+            log(f"{symbol} HEDGE {result['status']} residual={result['residual']} orders={len(result['orders'])} "
+                f"in {result['done_ts'] - result['submit_ts']:.1f}ms")
+
+    @staticmethod
+    def _bound(price, side, slippage):
+        """Worst acceptable price: signal price moved against `side` by slippage."""
+        if side == "BUY":
+            return round(min(MAX_PRICE, price + slippage), 4)
+        return round(max(MIN_PRICE, price - slippage), 4)
+
+    def _reachable(self, job, market, side, limit):
+        """False only when a quote shows the touch outside the limit."""
+        quote = job.get("quote")
+        if quote is None:
+            return True
+        try:
+            t = quote(market)
+        except Exception:
+            return True
+        if not t:
+            return True
+        if side == "BUY":
+            return 0 < t["bestAsk"] <= limit
+        return t["bestBid"] >= limit
+
+    def _place(self, job, result, kind, market, side, size, price):
+        """Sends one hedge order and returns its filled shares (recorded in positions)."""
+        token_id = job["tokens"][market]
+        order = {"token_id": token_id, "side": side, "size": round(size, 2), "price": price, "order_type": self.order_type}
+        send_ts = time.time() * 1000
+        if self.dry_run:
+            resp = {"code": 0}
+        else:
+            try:
+                out = self.client.place_orders([order], signature_type=self.signature_type)
+                resp = out["data"][0] if not out.get("error") and out.get("data") else out
+            except Exception as e:
+                resp = e
+        shares = self._resolve(resp, side, order["size"])
+        self._record(job["symbol"], token_id, side, shares)
+
+        result["orders"].append({
+            "kind": kind, "market": market, "side": side, "size": order["size"], "price": price,
+            "filled": shares, "send_ts": send_ts, "ack_ts": time.time() * 1000,
+        })
+        self.logger.info(f"{job['symbol']} HEDGE {kind} {side} {market} {order['size']}@{price} filled={shares}")
+        return shares
+
+    def _resolve(self, resp, side, size):
+        """
+        Filled shares of an order, waiting out a delayed / resting ack for up to
+        ack_timeout and cancelling what is still open after it.
+        """
+        shares, order_id, pending = leg_fill(resp, side, size)
+        if not pending:
+            return shares
+
+        deadline = time.time() + self.ack_timeout
+        while time.time() < deadline:
+            time.sleep(self.poll_interval)
+            details = (self.client.get_order_details(order_id) or {}).get("data")
+            if details:
+                shares = float(details.get("fillQuantity") or 0)
+                if details.get("status") in DONE_STATUSES:
+                    return shares
+
+        self.client.cancel_order(order_id)
+        details = (self.client.get_order_details(order_id) or {}).get("data")
+        if details:
+            shares = float(details.get("fillQuantity") or 0)
+        return shares
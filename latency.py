@@ -0,0 +1,207 @@
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logger import logger_arb
+
+# Stages of one tick, in order (all in ms):
+#   exchange_feeder  ts     -> ts_sv     exchange timestamp to feeder receive
+#   feeder_redis     ts_sv  -> ts_wr_us  feeder receive to the Redis write being issued
+#   redis_read       ts_wr  -> ts_rd     Redis write to the consumer holding the parsed ticker
+#   read_ack         ts_rd  -> ack_ts    ticker read to the order batch ack
+STAGES = ("exchange_feeder", "feeder_redis", "redis_read", "read_ack")
+PERCENTILES = (50, 99, 99.9)
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of microsecond values.
+
+    Each power-of-two range is split into 2**sub_bits linear buckets, so the
+    relative error is bounded by 2**-sub_bits (~3% for sub_bits=5) from 1us up
+    to max_us with a fixed, small bucket array and O(1) record().
+    """
+
+    def __init__(self, max_us=60_000_000, sub_bits=5):
+        self.sub_bits = sub_bits
+        self.sub_count = 1 << sub_bits
+        self.max_us = max_us
+        self.counts = [0] * self._index(max_us) + [0]
+        self.total = 0
+        self.max = 0
+        self.min = None
+
+    def _index(self, v):
+        if v < self.sub_count:
+            return v
+        shift = v.bit_length() - self.sub_bits - 1
+        return ((shift + 1) << self.sub_bits) + (v >> shift) - self.sub_count
+
+    def _value(self, i):
+        """Upper bound of bucket i."""
+        if i < self.sub_count:
+            return i
+        shift = (i >> self.sub_bits) - 1
+        sub = (i & (self.sub_count - 1)) + self.sub_count
+        return ((sub + 1) << shift) - 1
+
+    def record(self, value_us):
+        v = int(value_us)
+        if v < 0:
+            v = 0
+        elif v > self.max_us:
+            v = self.max_us
+        self.counts[self._index(v)] += 1
+        self.total += 1
+        if v > self.max:
+            self.max = v
+        if self.min is None or v < self.min:
+            self.min = v
+
+    def percentile(self, q):
+        """Value (us) at percentile q (0-100), 0 if empty."""
+        if self.total == 0:
+            return 0
+        target = max(1, math.ceil(self.total * q / 100.0))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(self._value(i), self.max)
+        return self.max
+
+    def merge(self, other):
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.total = 0
+        self.max = 0
+        self.min = None
+
+
+class LatencyRecorder:
+    """
+    Per-(symbol, stage) latency histograms with a periodic log line and an
+    optional localhost JSON endpoint.
+    """
+
+    def __init__(self, logger=None):
+        self.logger = logger or logger_arb
+        self.hists = {}
+        self.lock = threading.Lock()
+        self.running = False
+        self.server = None
+
+    def record(self, symbol, stage, value_ms):
+        """Adds one sample (ms, float) for symbol/stage."""
+        key = (symbol, stage)
+        with self.lock:
+            h = self.hists.get(key)
+            if h is None:
+                h = self.hists[key] = LatencyHistogram()
+            h.record(value_ms * 1000)
+
+    def record_ticker(self, symbol, t):
+        """
+        Records the feeder stages of one freshly read ticker.
+
+        Args:
+            symbol: e.g. "BTC"
+            t: parsed ticker with ts, ts_sv and optionally ts_wr_us (feeder) and ts_rd (consumer)
+        """
+        ts_sv = t.get("ts_sv")
+        if not ts_sv:
+            return
+        if t.get("ts"):
+            self.record(symbol, "exchange_feeder", ts_sv - t["ts"])
+        ts_wr = t.get("ts_wr_us")
+        if ts_wr:
+            self.record(symbol, "feeder_redis", ts_wr / 1000 - ts_sv)
+            if t.get("ts_rd"):
+                self.record(symbol, "redis_read", t["ts_rd"] - ts_wr / 1000)
+
+    def snapshot(self, reset=False):
+        """
+        Returns:
+            dict: {symbol: {stage: {'count', 'p50', 'p99', 'p99.9', 'max'} in ms}}
+        """
+        out = {}
+        with self.lock:
+            for (symbol, stage), h in sorted(self.hists.items()):
+                if h.total == 0:
+                    continue
+                stats = {"count": h.total}
+                for q in PERCENTILES:
+                    stats[f"p{q:g}"] = round(h.percentile(q) / 1000, 3)
+                stats["max"] = round(h.max / 1000, 3)
+                out.setdefault(symbol, {})[stage] = stats
+                if reset:
+                    h.reset()
+        return out
+
+    def log(self, reset=True):
+        """One line per symbol: stage=p50/p99/p99.9 ms (count)."""
+        for symbol, stages in self.snapshot(reset=reset).items():
+            parts = [
+                f"{stage}={s['p50']}/{s['p99']}/{s['p99.9']}ms({s['count']})"
+                for stage, s in sorted(stages.items(), key=lambda kv: STAGES.index(kv[0]) if kv[0] in STAGES else len(STAGES))
+            ]
+            self.logger.info(f"[LATENCY] {symbol} p50/p99/p99.9 " + " ".join(parts))
+
+    def start_reporter(self, interval=60):
+        """Logs (and resets) the histograms every `interval` seconds on a daemon thread."""
+        self.running = True
+
+        def loop():
+            while self.running:
+                time.sleep(interval)
+                try:
+                    self.log(reset=True)
+                except Exception as e:
+                    self.logger.error(f"latency reporter error {e} line: {e.__traceback__.tb_lineno}")
+
+        thread = threading.Thread(target=loop, name="latency_reporter", daemon=True)
+        thread.start()
+        return thread
+
+    def serve(self, port, host="127.0.0.1"):
+        """
+        Serves GET /metrics as JSON (snapshot without reset) on a daemon thread.
+
+        Returns:
+            ThreadingHTTPServer
+        """
+        recorder = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = json.dumps(recorder.snapshot()).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="latency_metrics", daemon=True).start()
+        return self.server
+
+    def stop(self):
+        self.running = False
+        if self.server is not None:
+            self.server.shutdown()
+            self.server = None
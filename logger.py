@@ -1,12 +1,23 @@
 # logger properties
 import os
+import queue
+import atexit
 import logging
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 current_directory = os.getcwd()
 current_dir = os.path.basename(current_directory)
 
 FORMAT = '[%(asctime)-15s][%(filename)s:%(lineno)d][%(levelname)s] %(message)s'
 loggers = {}
+listeners = []
+
+# ASYNC_LOGGING: loggers enqueue records and one background thread per log file
+# formats and writes them, so callers never touch the disk.
+ASYNC_LOGGING = True
+LOG_QUEUE_SIZE = 10000
+# what to do when the queue is full: "drop_new" discards the incoming record,
+# "drop_oldest" discards the oldest queued one to make room
+LOG_DROP_POLICY = "drop_new"
 
 LOGGER_PATH = './logger/'
 if not os.path.exists(LOGGER_PATH):
@@ -36,6 +47,8 @@ class SizeAndTimedRotatingFileHandler(TimedRotatingFileHandler):
         super().__init__(filename, when=when, interval=interval, backupCount=backup_count, encoding=encoding, delay=delay, utc=utc, atTime=at_time)
         # use snake_case to align with style checks
         self.max_bytes = max_bytes
+        # bytes in the current file, tracked on write instead of os.stat per record
+        self.bytes_written = None
 
     def shouldRollover(self, record):
         """_summary_
@@ -55,14 +68,126 @@ class SizeAndTimedRotatingFileHandler(TimedRotatingFileHandler):
         # Kiểm tra điều kiện quay vòng theo kích thước
         if self.stream is None:  # Nếu chưa mở file
             self.stream = self._open()
-        
-        if os.stat(self.baseFilename).st_size >= self.max_bytes:
+
+        if self.bytes_written is None:
+            # once per file: pick up what an earlier run already wrote
+            self.bytes_written = os.stat(self.baseFilename).st_size
+
+        if self.bytes_written >= self.max_bytes:
             return True
 
         return False
 
+    def doRollover(self):
+        super().doRollover()
+        self.bytes_written = 0
+
+    def format(self, record):
+        # called once per written record, after any rollover
+        msg = super().format(record)
+        if self.bytes_written is not None:
+            # encoded line + terminator, as written to the file
+            self.bytes_written += len(msg.encode(self.encoding or "utf-8", "replace")) + len(self.terminator)
+        return msg
+
+
+class BlockingQueueListener(QueueListener):
+    """
+    QueueListener whose stop sentinel waits for room in the bounded queue:
+    the base put_nowait raises queue.Full when the writer is behind at exit.
+    """
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler over a bounded queue that never blocks the caller.
+
+    When the queue is full the record is dropped (or the oldest queued record,
+    with drop_policy="drop_oldest") and counted in `dropped`. Drops are reported
+    in the same log as a WARNING line once the queue has room again, and at
+    shutdown (stop_listeners).
+    """
+    def __init__(self, log_queue, drop_policy=LOG_DROP_POLICY):
+        super().__init__(log_queue)
+        self.drop_policy = drop_policy
+        self.dropped = 0
+        # drops already reported in the log
+        self.reported = 0
+
+    def drop_record(self):
+        """WARNING record for the drops not reported yet, or None."""
+        n = self.dropped - self.reported
+        if n <= 0:
+            return None
+        return logging.makeLogRecord({
+            "name": "logger", "levelno": logging.WARNING, "levelname": "WARNING",
+            "filename": "logger.py", "lineno": 0,
+            "msg": f"[LOGGER] dropped {n} records, queue full (total {self.dropped})",
+        })
+
+    def prepare(self, record):
+        # same-process listener: hand the record over as is and let the writer
+        # thread do the formatting
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self.drop_policy == "drop_oldest":
+                try:
+                    self.queue.get_nowait()
+                    self.queue.put_nowait(record)
+                except (queue.Empty, queue.Full):
+                    pass
+            self.dropped += 1
+            return
+
+        if self.dropped != self.reported:
+            report = self.drop_record()
+            if report is not None:
+                try:
+                    self.queue.put_nowait(report)
+                    self.reported = self.dropped
+                except queue.Full:
+                    pass
+
+
+def stop_listeners():
+    """
+    Drains and stops every background log writer (registered with atexit), then
+    writes any unreported drop count straight to its file.
+    """
+    while listeners:
+        listener, queue_handler, file_handler = listeners.pop()
+        try:
+            listener.stop()
+        finally:
+            report = queue_handler.drop_record()
+            if report is not None:
+                file_handler.handle(report)
+                queue_handler.reported = queue_handler.dropped
+
+
+def dropped_records():
+    """
+    Returns:
+        dict: {logger name: records dropped so far} for the async loggers
+    """
+    return {
+        name: handler.dropped
+        for name, logger in loggers.items()
+        for handler in logger.handlers
+        if isinstance(handler, DroppingQueueHandler)
+    }
+
+
+atexit.register(stop_listeners)
 
-def setup_logger(name, log_file, level=logging.DEBUG):
+
+def setup_logger(name, log_file, level=logging.DEBUG, async_mode=None):
     """
     This function sets up a logger with the given name and log file.
 
@@ -74,6 +199,8 @@ def setup_logger(name, log_file, level=logging.DEBUG):
         The path to the log file.
     level : int
         The logging level.
+    async_mode : bool
+        Write through a background thread (QueueListener); defaults to ASYNC_LOGGING.
 
     Returns
     -------
@@ -94,6 +221,16 @@ def setup_logger(name, log_file, level=logging.DEBUG):
     handler.setLevel(level)
     logger2 = logging.getLogger(name)
     logger2.setLevel(level)
+
+    if ASYNC_LOGGING if async_mode is None else async_mode:
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        listener = BlockingQueueListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        file_handler = handler
+        handler = DroppingQueueHandler(log_queue)
+        handler.setLevel(level)
+        listeners.append((listener, handler, file_handler))
+
     logger2.addHandler(handler)
     logger2.propagate = False
     loggers[name] = logger2
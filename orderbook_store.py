@@ -0,0 +1,331 @@
+import json
+import threading
+import time
+from logger import logger_arb
+
+try:
+    import numpy as np
+except ImportError:  # levels_array is optional
+    np = None
+
+# Raw book/price_change frames published by poly_socket when PUBLISH_BOOK_EVENTS is set
+BOOK_EVENTS_CHANNEL = "polymarket_book_events"
+
+# Prices live on [0, 1]. 0.001 resolution covers both the 0.01 tick and the
+# 0.001 tick Polymarket switches to near the edges (tick_size_change).
+PRICE_RESOLUTION = 0.001
+
+
+class _Fenwick:
+    """Binary indexed tree over [0, n): point add, prefix sum and k-th search in O(log n)."""
+
+    def __init__(self, n):
+        self.n = n
+        self.tree = [0] * (n + 1)
+        self.log = 1 << (n.bit_length() - 1)
+
+    def add(self, i, delta):
+        i += 1
+        while i <= self.n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i):
+        """Sum of [0, i]; i = -1 gives 0."""
+        s = 0
+        i += 1
+        while i > 0:
+            s += self.tree[i]
+            i -= i & -i
+        return s
+
+    def search(self, target):
+        """Smallest i with prefix(i) >= target (values must be non-negative)."""
+        pos = 0
+        step = self.log
+        while step:
+            nxt = pos + step
+            if nxt <= self.n and self.tree[nxt] < target:
+                pos = nxt
+                target -= self.tree[nxt]
+            step >>= 1
+        return pos
+
+    def clear(self):
+        self.tree = [0] * (self.n + 1)
+
+
+class _BookSide:
+    """One side of a tick-indexed book: size per tick plus Fenwick trees for size and level count."""
+
+    def __init__(self, n):
+        self.sizes = [0.0] * n
+        self.size_tree = _Fenwick(n)
+        self.count_tree = _Fenwick(n)
+        self.levels = 0
+        self.total = 0.0
+
+    def set(self, i, size):
+        old = self.sizes[i]
+        if size == old:
+            return
+        self.sizes[i] = size
+        self.size_tree.add(i, size - old)
+        self.total += size - old
+        if old == 0:
+            self.count_tree.add(i, 1)
+            self.levels += 1
+        elif size == 0:
+            self.count_tree.add(i, -1)
+            self.levels -= 1
+
+    def kth(self, k):
+        """Tick index of the k-th (1-based) non-empty level in ascending price order."""
+        return self.count_tree.search(k)
+
+    def clear(self):
+        n = len(self.sizes)
+        self.sizes = [0.0] * n
+        self.size_tree.clear()
+        self.count_tree.clear()
+        self.levels = 0
+        self.total = 0.0
+
+
+class TickBook:
+    """
+    Full-depth L2 book for one token on a fixed price grid.
+
+    Level updates, best bid/ask, depth-at-price, cumulative size and the k-th level
+    are all O(1) or O(log n) with n = 1 / resolution + 1 ticks.
+    """
+
+    def __init__(self, token_id, resolution=PRICE_RESOLUTION):
+        self.token_id = token_id
+        self.resolution = resolution
+        self.n = int(round(1 / resolution)) + 1
+        self.bids = _BookSide(self.n)
+        self.asks = _BookSide(self.n)
+        self.ts = 0
+        self.hash = None
+        self.lock = threading.Lock()
+
+    def _tick(self, price):
+        i = int(round(float(price) / self.resolution))
+        if i < 0 or i >= self.n:
+            raise ValueError(f"price {price} outside [0, 1]")
+        return i
+
+    def _price(self, i):
+        return round(i * self.resolution, 6)
+
+    def _side(self, side):
+        return self.bids if side in ("BUY", "bid", "bids") else self.asks
+
+    # ---------- updates ----------
+
+    def apply_snapshot(self, bids, asks, ts=0, hash=None):
+        """Replace the whole book with a `book` snapshot ([{price, size}, ...] per side)."""
+        with self.lock:
+            self.bids.clear()
+            self.asks.clear()
+            for level in bids or []:
+                self.bids.set(self._tick(level["price"]), float(level["size"]))
+            for level in asks or []:
+                self.asks.set(self._tick(level["price"]), float(level["size"]))
+            self.ts = ts
+            self.hash = hash
+
+    def apply_change(self, side, price, size, ts=0, hash=None):
+        """Set one level from a `price_change` delta; size 0 removes the level."""
+        with self.lock:
+            self._side(side).set(self._tick(price), float(size))
+            if ts:
+                self.ts = ts
+            if hash is not None:
+                self.hash = hash
+
+    # ---------- queries ----------
+
+    def best_bid(self):
+        """(price, size) of the highest bid, or (None, 0.0) if the side is empty."""
+        side = self.bids
+        with self.lock:
+            if side.levels == 0:
+                return None, 0.0
+            i = side.kth(side.levels)
+            return self._price(i), side.sizes[i]
+
+    def best_ask(self):
+        """(price, size) of the lowest ask, or (None, 0.0) if the side is empty."""
+        side = self.asks
+        with self.lock:
+            if side.levels == 0:
+                return None, 0.0
+            i = side.kth(1)
+            return self._price(i), side.sizes[i]
+
+    def depth_at(self, side, price):
+        """Resting size at exactly `price` on `side`."""
+        i = self._tick(price)
+        with self.lock:
+            return self._side(side).sizes[i]
+
+    def cumulative_size(self, side, price):
+        """
+        Size available up to a limit price: asks priced <= price for "SELL"/asks,
+        bids priced >= price for "BUY"/bids.
+        """
+        i = self._tick(price)
+        with self.lock:
+            if self._side(side) is self.asks:
+                return self.asks.size_tree.prefix(i)
+            return self.bids.total - self.bids.size_tree.prefix(i - 1)
+
+    def levels(self, side, depth=None):
+        """
+        Best-first levels of one side.
+
+        Args:
+            side: "BUY"/"bids" or "SELL"/"asks"
+            depth: max number of levels (None = all)
+
+        Returns:
+            list of (price, size), best price first
+        """
+        book_side = self._side(side)
+        out = []
+        with self.lock:
+            count = book_side.levels if depth is None else min(depth, book_side.levels)
+            for k in range(count):
+                if book_side is self.asks:
+                    i = book_side.kth(k + 1)
+                else:
+                    i = book_side.kth(book_side.levels - k)
+                out.append((self._price(i), book_side.sizes[i]))
+        return out
+
+    def levels_array(self, side, depth=None):
+        """levels() as two NumPy arrays (prices, sizes), best first."""
+        if np is None:
+            raise ImportError("numpy is required for levels_array")
+        lv = self.levels(side, depth)
+        if not lv:
+            return np.empty(0), np.empty(0)
+        prices, sizes = zip(*lv)
+        return np.asarray(prices), np.asarray(sizes)
+
+
+class OrderBookStore:
+    """
+    In-memory L2 books for every token seen on the market WebSocket.
+
+    Feed it raw `book` / `price_change` frames (apply_message), or let it
+    subscribe to the feeder's BOOK_EVENTS_CHANNEL (start / listen).
+    """
+
+    def __init__(self, resolution=PRICE_RESOLUTION):
+        self.resolution = resolution
+        self.books = {}
+        self.thread = None
+        self.running = False
+
+    def book(self, token_id):
+        b = self.books.get(token_id)
+        if b is None:
+            b = self.books.setdefault(token_id, TickBook(token_id, self.resolution))
+        return b
+
+    def get(self, token_id):
+        """Book for token_id, or None if no snapshot/delta has been seen."""
+        return self.books.get(token_id)
+
+    def drop(self, token_ids):
+        """Forget books for expired tokens (e.g. after a 15m rollover)."""
+        for tid in token_ids:
+            self.books.pop(tid, None)
+
+    def apply_event(self, d):
+        """
+        Apply one decoded WS event.
+
+        Returns:
+            list of token ids whose book changed
+        """
+        event_type = d.get("event_type")
+        ts = int(float(d.get("timestamp") or 0))
+
+        if event_type == "book":
+            tid = d.get("asset_id")
+            if not tid:
+                return []
+            self.book(tid).apply_snapshot(d.get("bids"), d.get("asks"), ts, d.get("hash"))
+            return [tid]
+
+        if event_type == "price_change":
+            changed = []
+            for c in d.get("price_changes") or []:
+                tid = c.get("asset_id")
+                if not tid:
+                    continue
+                self.book(tid).apply_change(c.get("side"), c.get("price"), c.get("size") or 0, ts, c.get("hash"))
+                changed.append(tid)
+            return changed
+
+        return []
+
+    def apply_message(self, msg):
+        """Apply a raw WS frame (bytes/str holding one event or a list of events)."""
+        if isinstance(msg, (bytes, bytearray)):
+            msg = msg.decode()
+        if msg == "PONG":
+            return []
+        data = json.loads(msg)
+        if isinstance(data, dict):
+            return self.apply_event(data)
+        changed = []
+        for d in data:
+            changed.extend(self.apply_event(d))
+        return changed
+
+    def listen(self, redis, channel=BOOK_EVENTS_CHANNEL, on_update=None):
+        """
+        Block on the feeder's book event channel and keep the books current.
+
+        Args:
+            redis: redis.Redis client
+            channel: pub/sub channel the feeder publishes raw frames on
+            on_update: optional callback(list of changed token ids)
+        """
+        self.running = True
+        while self.running:
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(channel)
+                while self.running:
+                    msg = pubsub.get_message(timeout=1.0)
+                    if msg is None:
+                        continue
+                    try:
+                        changed = self.apply_message(msg["data"])
+                    except Exception as e:
+                        logger_arb.error(f"OrderBookStore apply error {e} line: {e.__traceback__.tb_lineno}")
+                        continue
+                    if on_update and changed:
+                        on_update(changed)
+            except Exception as e:
+                logger_arb.error(f"OrderBookStore listen error {e} line: {e.__traceback__.tb_lineno}")
+                time.sleep(1)
+            finally:
+                pubsub.close()
+
+    def start(self, redis, channel=BOOK_EVENTS_CHANNEL, on_update=None):
+        """Run listen() on a daemon thread."""
+        self.thread = threading.Thread(
+            target=self.listen, args=(redis, channel, on_update), name="orderbook_store", daemon=True
+        )
+        self.thread.start()
+        return self.thread
+
+    def stop(self):
+        self.running = False
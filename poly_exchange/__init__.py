@@ -1 +1,2 @@
 from .polymarket_private import PolymarketPrivate
+from .async_polymarket_private import AsyncPolymarketPrivate
@@ -0,0 +1,502 @@
+import time
+import json
+import asyncio
+import functools
+import httpx
+import redis.asyncio as aioredis
+from logger import logger_polymarket
+from utils import async_send_request, parse_headers
+
+from polymarket_private import (
+    PolymarketPrivate,
+    _market_meta_cache,
+    CLOB_API_URL,
+    GAMMA_API_URL,
+    MARKET_META_REDIS_TTL,
+)
+
+r = aioredis.Redis(host='localhost', port=6379, decode_responses=True)
+
+DEFAULT_MAX_CONCURRENCY = 32
+
+
+class AsyncPolymarketPrivate:
+    """
+    asyncio twin of `PolymarketPrivate`.
+
+    Market-data methods are native coroutines on an httpx.AsyncClient and an async
+    Redis client; bulk methods fan out with asyncio.gather under a concurrency limit,
+    so N markets cost about one round-trip instead of N. Every other
+    `PolymarketPrivate` method (orders, cancels, balances) is available under the
+    same name as a coroutine that runs the sync implementation in a worker thread.
+    """
+    def __init__(self, api_key='', secret_key='', wallet_address='', passphrase='', private_key='', proxy_wallet='',
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, http_client=None, redis_client=None):
+        """
+        Initializes a new instance of the `AsyncPolymarketPrivate` class.
+
+        Args:
+            api_key (str): Polymarket API key (POLY_API_KEY)
+            secret_key (str): Secret key for HMAC signature (POLY_SECRET)
+            wallet_address (str): Polygon wallet address (POLY_ADDRESS)
+            passphrase (str): API key passphrase (POLY_PASSPHRASE)
+            private_key (str): Polygon wallet private key (for signing orders)
+            proxy_wallet (str): Polymarket proxy wallet address
+            max_concurrency (int): Max in-flight HTTP requests for bulk methods
+            http_client (httpx.AsyncClient): Optional shared client (one is created otherwise)
+            redis_client (redis.asyncio.Redis): Optional async Redis client
+        """
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.wallet_address = wallet_address
+        self.passphrase = passphrase
+        self.private_key = private_key
+        self.proxy_wallet = proxy_wallet
+        self.max_concurrency = max_concurrency
+
+        self._sync = PolymarketPrivate(api_key, secret_key, wallet_address, passphrase, private_key, proxy_wallet)
+        self._http = http_client or httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+        )
+        self._redis = redis_client or r
+        self._semaphore = None
+
+    def __getattr__(self, name):
+        # Sync fallback: any PolymarketPrivate method not implemented natively here
+        # becomes a coroutine running in a worker thread
+        attr = getattr(self._sync, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(attr, *args, **kwargs)
+        return call
+
+    async def close(self):
+        await self._http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _request(self, method, url, params_or_data=None, headers=None):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            result = await async_send_request(self._http, method, url, params_or_data, headers=headers)
+        return json.loads(result) if isinstance(result, str) else result
+
+    async def _gather(self, fn, items):
+        """
+        Runs fn(item) for every item concurrently (bounded by max_concurrency at the
+        HTTP layer) and returns results in input order; exceptions are returned, not raised.
+        """
+        return await asyncio.gather(*(fn(item) for item in items), return_exceptions=True)
+
+    async def get_market_info(self, market_id=''):
+        """
+        Retrieves market information from Gamma API.
+
+        Args:
+            market_id (str): Market ID or condition ID
+
+        Returns:
+            dict: Market information or error
+        """
+        try:
+            params_map = {}
+            if market_id:
+                params_map['id'] = market_id
+
+            result = await self._request("GET", f"{GAMMA_API_URL}/markets", params_map, headers={})
+
+            if result:
+                if isinstance(result, list) and len(result) > 0:
+                    return {'data': result[0]}
+                elif isinstance(result, dict):
+                    return {'data': result}
+
+            return {'data': {}}
+        except Exception as e:
+            logger_polymarket.error(f"async get_market_info error {e} line: {e.__traceback__.tb_lineno}")
+            return {'error': str(e), 'data': {}}
+
+    async def get_market_meta(self, market_id, refresh=False):
+        """
+        Async version of `PolymarketPrivate.get_market_meta` (shares its in-process cache).
+        """
+        cache_key = f'polymarket_{market_id}_market_meta'
+        if not refresh:
+            meta = _market_meta_cache.get(market_id)
+            if meta is not None:
+                return meta
+
+            meta_redis = await self._redis.get(cache_key)
+            if meta_redis is not None:
+                meta = json.loads(meta_redis)
+                self._sync._cache_market_meta(market_id, meta)
+                return meta
+
+        market_info = await self.get_market_info(market_id)
+        if not market_info.get('data'):
+            return None
+
+        meta = self._sync._build_market_meta(market_info['data'])
+        if meta['closed'] or not meta['clobTokenIds']:
+            _market_meta_cache.pop(market_id)
+            await self._redis.delete(cache_key)
+            return meta
+
+        redis_ttl = MARKET_META_REDIS_TTL
+        if meta['end_ts']:
+            redis_ttl = min(redis_ttl, int(meta['end_ts'] - time.time()))
+        if redis_ttl > 0:
+            await self._redis.set(cache_key, json.dumps(meta), ex=redis_ttl)
+        self._sync._cache_market_meta(market_id, meta)
+        return meta
+
+    async def warm_market_meta(self, market_ids):
+        """
+        Loads the metadata of several markets concurrently.
+
+        Returns:
+            dict: Metadata keyed by market_id (closed or unknown markets are left out)
+        """
+        market_ids = list(market_ids)
+        metas = await self._gather(self.get_market_meta, market_ids)
+        return {
+            market_id: meta for market_id, meta in zip(market_ids, metas)
+            if isinstance(meta, dict) and not meta['closed']
+        }
+
+    async def _get_token_ids_from_market(self, market_id):
+        try:
+            meta = await self.get_market_meta(market_id)
+            if meta:
+                return meta['conditionId'], meta['clobTokenIds']
+        except Exception as e:
+            logger_polymarket.error(f"async _get_token_ids_from_market error {e}")
+
+        return None, []
+
+    async def get_orderbook(self, market_id, outcome_index=0, depth=50):
+        """
+        Retrieves the order book for a specific market from CLOB API.
+
+        Args:
+            market_id (str): Market ID
+            outcome_index (int): Which outcome to fetch (0=first outcome, 1=second outcome). Default: 0
+            depth (int): Number of levels per side to return. Default: 50
+
+        Returns:
+            dict: Order book data with bids/asks dicts, or None on error
+        """
+        try:
+            cache_key = f'polymarket_{market_id}_outcome{outcome_index}_orderbook'
+            cached_data = await self._redis.get(cache_key)
+            if cached_data:
+                return json.loads(cached_data)
+
+            condition_id, token_ids = await self._get_token_ids_from_market(market_id)
+            if not token_ids or outcome_index >= len(token_ids):
+                return None
+
+            result = await self._request("GET", f"{CLOB_API_URL}/book", {'token_id': token_ids[outcome_index]}, headers={})
+            if isinstance(result, dict) and 'error' not in result:
+                bids = result.get('bids', [])[:depth]
+                asks = result.get('asks', [])[:depth]
+
+                orderbook = {
+                    'ts': int(time.time() * 1000),
+                    'bids': {str(item.get('price', 0)): str(item.get('size', 0)) for item in bids},
+                    'asks': {str(item.get('price', 0)): str(item.get('size', 0)) for item in asks},
+                }
+
+                await self._redis.set(cache_key, json.dumps(orderbook, separators=(",", ":")), ex=2)
+                return orderbook
+
+            return None
+        except Exception as e:
+            logger_polymarket.error(f"async get_orderbook error {e} line: {e.__traceback__.tb_lineno}")
+            return None
+
+    async def get_order_book_full(self, market_id, outcome_index=0):
+        """
+        Full orderbook with all bid/ask levels, mid-price and market metadata, 2sec cache.
+
+        Args:
+            market_id (str): Market ID
+            outcome_index (int): Which outcome to fetch (0=first outcome, 1=second outcome). Default: 0
+
+        Returns:
+            dict: Full orderbook data with bids, asks, mid_price, market metadata or error
+        """
+        try:
+            cache_key = f'polymarket_{market_id}_orderbook_full'
+            cached_data = await self._redis.get(cache_key)
+            if cached_data is not None:
+                return {'data': json.loads(cached_data)}
+
+            condition_id, token_ids = await self._get_token_ids_from_market(market_id)
+            if not token_ids or outcome_index >= len(token_ids):
+                return {'error': f'No token ID found for market {market_id}', 'data': {}}
+
+            headers = parse_headers(
+                api_key=self.api_key,
+                secret_key=self.secret_key,
+                wallet_address=self.wallet_address,
+                passphrase=self.passphrase
+            )
+            result = await self._request("GET", f"{CLOB_API_URL}/book", {'token_id': token_ids[outcome_index]}, headers=headers)
+
+            if result and 'error' not in result:
+                orderbook = {
+                    'market': result.get('market', market_id),
+                    'asset_id': result.get('asset_id', ''),
+                    'timestamp': result.get('timestamp', ''),
+                    'hash': result.get('hash', ''),
+                    'min_order_size': result.get('min_order_size', '0'),
+                    'tick_size': result.get('tick_size', '0'),
+                    'neg_risk': result.get('neg_risk', False),
+                    'bids': result.get('bids', []),
+                    'asks': result.get('asks', []),
+                    'mid_price': self._sync._calculate_mid_price(result.get('bids', []), result.get('asks', []))
+                }
+                await self._redis.set(cache_key, json.dumps(orderbook), ex=2)
+                return {'data': orderbook}
+
+            return {'error': result.get('error', 'No orderbook data') if result else 'No orderbook data', 'data': {}}
+        except Exception as e:
+            logger_polymarket.error(f"async get_order_book_full error {e} line: {e.__traceback__.tb_lineno}")
+            return {'error': str(e), 'data': {}}
+
+    async def get_order_book_depth(self, market_id, depth=10):
+        """
+        Top N price levels orderbook with spread and mid-price.
+        """
+        try:
+            orderbook = await self.get_order_book_full(market_id)
+
+            if orderbook.get('data'):
+                data = orderbook['data']
+                return {
+                    'data': {
+                        'market': data.get('market'),
+                        'timestamp': data.get('timestamp'),
+                        'bids': data.get('bids', [])[:depth],
+                        'asks': data.get('asks', [])[:depth],
+                        'mid_price': data.get('mid_price'),
+                        'spread': self._sync._calculate_spread(data.get('bids', []), data.get('asks', []))
+                    }
+                }
+
+            return orderbook
+        except Exception as e:
+            logger_polymarket.error(f"async get_order_book_depth error {e} line: {e.__traceback__.tb_lineno}")
+            return {'error': str(e), 'data': {}}
+
+    async def get_multiple_orderbooks(self, market_ids):
+        """
+        Concurrent orderbook fetch for many markets.
+
+        Args:
+            market_ids (list): List of market IDs to fetch
+
+        Returns:
+            dict: Dictionary of orderbooks keyed by market_id or error
+        """
+        try:
+            results = await self._gather(self.get_order_book_full, market_ids)
+            orderbooks = {
+                market_id: result['data'] for market_id, result in zip(market_ids, results)
+                if isinstance(result, dict) and result.get('data')
+            }
+            return {'data': orderbooks}
+        except Exception as e:
+            logger_polymarket.error(f"async get_multiple_orderbooks error {e} line: {e.__traceback__.tb_lineno}")
+            return {'error': str(e), 'data': {}}
+
+    async def get_market_rates(self, market_ids=None):
+        """
+        Current rates (prices) for specific markets, fetched concurrently.
+
+        Args:
+            market_ids (list): List of market IDs to get rates for
+
+        Returns:
+            dict: Market rates with prices or error
+        """
+        try:
+            if not market_ids or len(market_ids) == 0:
+                return {'error': 'No market IDs provided', 'data': []}
+
+            rates = []
+            results = await self._gather(self.get_market_info, market_ids)
+            for market_id, market_info in zip(market_ids, results):
+                if isinstance(market_info, dict) and market_info.get('data'):
+                    info = market_info['data']
+                    rates.append({
+                        'market_id': market_id,
+                        'price': float(info.get('lastPrice', 0)),
+                        'price_yes': float(info.get('lastPriceYes', 0)) if info.get('lastPriceYes') else None,
+                        'price_no': float(info.get('lastPriceNo', 0)) if info.get('lastPriceNo') else None,
+                        'volume': float(info.get('volume', 0)),
+                        'volume_24h': float(info.get('volume24h', 0)),
+                        'timestamp': int(time.time() * 1000)
+                    })
+
+            return {'data': rates}
+        except Exception as e:
+            logger_polymarket.error(f"async get_market_rates error {e} line: {e.__traceback__.tb_lineno}")
+            return {'error': str(e), 'data': []}
+
+    async def get_market_spreads(self, market_ids=None):
+        """
+        Bid-ask spreads with percentage calculations, fetched concurrently.
+
+        Args:
+            market_ids (list): List of market IDs to get spreads for
+
+        Returns:
+            dict: bid, ask, spread, spread_pct for each market or error
+        """
+        try:
+            spreads = {}
+
+            if market_ids:
+                results = await self._gather(self.get_order_book_full, market_ids)
+                for market_id, orderbook in zip(market_ids, results):
+                    if not isinstance(orderbook, dict) or not orderbook.get('data'):
+                        continue
+                    data = orderbook['data']
+                    bids = data.get('bids', [])
+                    asks = data.get('asks', [])
+
+                    bid_price = bids[0].get('price') if bids else None
+                    ask_price = asks[0].get('price') if asks else None
+
+                    spread = self._sync._calculate_spread(bids, asks)
+                    spread_pct = 0
+                    if spread and bid_price:
+                        try:
+                            spread_pct = float(spread) / float(bid_price) * 100
+                        except (ValueError, ZeroDivisionError):
+                            spread_pct = 0
+
+                    spreads[market_id] = {
+                        'bid': bid_price,
+                        'ask': ask_price,
+                        'spread': spread,
+                        'spread_pct': spread_pct,
+                        'timestamp': data.get('timestamp')
+                    }
+
+            return {'data': spreads}
+        except Exception as e:
+            logger_polymarket.error(f"async get_market_spreads error {e} line: {e.__traceback__.tb_lineno}")
+            return {'error': str(e), 'data': {}}
+
+    async def get_market_liquidity(self, market_ids=None):
+        """
+        Liquidity metrics (volume, 24h volume, price), fetched concurrently.
+
+        Args:
+            market_ids (list): List of market IDs to get liquidity for
+
+        Returns:
+            dict: liquidity, volume, volume_24h, price for each market or error
+        """
+        try:
+            liquidity_data = {}
+
+            if market_ids:
+                results = await self._gather(self.get_market_info, market_ids)
+                for market_id, market_info in zip(market_ids, results):
+                    if isinstance(market_info, dict) and market_info.get('data'):
+                        liquidity_data[market_id] = {
+                            'liquidity': market_info['data'].get('liquidity', '0'),
+                            'volume': market_info['data'].get('volume', '0'),
+                            'volume_24h': market_info['data'].get('volume24h', '0'),
+                            'price': market_info['data'].get('lastPrice', '0')
+                        }
+
+            return {'data': liquidity_data}
+        except Exception as e:
+            logger_polymarket.error(f"async get_market_liquidity error {e} line: {e.__traceback__.tb_lineno}")
+            return {'error': str(e), 'data': {}}
+
+    async def get_market_statistics(self, market_id):
+        """
+        Market info + orderbook snapshot; both requests are sent concurrently. 5sec cache.
+        """
+        try:
+            cache_key = f'polymarket_{market_id}_statistics'
+            cached_data = await self._redis.get(cache_key)
+            if cached_data is not None:
+                return {'data': json.loads(cached_data)}
+
+            market_info, orderbook = await asyncio.gather(
+                self.get_market_info(market_id),
+                self.get_order_book_full(market_id)
+            )
+
+            if market_info.get('data') and orderbook.get('data'):
+                info = market_info['data']
+                book = orderbook['data']
+
+                stats = {
+                    'market_id': market_id,
+                    'question': info.get('question', ''),
+                    'description': info.get('description', ''),
+                    'outcome_type': info.get('outcomType', ''),
+                    'volume': info.get('volume', '0'),
+                    'liquidity': info.get('liquidity', '0'),
+                    'last_price': info.get('lastPrice', '0'),
+                    'last_price_yes': info.get('lastPriceYes', '0') if info.get('outcomType') == 'categorical' else None,
+                    'last_price_no': info.get('lastPriceNo', '0') if info.get('outcomType') == 'categorical' else None,
+                    'bid': book.get('bids', [{}])[0].get('price') if book.get('bids') else None,
+                    'ask': book.get('asks', [{}])[0].get('price') if book.get('asks') else None,
+                    'spread': self._sync._calculate_spread(book.get('bids', []), book.get('asks', [])),
+                    'mid_price': book.get('mid_price'),
+                    'volume_24h': info.get('volume24h', '0'),
+                    'resolution': info.get('resolution', ''),
+                    'end_date': info.get('endDate', ''),
+                    'neg_risk': book.get('neg_risk', False)
+                }
+
+                await self._redis.set(cache_key, json.dumps(stats), ex=5)
+                return {'data': stats}
+
+            return {'error': 'Market data not found', 'data': {}}
+        except Exception as e:
+            logger_polymarket.error(f"async get_market_statistics error {e} line: {e.__traceback__.tb_lineno}")
+            return {'error': str(e), 'data': {}}
+
+    async def get_market_summary(self, market_id):
+        """
+        Market statistics + fetch timestamp, 5sec cache.
+        """
+        try:
+            cache_key = f'polymarket_{market_id}_summary'
+            cached_data = await self._redis.get(cache_key)
+            if cached_data is not None:
+                return {'data': json.loads(cached_data)}
+
+            stats = await self.get_market_statistics(market_id)
+
+            if stats.get('data'):
+                summary = {
+                    **stats['data'],
+                    'fetch_timestamp': str(int(time.time() * 1000))
+                }
+
+                await self._redis.set(cache_key, json.dumps(summary), ex=5)
+                return {'data': summary}
+
+            return stats
+        except Exception as e:
+            logger_polymarket.error(f"async get_market_summary error {e} line: {e.__traceback__.tb_lineno}")
+            return {'error': str(e), 'data': {}}
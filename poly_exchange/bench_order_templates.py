@@ -0,0 +1,63 @@
+"""
+Micro-benchmark: time from (price, size) to a signed order.
+
+  builder.create_order   what a warm ClobClient does per order (rebuilds the
+                         exchange signer and EIP712 domain on every call)
+  template               PolymarketPrivate.sign_order_from_template (context
+                         pre-built by prepare_order_templates)
+
+Runs offline with a throwaway key; tick size / neg risk / fee rate are passed
+in, so no CLOB calls are made.
+
+Usage: python bench_order_templates.py [orders]
+"""
+import os
+import sys
+import time
+
+from eth_account import Account
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from polymarket_private import PolymarketPrivate
+from py_clob_client.clob_types import OrderArgs, CreateOrderOptions
+from py_clob_client.order_builder.constants import BUY
+
+TOKEN_ID = "87142374061000861551796777015507582795011030012469790923844501037328154887367"
+
+
+def bench(name, fn, orders):
+    fn(0)  # warm-up
+    samples = []
+    for i in range(orders):
+        started = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    print(f"{name:<24} mean={sum(samples) / len(samples):8.1f}us  p50={samples[len(samples) // 2]:8.1f}us  p99={samples[int(len(samples) * 0.99)]:8.1f}us")
+
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    private_key = Account.create().key.hex()
+    client = PolymarketPrivate(api_key='k', secret_key='c2VjcmV0', passphrase='p', private_key=private_key)
+    clob = client._get_clob_client()
+    # seed the fee rate so prepare_order_templates stays offline
+    clob._ClobClient__fee_rates[TOKEN_ID] = 0
+    client.prepare_order_templates(token_ids=[TOKEN_ID], tick_size='0.01', neg_risk=False)
+    template = client._order_templates[client._template_key(TOKEN_ID, BUY)]
+
+    prices = [0.40 + (i % 10) / 100 for i in range(orders)]
+
+    bench('builder.create_order', lambda i: clob.builder.create_order(
+        OrderArgs(token_id=TOKEN_ID, price=prices[i], size=10.0, side=BUY),
+        CreateOrderOptions(tick_size='0.01', neg_risk=False)
+    ), orders)
+    bench('template', lambda i: client.sign_order_from_template(template, prices[i], 10.0), orders)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: per-call latency of a fresh connection per request (old send_request,
+requests.request) vs the pooled keep-alive session, against a local HTTP server.
+
+Local loopback only measures the TCP handshake saving; against the real APIs
+the pooled session also skips the TLS handshake, so the gap is much larger.
+
+Usage: python bench_send_request.py [calls]
+"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from utils import send_request
+
+BODY = json.dumps({'market': '0xabc', 'bids': [{'price': '0.45', 'size': '100'}], 'asks': [{'price': '0.47', 'size': '80'}]}).encode()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def bench(name, fn, calls):
+    fn()  # warm-up
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    print(f"{name:<28} mean={sum(samples) / len(samples):8.1f}us  p50={samples[len(samples) // 2]:8.1f}us  p99={samples[int(len(samples) * 0.99)]:8.1f}us")
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/book"
+    params = {'token_id': '123'}
+
+    bench('requests.request (no pool)', lambda: requests.request('GET', url, params=params, timeout=30).text, calls)
+    bench('send_request (pooled)', lambda: send_request('GET', url, params), calls)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,28 @@
 import time
 import json
+import threading
+from datetime import datetime
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 import redis
 from logger import logger_polymarket
 # from utils import calculate_gap_hours, get_candle_data_info, convert_order_status, get_precision_from_real_number
-from utils import send_request, parse_headers
+from utils import send_request, parse_headers, LRUCache
 
 
 
 from py_clob_client.client import ClobClient
 from py_clob_client.order_builder.constants import BUY, SELL
+from py_clob_client.constants import ZERO_ADDRESS
 from py_clob_client.clob_types import OrderArgs, OrderType
 from py_clob_client.clob_types import ApiCreds as CliApiCreds
+from py_clob_client.clob_types import PostOrdersArgs
+from py_clob_client.config import get_contract_config
+from py_clob_client.order_builder.builder import ROUNDING_CONFIG
+from py_order_utils.builders import OrderBuilder as UtilsOrderBuilder
+from py_order_utils.signer import Signer as UtilsSigner
+from py_order_utils.model import OrderData
+from eth_account import Account
 
 r = redis.Redis(host='localhost', port=6379, decode_responses=True)
 
@@ -18,6 +30,23 @@ CLOB_API_URL = "https://clob.polymarket.com"
 DATA_API_URL = "https://data-api.polymarket.com"
 GAMMA_API_URL = "https://gamma-api.polymarket.com"
 
+# Market metadata cache (conditionId, token ids, tick size, neg risk, min size).
+# Tier 1: in-process LRU, tier 2: Redis. Entries expire at the market's end date.
+MARKET_META_LRU_SIZE = 2048
+MARKET_META_LRU_TTL = None  # seconds, None = until end date / eviction
+MARKET_META_REDIS_TTL = 24 * 3600
+_market_meta_cache = LRUCache(maxsize=MARKET_META_LRU_SIZE, ttl=MARKET_META_LRU_TTL)
+
+# Recurring slot markets (e.g. btc-updown-15m-1766377800), resolved by resolve_slot_markets.
+# Results are cached per slug for a little over one slot.
+SLOT_MARKET_PATTERN = '{asset}-updown-15m-{ts}'
+SLOT_SECONDS = 900
+_slot_market_cache = LRUCache(maxsize=256, ttl=2 * SLOT_SECONDS)
+
+# Max orders per POST /orders
+MAX_BATCH_ORDERS = 15
+ORDER_FIELDS = ('market_id', 'token_index', 'side', 'size', 'price', 'order_type')
+
 # Helper
 
 FILLED_LIST_STATUS = ["full_fill", "full-fill", "FILLED", "closed", "filled", "fills","finished", "finish", "Filled", "done"]
@@ -101,6 +130,13 @@ def get_precision_from_real_number(number):
     return precision
 
 
+def get_decimal_places(number):
+    """
+    Returns the number of decimal places of a tick size (e.g. 0.01 -> 2, 0.001 -> 3).
+    """
+    exponent = Decimal(str(number)).normalize().as_tuple().exponent
+    return max(-exponent, 0)
+
 def calculate_gap_hours(ts1, ts2):
     """
     Calculate the gap in hours between two timestamps.
@@ -135,6 +171,19 @@ def calculate_gap_hours(ts1, ts2):
     return difference_hours
 
 
+class _TemplateSigner(UtilsSigner):
+    """
+    py_order_utils signer that parses the private key once; the stock signer
+    re-derives the key (a public-key multiplication) on every signature.
+    """
+    def __init__(self, key):
+        super().__init__(key)
+        self._parsed_key = Account._parse_private_key(key)
+
+    def sign(self, struct_hash):
+        return Account._sign_hash(struct_hash, self._parsed_key).signature.hex()
+
+
 class PolymarketPrivate:
     """
     Class for interacting with the Polymarket CLOB API.
@@ -158,6 +207,76 @@ class PolymarketPrivate:
         self.order_dict = {}
         self.proxy_wallet = proxy_wallet
 
+        # ClobClient cache keyed by (signature_type, funder); see _get_clob_client
+        self._clob_clients = {}
+        self._clob_lock = threading.Lock()
+        self._api_creds = None
+
+        # Pre-built order signing context keyed by (token_id, side, signature_type, funder),
+        # since each is signed for one maker; see prepare_order_templates and _template_key
+        self._order_templates = {}
+
+    def _get_api_creds(self, client):
+        """
+        Returns the L2 API credentials, deriving them once per instance when
+        they were not passed in (an L1-signed network round-trip).
+        """
+        if self._api_creds is None:
+            if self.api_key and self.secret_key and self.passphrase:
+                self._api_creds = CliApiCreds(
+                    api_key=self.api_key,
+                    api_secret=self.secret_key,
+                    api_passphrase=self.passphrase
+                )
+            else:
+                self._api_creds = client.create_or_derive_api_creds()
+        return self._api_creds
+
+    def _get_clob_client(self, signature_type=None, funder=None):
+        """
+        Returns an L2-authenticated ClobClient for (signature_type, funder), built lazily
+        and reused across calls. py_clob_client sends every request through one shared
+        keep-alive HTTP client, and each ClobClient keeps its tick size / neg risk / fee
+        rate caches, so after warm-up an order costs one signature and one POST.
+        
+        Args:
+            signature_type (int): Signature type (0 for EOA, 1 for POLY_PROXY, 2 for GNOSIS_SAFE). Default: None (EOA)
+            funder (str): Funder address, only used together with signature_type
+            
+        Returns:
+            ClobClient: Cached client
+        """
+        cache_key = (signature_type, funder or None)
+        client = self._clob_clients.get(cache_key)
+        if client is not None:
+            return client
+
+        with self._clob_lock:
+            client = self._clob_clients.get(cache_key)
+            if client is None:
+                client_kwargs = {
+                    'host': CLOB_API_URL,
+                    'key': self.private_key,
+                    'chain_id': 137
+                }
+                if signature_type is not None:
+                    client_kwargs['signature_type'] = int(signature_type)
+                if funder:
+                    client_kwargs['funder'] = funder
+
+                client = ClobClient(**client_kwargs)
+                client.set_api_creds(self._get_api_creds(client))
+                self._clob_clients[cache_key] = client
+        return client
+
+    def reset_clob_clients(self):
+        """
+        Drops cached ClobClients and derived credentials (e.g. after rotating API keys).
+        """
+        with self._clob_lock:
+            self._clob_clients = {}
+            self._api_creds = None
+
     def _auth_headers(self, method, path, body=None):
         headers, serialized_body = parse_headers(
             method=method,
@@ -170,9 +289,136 @@ class PolymarketPrivate:
         )
         return headers, serialized_body
 
+    def _build_market_meta(self, market_data):
+        """
+        Extracts the static trading metadata of a Gamma market.
+        """
+        clobTokenIds_str = market_data.get('clobTokenIds', '[]')
+
+        # Parse clobTokenIds if it's a string
+        try:
+            if isinstance(clobTokenIds_str, str):
+                token_ids = json.loads(clobTokenIds_str)
+            else:
+                token_ids = clobTokenIds_str if isinstance(clobTokenIds_str, list) else []
+        except (json.JSONDecodeError, TypeError):
+            token_ids = []
+
+        end_ts = None
+        end_date = market_data.get('endDate')
+        if end_date:
+            try:
+                end_ts = datetime.fromisoformat(end_date.replace('Z', '+00:00')).timestamp()
+            except (ValueError, AttributeError):
+                end_ts = None
+
+        return {
+            'conditionId': market_data.get('conditionId', ''),
+            'clobTokenIds': token_ids,
+            'tick_size': market_data.get('orderPriceMinTickSize'),
+            'neg_risk': bool(market_data.get('negRisk', False)),
+            'min_order_size': market_data.get('orderMinSize'),
+            'closed': bool(market_data.get('closed', False)),
+            'end_ts': end_ts
+        }
+
+    def get_market_meta(self, market_id, refresh=False):
+        """
+        Returns the static trading metadata of a market, served from the in-process
+        LRU, then Redis, then the Gamma API. Closed/resolved markets are never cached
+        and entries expire at the market's end date.
+        
+        Args:
+            market_id (str): Market ID
+            refresh (bool): Skip both cache tiers and re-read from Gamma
+            
+        Returns:
+            dict: conditionId, clobTokenIds, tick_size, neg_risk, min_order_size, closed, end_ts
+                  or None if the market was not found
+        """
+        cache_key = f'polymarket_{market_id}_market_meta'
+        if not refresh:
+            meta = _market_meta_cache.get(market_id)
+            if meta is not None:
+                return meta
+
+            meta_redis = r.get(cache_key)
+            if meta_redis is not None:
+                meta = json.loads(meta_redis)
+                self._cache_market_meta(market_id, meta)
+                return meta
+
+        market_info = self.get_market_info(market_id)
+        if not market_info.get('data'):
+            return None
+
+        meta = self._build_market_meta(market_info['data'])
+        if meta['closed'] or not meta['clobTokenIds']:
+            self.invalidate_market_meta(market_id)
+            return meta
+
+        redis_ttl = MARKET_META_REDIS_TTL
+        if meta['end_ts']:
+            redis_ttl = min(redis_ttl, int(meta['end_ts'] - time.time()))
+        if redis_ttl > 0:
+            r.set(cache_key, json.dumps(meta), ex=redis_ttl)
+        self._cache_market_meta(market_id, meta)
+        return meta
+
+    def _cache_market_meta(self, market_id, meta):
+        ttl = None
+        if meta.get('end_ts'):
+            ttl = meta['end_ts'] - time.time()
+            if ttl <= 0:
+                return
+        if MARKET_META_LRU_TTL is not None:
+            ttl = MARKET_META_LRU_TTL if ttl is None else min(ttl, MARKET_META_LRU_TTL)
+        _market_meta_cache.set(market_id, meta, ttl=ttl)
+
+    def warm_market_meta(self, market_ids, max_workers=8):
+        """
+        Loads the metadata of several markets into both cache tiers (e.g. at startup).
+        
+        Args:
+            market_ids (list): Market IDs to warm up
+            max_workers (int): Concurrent Gamma requests
+            
+        Returns:
+            dict: Metadata keyed by market_id (closed or unknown markets are left out)
+        """
+        market_ids = list(market_ids)
+        if not market_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(market_ids))) as executor:
+            metas = list(executor.map(self.get_market_meta, market_ids))
+        return {market_id: meta for market_id, meta in zip(market_ids, metas) if meta and not meta['closed']}
+
+    def invalidate_market_meta(self, market_id):
+        """
+        Drops a market from both cache tiers (e.g. once it resolves).
+        """
+        _market_meta_cache.pop(market_id)
+        r.delete(f'polymarket_{market_id}_market_meta')
+
+    def invalidate_resolved_markets(self):
+        """
+        Re-checks every market in the in-process cache against Gamma and drops the
+        ones that are now closed.
+        
+        Returns:
+            list: Market IDs that were invalidated
+        """
+        resolved = []
+        for market_id in _market_meta_cache.keys():
+            meta = self.get_market_meta(market_id, refresh=True)
+            if meta is None or meta['closed']:
+                self.invalidate_market_meta(market_id)
+                resolved.append(market_id)
+        return resolved
+
     def _get_token_ids_from_market(self, market_id):
         """
-        Helper method to fetch token IDs for a market from Gamma API.
+        Helper method to resolve token IDs for a market (cached, see get_market_meta).
         
         Args:
             market_id (str): Market ID
@@ -181,22 +427,9 @@ class PolymarketPrivate:
             tuple: (conditionId, [token_ids]) or (None, []) if not found
         """
         try:
-            market_info = self.get_market_info(market_id)
-            if market_info.get('data'):
-                market_data = market_info['data']
-                condition_id = market_data.get('conditionId', '')
-                clobTokenIds_str = market_data.get('clobTokenIds', '[]')
-                
-                # Parse clobTokenIds if it's a string
-                try:
-                    if isinstance(clobTokenIds_str, str):
-                        token_ids = json.loads(clobTokenIds_str)
-                    else:
-                        token_ids = clobTokenIds_str if isinstance(clobTokenIds_str, list) else []
-                except (json.JSONDecodeError, TypeError):
-                    token_ids = []
-                
-                return condition_id, token_ids
+            meta = self.get_market_meta(market_id)
+            if meta:
+                return meta['conditionId'], meta['clobTokenIds']
         except Exception as e:
             logger_polymarket.error(f"_get_token_ids_from_market error {e}")
         
@@ -250,11 +483,23 @@ class PolymarketPrivate:
         Retrieves the price and quantity scales for the given market.
         """
         try:
+            # warm market meta: no Redis round trip on the order path
+            meta = _market_meta_cache.get(market_id)
+            if meta and meta.get('tick_size'):
+                return get_decimal_places(meta['tick_size']), float(meta['min_order_size']) if meta.get('min_order_size') else 2
+
             cache_key = f'polymarket_{market_id}_scale'
             scale_redis = r.get(cache_key)
             if scale_redis is not None:
                 scale = json.loads(scale_redis)
                 return int(scale["priceScale"]), int(scale["qtyScale"])
+
+            meta = self.get_market_meta(market_id)
+            if meta and meta.get('tick_size'):
+                price_scale = get_decimal_places(meta['tick_size'])
+                quantity_scale = float(meta['min_order_size']) if meta.get('min_order_size') else 2
+                r.set(cache_key, json.dumps({'priceScale': price_scale, 'qtyScale': quantity_scale}), ex=3600)
+                return price_scale, quantity_scale
           
             book_data = self.get_order_book_full(market_id, outcome_index=0)
             
@@ -311,34 +556,12 @@ class PolymarketPrivate:
             token_id = token_ids[token_index]
             side_enum = BUY if side.upper() == 'BUY' else SELL
             funder = self.proxy_wallet if signature_type == 1  or signature_type == 2 else funder
-            client_kwargs = {
-                'host': CLOB_API_URL,
-                'key': self.private_key,
-                'chain_id': 137
-            }
-            if signature_type is not None:
-                client_kwargs['signature_type'] = int(signature_type)
-                if funder:
-                    client_kwargs['funder'] = funder
-                elif self.wallet_address:
-                    client_kwargs['funder'] = self.wallet_address
-
-            if (signature_type == 1 or signature_type == 2) and 'funder' not in client_kwargs:
-                 client_kwargs['funder'] = self.wallet_address
+            if signature_type is None:
+                funder = None
+            elif not funder:
+                funder = self.wallet_address
 
-            client = ClobClient(**client_kwargs)
-            
-
-            if self.api_key and self.secret_key and self.passphrase:
-                api_creds = CliApiCreds(
-                    api_key=self.api_key,
-                    api_secret=self.secret_key,
-                    api_passphrase=self.passphrase
-                )
-                client.set_api_creds(api_creds)
-            else:
-                client.set_api_creds(client.create_or_derive_api_creds())
-            # client.set_api_creds(client.create_or_derive_api_creds())
+            client = self._get_clob_client(signature_type, funder)
             
             if order_type.upper() == 'MARKET' and side.upper() == 'BUY':
                 size = float(size) * float(price)
@@ -399,9 +622,7 @@ class PolymarketPrivate:
             dict: Response containing order details or error
         """
         try:
-            from py_clob_client.client import ClobClient
-            from py_clob_client.order_builder.constants import BUY, SELL
-            from py_clob_client.clob_types import ApiCreds, OrderArgs, PartialCreateOrderOptions, OrderType
+            from py_clob_client.clob_types import PartialCreateOrderOptions
             
             if not self.private_key:
                 return {'error': 'private_key is required to place orders', 'data': {}}
@@ -427,29 +648,7 @@ class PolymarketPrivate:
                 elif not funder and self.wallet_address:
                     funder = self.wallet_address
             
-            # Create API credentials for L2 auth
-            api_creds = ApiCreds(
-                api_key=self.api_key,
-                api_secret=self.secret_key,
-                api_passphrase=self.passphrase
-            )
-            
-            # Initialize ClobClient with credentials passed directly
-            client_kwargs = {
-                'host': CLOB_API_URL,
-                'chain_id': 137,
-                'key': self.private_key,
-                'creds': api_creds
-            }
-            
-            if signature_type is not None:
-                client_kwargs['signature_type'] = int(signature_type)
-            
-            if funder:
-                client_kwargs['funder'] = funder
-            
-            # print(f"DEBUG: Initializing ClobClient L2 with kwargs: {client_kwargs}")
-            client = ClobClient(**client_kwargs)
+            client = self._get_clob_client(signature_type, funder)
             
             # Create order arguments and options
             if order_type.upper() == 'MARKET' and side.upper() == 'BUY':
@@ -495,6 +694,267 @@ class PolymarketPrivate:
             logger_polymarket.error(f"place_order_v2 error {e} line: {e.__traceback__.tb_lineno}")
             return {'error': str(e), 'data': {}}
 
+    def prepare_order_templates(self, market_id=None, token_ids=None, tick_size=None, neg_risk=None, signature_type=None, funder=None):
+        """
+        Pre-builds the signing context of a market's tokens for both sides, so an
+        order only needs price/size patched in and one signature at fire time.
+        Call it at market rollover, off the hot path.
+        
+        Args:
+            market_id (str): Market ID (token ids, tick size and neg risk come from get_market_meta)
+            token_ids (list): Token IDs, if already known (e.g. from the feeder's tickers)
+            tick_size (str): Tick size override (default: market metadata or the CLOB)
+            neg_risk (bool): Neg risk override (default: market metadata or the CLOB)
+            signature_type (int): Signature type (0 for EOA, 1 for POLY_PROXY, 2 for GNOSIS_SAFE). Default: None (EOA)
+            funder (str): Funder address (Polymarket proxy address for funded accounts)
+            
+        Returns:
+            dict: Templates keyed by (token_id, side) or error
+        """
+        try:
+            if not self.private_key:
+                return {'error': 'private_key is required to place orders', 'data': {}}
+
+            if market_id and not token_ids:
+                meta = self.get_market_meta(market_id)
+                if not meta or not meta['clobTokenIds']:
+                    return {'error': f'No token IDs found for market {market_id}', 'data': {}}
+                token_ids = meta['clobTokenIds']
+                if tick_size is None and meta.get('tick_size'):
+                    tick_size = str(meta['tick_size'])
+                if neg_risk is None:
+                    neg_risk = meta['neg_risk']
+
+            funder = self._template_funder(signature_type, funder)
+            client = self._get_clob_client(signature_type, funder)
+
+            # one exchange-bound signer per neg_risk flag (holds the EIP712 domain separator)
+            order_builders = {}
+            templates = {}
+            for token_id in token_ids:
+                token_tick = tick_size or client.get_tick_size(token_id)
+                token_neg_risk = client.get_neg_risk(token_id) if neg_risk is None else neg_risk
+                if token_neg_risk not in order_builders:
+                    order_builders[token_neg_risk] = UtilsOrderBuilder(
+                        get_contract_config(client.signer.get_chain_id(), token_neg_risk).exchange,
+                        client.signer.get_chain_id(),
+                        _TemplateSigner(client.signer.private_key)
+                    )
+
+                for side in (BUY, SELL):
+                    template = {
+                        'token_id': token_id,
+                        'side': side,
+                        'tick_size': str(token_tick),
+                        'round_config': ROUNDING_CONFIG[str(token_tick)],
+                        'neg_risk': token_neg_risk,
+                        'fee_rate_bps': client.get_fee_rate_bps(token_id),
+                        'maker': client.builder.funder,
+                        'signer': client.signer.address(),
+                        'signature_type': client.builder.sig_type,
+                        'client': client,
+                        'order_builder': order_builders[token_neg_risk]
+                    }
+                    templates[(token_id, side)] = template
+                    self._order_templates[(token_id, side, signature_type, funder)] = template
+
+            return {'data': templates}
+        except Exception as e:
+            logger_polymarket.error(f"prepare_order_templates error {e} line: {e.__traceback__.tb_lineno}")
+            return {'error': str(e), 'data': {}}
+
+    def _template_funder(self, signature_type, funder):
+        """Funder a template is signed for: proxy/safe default for types 1 and 2, none for EOA."""
+        if signature_type is None:
+            return None
+        if signature_type in (1, 2) and not funder:
+            return self.proxy_wallet or self.wallet_address
+        return funder or None
+
+    def _template_key(self, token_id, side, signature_type=None, funder=None):
+        """
+        Key of the order template for token/side signed for (signature_type, funder).
+        Orders for the same token under another maker must not share a template.
+        """
+        return (token_id, side, signature_type, self._template_funder(signature_type, funder))
+
+    def clear_order_templates(self, token_ids=None):
+        """
+        Drops order templates (all of them, or only those of the given tokens).
+        """
+        if token_ids is None:
+            self._order_templates = {}
+            return
+        token_ids = set(token_ids)
+        self._order_templates = {k: v for k, v in self._order_templates.items() if k[0] not in token_ids}
+
+    def sign_order_from_template(self, template, price, size):
+        """
+        Signs an order from a template: computes maker/taker amounts for price/size
+        and signs with the template's pre-built exchange signer. No network calls.
+        
+        Returns:
+            SignedOrder: Signed order ready for post_order
+        """
+        tick = float(template['tick_size'])
+        price = float(price)
+        if price < tick or price > 1 - tick:
+            raise ValueError(f"price ({price}), min: {template['tick_size']} - max: {1 - tick}")
+
+        side, maker_amount, taker_amount = template['client'].builder.get_order_amounts(
+            template['side'], float(size), price, template['round_config']
+        )
+        data = OrderData(
+            maker=template['maker'],
+            taker=ZERO_ADDRESS,
+            tokenId=template['token_id'],
+            makerAmount=str(maker_amount),
+            takerAmount=str(taker_amount),
+            side=side,
+            feeRateBps=str(template['fee_rate_bps']),
+            nonce='0',
+            signer=template['signer'],
+            expiration='0',
+            signatureType=template['signature_type']
+        )
+        return template['order_builder'].build_signed_order(data)
+
+    def place_order_from_template(self, token_id, side, size, price, order_type='LIMIT', signature_type=None, funder=None):
+        """
+        Places an order using a template built by prepare_order_templates:
+        one signature and one POST.
+        
+        Args:
+            token_id (str): Token ID
+            side (str): Order side ('BUY' or 'SELL')
+            size (str): Order size (in shares)
+            price (str): Order price (0-1 for binary markets)
+            order_type (str): 'LIMIT' (GTC) or 'MARKET' (FOK). Default: 'LIMIT'
+            signature_type (int): Signature type the template was prepared for. Default: None (EOA)
+            funder (str): Funder the template was prepared for
+            
+        Returns:
+            dict: Response containing order details or error
+        """
+        try:
+            side_enum = BUY if side.upper() == 'BUY' else SELL
+            template = self._order_templates.get(self._template_key(token_id, side_enum, signature_type, funder))
+            if template is None:
+                return {'error': f'No order template for token {token_id} {side_enum}', 'data': {}}
+
+            signed_order = self.sign_order_from_template(template, price, size)
+            order_type_enum = OrderType.FOK if order_type.upper() == 'MARKET' else OrderType.GTC
+
+            order_result = template['client'].post_order(signed_order, order_type_enum)
+            if order_result:
+                return {'data': order_result}
+            else:
+                return {'error': 'Failed to place order', 'data': {}}
+        except Exception as e:
+            logger_polymarket.error(f"place_order_from_template error {e} line: {e.__traceback__.tb_lineno}")
+            return {'error': str(e), 'data': {}}
+
+    def _sign_batch_order(self, order, signature_type, funder):
+        """
+        Resolves the token and signs one place_orders input (via its order template).
+        """
+        side_enum = BUY if str(order['side']).upper() == 'BUY' else SELL
+        token_id = order.get('token_id')
+        tick_size = None
+        neg_risk = None
+        if not token_id:
+            meta = self.get_market_meta(order['market_id'])
+            token_index = order.get('token_index', 0)
+            if not meta or len(meta['clobTokenIds']) <= token_index:
+                raise ValueError(f"token_index {token_index} not found in market {order['market_id']}")
+            token_id = meta['clobTokenIds'][token_index]
+            tick_size = str(meta['tick_size']) if meta.get('tick_size') else None
+            neg_risk = meta['neg_risk']
+
+        key = self._template_key(token_id, side_enum, signature_type, funder)
+        template = self._order_templates.get(key)
+        if template is None:
+            prepared = self.prepare_order_templates(token_ids=[token_id], tick_size=tick_size, neg_risk=neg_risk,
+                                                    signature_type=signature_type, funder=funder)
+            if prepared.get('error'):
+                raise ValueError(prepared['error'])
+            template = self._order_templates[key]
+
+        price = round(float(order['price']), get_decimal_places(template['tick_size']))
+        signed_order = self.sign_order_from_template(template, price, order['size'])
+        order_type = str(order.get('order_type') or 'LIMIT').upper()
+        order_type_enum = OrderType.FOK if order_type in ('MARKET', 'FOK') else getattr(OrderType, order_type, OrderType.GTC)
+        return template['client'], PostOrdersArgs(order=signed_order, orderType=order_type_enum)
+
+    def place_orders(self, orders, signature_type=None, funder=None, max_workers=4):
+        """
+        Signs and places many orders, batched into POST /orders requests of up to
+        MAX_BATCH_ORDERS. Orders are signed in parallel from order templates.
+        'MARKET' orders are sent as FOK at the given (marketable) price.
+        
+        Args:
+            orders (list): Tuples (market_id, token_index, side, size, price, order_type)
+                           or dicts with those keys; a dict may give 'token_id' instead of
+                           market_id/token_index
+            signature_type (int): Signature type (0 for EOA, 1 for POLY_PROXY, 2 for GNOSIS_SAFE). Default: None (EOA)
+            funder (str): Funder address (Polymarket proxy address for funded accounts)
+            max_workers (int): Signing threads
+            
+        Returns:
+            dict: {'data': [...]} with one entry per input, in input order:
+                  {'index': i, 'input': order, 'data': response} or {'index': i, 'input': order, 'error': str}
+        """
+        try:
+            if not self.private_key:
+                return {'error': 'private_key is required to place orders', 'data': []}
+
+            orders = [dict(zip(ORDER_FIELDS, o)) if isinstance(o, (tuple, list)) else dict(o) for o in orders]
+            results = [{'index': i, 'input': order} for i, order in enumerate(orders)]
+            if not orders:
+                return {'data': []}
+
+            def sign(order):
+                try:
+                    return self._sign_batch_order(order, signature_type, funder)
+                except Exception as e:
+                    return e
+
+            if len(orders) == 1:
+                signed = [sign(orders[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(orders))) as executor:
+                    signed = list(executor.map(sign, orders))
+
+            pending = []
+            for i, item in enumerate(signed):
+                if isinstance(item, Exception):
+                    results[i]['error'] = str(item)
+                else:
+                    pending.append((i, item))
+
+            for start in range(0, len(pending), MAX_BATCH_ORDERS):
+                chunk = pending[start:start + MAX_BATCH_ORDERS]
+                client = chunk[0][1][0]
+                try:
+                    response = client.post_orders([args for _, (_, args) in chunk])
+                except Exception as e:
+                    response = {'error': str(e)}
+
+                if not isinstance(response, list) or len(response) != len(chunk):
+                    for i, _ in chunk:
+                        results[i]['error'] = str(response.get('error') if isinstance(response, dict) else response)
+                    continue
+
+                for (i, _), item in zip(chunk, response):
+                    if isinstance(item, dict) and (item.get('success') is False or item.get('errorMsg')):
+                        results[i]['error'] = item.get('errorMsg') or 'order rejected'
+                    results[i]['data'] = item
+
+            return {'data': results}
+        except Exception as e:
+            logger_polymarket.error(f"place_orders error {e} line: {e.__traceback__.tb_lineno}")
+            return {'error': str(e), 'data': []}
+
     def cancel_order(self, order_id):
         """
         Cancels a single OPEN order by ID using py_clob_client.
@@ -508,29 +968,10 @@ class PolymarketPrivate:
             dict: Response with canceled and not_canceled order information
         """
         try:
-            from py_clob_client.client import ClobClient
-            
             if not self.private_key:
                 return {'error': 'private_key is required to cancel orders', 'data': {}}
             
-            client_kwargs = {
-                'host': CLOB_API_URL,
-                'key': self.private_key,
-                'chain_id': 137
-            }
-            
-            client = ClobClient(**client_kwargs)
-            
-            if self.api_key and self.secret_key and self.passphrase:
-                from py_clob_client.clob_types import ApiCreds as CliApiCreds
-                api_creds = CliApiCreds(
-                    api_key=self.api_key,
-                    api_secret=self.secret_key,
-                    api_passphrase=self.passphrase
-                )
-                client.set_api_creds(api_creds)
-            else:
-                client.set_api_creds(client.create_or_derive_api_creds())
+            client = self._get_clob_client()
             
             result = client.cancel(order_id=order_id)
             
@@ -554,29 +995,10 @@ class PolymarketPrivate:
             dict: Order details or error
         """
         try:
-            from py_clob_client.client import ClobClient
-            
             if not self.private_key:
                 return {'error': 'private_key is required to get order details', 'data': {}}
             
-            client_kwargs = {
-                'host': CLOB_API_URL,
-                'key': self.private_key,
-                'chain_id': 137
-            }
-            
-            client = ClobClient(**client_kwargs)
-            
-            if self.api_key and self.secret_key and self.passphrase:
-                from py_clob_client.clob_types import ApiCreds as CliApiCreds
-                api_creds = CliApiCreds(
-                    api_key=self.api_key,
-                    api_secret=self.secret_key,
-                    api_passphrase=self.passphrase
-                )
-                client.set_api_creds(api_creds)
-            else:
-                client.set_api_creds(client.create_or_derive_api_creds())
+            client = self._get_clob_client()
             
             order_info = client.get_order(order_id)
             
@@ -616,29 +1038,10 @@ class PolymarketPrivate:
             dict: List of open orders or error
         """
         try:
-            from py_clob_client.client import ClobClient
-            
             if not self.private_key:
                 return {'error': 'private_key is required to get open orders', 'data': []}
             
-            client_kwargs = {
-                'host': CLOB_API_URL,
-                'key': self.private_key,
-                'chain_id': 137
-            }
-            
-            client = ClobClient(**client_kwargs)
-            
-            if self.api_key and self.secret_key and self.passphrase:
-                from py_clob_client.clob_types import ApiCreds as CliApiCreds
-                api_creds = CliApiCreds(
-                    api_key=self.api_key,
-                    api_secret=self.secret_key,
-                    api_passphrase=self.passphrase
-                )
-                client.set_api_creds(api_creds)
-            else:
-                client.set_api_creds(client.create_or_derive_api_creds())
+            client = self._get_clob_client()
             
             orders = client.get_orders()
             
@@ -739,35 +1142,12 @@ class PolymarketPrivate:
             dict: Balance and allowance data
         """
         try:
-            from py_clob_client.client import ClobClient
             from py_clob_client.clob_types import BalanceAllowanceParams, AssetType
             
             if not self.private_key:
                 return {'error': 'private_key is required', 'data': {}}
             
-            client_kwargs = {
-                'host': CLOB_API_URL,
-                'key': self.private_key,
-                'chain_id': 137
-            }
-            
-            if signature_type is not None:
-                client_kwargs['signature_type'] = int(signature_type)
-            if funder:
-                client_kwargs['funder'] = funder
-            
-            client = ClobClient(**client_kwargs)
-            
-            if self.api_key and self.secret_key and self.passphrase:
-                from py_clob_client.clob_types import ApiCreds as CliApiCreds
-                api_creds = CliApiCreds(
-                    api_key=self.api_key,
-                    api_secret=self.secret_key,
-                    api_passphrase=self.passphrase
-                )
-                client.set_api_creds(api_creds)
-            else:
-                client.set_api_creds(client.create_or_derive_api_creds())
+            client = self._get_clob_client(signature_type, funder)
             
             if params is None:
                 params = BalanceAllowanceParams(asset_type=AssetType.COLLATERAL)
@@ -871,29 +1251,10 @@ class PolymarketPrivate:
                   - not_canceled: dict of order IDs that failed to cancel with reasons
         """
         try:
-            from py_clob_client.client import ClobClient
-            
             if not self.private_key:
                 return {'error': 'private_key is required to cancel orders', 'data': {}}
             
-            client_kwargs = {
-                'host': CLOB_API_URL,
-                'key': self.private_key,
-                'chain_id': 137
-            }
-            
-            client = ClobClient(**client_kwargs)
-            
-            if self.api_key and self.secret_key and self.passphrase:
-                from py_clob_client.clob_types import ApiCreds as CliApiCreds
-                api_creds = CliApiCreds(
-                    api_key=self.api_key,
-                    api_secret=self.secret_key,
-                    api_passphrase=self.passphrase
-                )
-                client.set_api_creds(api_creds)
-            else:
-                client.set_api_creds(client.create_or_derive_api_creds())
+            client = self._get_clob_client()
             
             result = client.cancel_all()
             
@@ -1162,6 +1523,92 @@ class PolymarketPrivate:
             logger_polymarket.error(f"get_market_info error {e} line: {e.__traceback__.tb_lineno}")
             return {'error': str(e), 'data': {}}
 
+    def get_market_by_slug(self, slug):
+        """
+        Retrieves a market by slug from Gamma API.
+        
+        Args:
+            slug (str): Market slug, e.g. 'btc-updown-15m-1766377800'
+            
+        Returns:
+            dict: {'data': market} ({'data': {}} if the slug is not listed yet) or error
+        """
+        try:
+            url = f"{GAMMA_API_URL}/markets/slug/{slug}"
+            result = send_request("GET", url, {}, headers={})
+            result = json.loads(result) if isinstance(result, str) else result
+
+            if isinstance(result, dict) and result.get('id'):
+                return {'data': result}
+            return {'data': {}}
+        except Exception as e:
+            logger_polymarket.error(f"get_market_by_slug error {e} line: {e.__traceback__.tb_lineno}")
+            return {'error': str(e), 'data': {}}
+
+    def resolve_slot_markets(self, assets, slot_ts=None, next_slot=False, pattern=SLOT_MARKET_PATTERN,
+                             slot_seconds=SLOT_SECONDS, retry_delay=0.5, deadline=10.0, max_workers=8):
+        """
+        Resolves one slot's recurring markets (one per asset) concurrently.
+        
+        Slugs that are not listed yet are retried every retry_delay seconds until
+        the deadline. Found markets are cached per slug for the slot and their
+        metadata is pushed into the get_market_meta cache, so the first order
+        after a rollover does not hit Gamma.
+        
+        Args:
+            assets (list): e.g. ['btc', 'eth', 'sol', 'xrp']
+            slot_ts (int): Slot start (unix seconds); default: the current slot
+            next_slot (bool): Resolve the slot after slot_ts (pre-rollover)
+            pattern (str): Slug pattern with {asset} and {ts}
+            slot_seconds (int): Slot length in seconds
+            retry_delay (float): Seconds between attempts for a missing slug
+            deadline (float): Seconds before giving up on missing slugs
+            max_workers (int): Concurrent Gamma requests
+            
+        Returns:
+            dict: {'data': {asset: {'slug', 'market_id', 'outcomes', **market meta}}, 'slot_ts': int,
+                   'missing': [assets not listed before the deadline]}
+        """
+        if slot_ts is None:
+            slot_ts = int(time.time()) // slot_seconds * slot_seconds
+        if next_slot:
+            slot_ts += slot_seconds
+        stop_at = time.time() + deadline
+
+        def resolve(asset):
+            slug = pattern.format(asset=asset.lower(), ts=slot_ts)
+            cached = _slot_market_cache.get(slug)
+            if cached is not None:
+                return cached
+            while True:
+                market = self.get_market_by_slug(slug).get('data')
+                if market:
+                    try:
+                        outcomes = json.loads(market.get('outcomes') or '[]')
+                    except (json.JSONDecodeError, TypeError):
+                        outcomes = []
+                    meta = self._build_market_meta(market)
+                    info = {'slug': slug, 'market_id': str(market['id']), 'outcomes': outcomes, **meta}
+                    _slot_market_cache.set(slug, info)
+                    if not meta['closed'] and meta['clobTokenIds']:
+                        self._cache_market_meta(info['market_id'], meta)
+                    return info
+                if time.time() + retry_delay > stop_at:
+                    return None
+                time.sleep(retry_delay)
+
+        assets = list(assets)
+        if not assets:
+            return {'data': {}, 'slot_ts': slot_ts, 'missing': []}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(assets))) as executor:
+            results = list(executor.map(resolve, assets))
+
+        data = {asset: info for asset, info in zip(assets, results) if info}
+        missing = [asset for asset, info in zip(assets, results) if not info]
+        if missing:
+            logger_polymarket.error(f"resolve_slot_markets slot {slot_ts} missing {missing}")
+        return {'data': data, 'slot_ts': slot_ts, 'missing': missing}
+
     def get_orderbook(self, market_id, outcome_index=0, depth=50):
         """
         Retrieves the order book for a specific market from CLOB API.
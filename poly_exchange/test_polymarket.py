@@ -10,6 +10,7 @@ ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
+import polymarket_private
 from polymarket_private import PolymarketPrivate
 from py_clob_client.clob_types import BalanceAllowanceParams, AssetType
 
@@ -25,6 +26,132 @@ PROXY_ADDRESS = "0xd0dE444431FcfFF4C538bE8949Cc01025cB260e1"  #vi deposit
 MARKET_ID = '601698' 
 TAG_ID = 1
 
+def check_clob_client_reuse(orders=100):
+    """
+    Offline: after warm-up _get_clob_client / _get_api_creds make no network
+    calls, and place_order / place_order_v2 cost one post_order each.
+    ClobClient is patched with a counter that keeps py_clob_client's
+    per-client tick size / neg risk / fee rate caches (construction,
+    create_or_derive_api_creds, the three metadata getters on a cache miss
+    and post_order are the calls that hit the network). Gamma and Redis are
+    counted too; the market meta is warmed first.
+
+        python test_polymarket.py --clob-cache
+    """
+    counts = {"clients": 0, "derive": 0, "cancel": 0, "tick_size": 0, "neg_risk": 0, "fee_rate": 0,
+              "create": 0, "post": 0, "gamma": 0, "redis": 0}
+
+    class CountingClobClient:
+        def __init__(self, **kwargs):
+            counts["clients"] += 1
+            self.kwargs = kwargs
+            self.tick_sizes, self.neg_risks, self.fee_rates = {}, {}, {}
+
+        def create_or_derive_api_creds(self):
+            counts["derive"] += 1
+            return polymarket_private.CliApiCreds(api_key="k", api_secret="s", api_passphrase="p")
+
+        def set_api_creds(self, creds):
+            self.creds = creds
+
+        def cancel(self, order_id):
+            counts["cancel"] += 1
+            return {"canceled": [order_id], "not_canceled": {}}
+
+        def get_tick_size(self, token_id):
+            if token_id not in self.tick_sizes:
+                counts["tick_size"] += 1
+                self.tick_sizes[token_id] = "0.01"
+            return self.tick_sizes[token_id]
+
+        def get_neg_risk(self, token_id):
+            if token_id not in self.neg_risks:
+                counts["neg_risk"] += 1
+                self.neg_risks[token_id] = False
+            return self.neg_risks[token_id]
+
+        def get_fee_rate_bps(self, token_id):
+            if token_id not in self.fee_rates:
+                counts["fee_rate"] += 1
+                self.fee_rates[token_id] = 0
+            return self.fee_rates[token_id]
+
+        def create_order(self, order_args, options=None):
+            # same lookups as py_clob_client ClobClient.create_order
+            counts["create"] += 1
+            self.get_tick_size(order_args.token_id)
+            if not (options and options.neg_risk):
+                self.get_neg_risk(order_args.token_id)
+            self.get_fee_rate_bps(order_args.token_id)
+            return order_args
+
+        def post_order(self, order, order_type):
+            counts["post"] += 1
+            return {"success": True, "orderID": f"0x{counts['post']:x}", "status": "matched"}
+
+    class CountingRedis:
+        def get(self, key):
+            counts["redis"] += 1
+            return None
+
+        def set(self, key, value, ex=None):
+            counts["redis"] += 1
+
+    def count_gamma(market_id):
+        counts["gamma"] += 1
+        return {"data": {}}
+
+    market_id = "fake-clob-cache"
+    meta = {"conditionId": "0xc0", "clobTokenIds": ["111", "222"], "tick_size": "0.01", "neg_risk": False,
+            "min_order_size": 5, "closed": False, "end_ts": None}
+
+    original = polymarket_private.ClobClient, polymarket_private.r
+    polymarket_private.ClobClient = CountingClobClient
+    polymarket_private.r = CountingRedis()
+    try:
+        # no L2 creds passed: the first client derives them
+        client = PolymarketPrivate(wallet_address=WALLET_ADDRESS, private_key=PRIVATE_KEY)
+        client.cancel_order("0x1")
+        client._get_clob_client(signature_type=2, funder=PROXY_ADDRESS)
+        warm = dict(counts)
+
+        for i in range(100):
+            client.cancel_order(f"0x{i}")
+            client._get_clob_client()
+            client._get_clob_client(signature_type=2, funder=PROXY_ADDRESS)
+        reuse = dict(counts)
+
+        # order placement: place_order_v2 needs L2 creds passed in
+        trader = PolymarketPrivate(API_KEY, SECRET_KEY, WALLET_ADDRESS, PASSPHRASE, PRIVATE_KEY, PROXY_ADDRESS)
+        trader.get_market_info = count_gamma
+        trader._cache_market_meta(market_id, meta)
+        for place in (trader.place_order, trader.place_order_v2):
+            for token_index in (0, 1):
+                assert place(market_id, "BUY", "10", "0.48", token_index=token_index).get("data"), place.__name__
+        placed = dict(counts)
+
+        for i in range(orders):
+            for place in (trader.place_order, trader.place_order_v2):
+                assert place(market_id, "BUY" if i % 2 else "SELL", "10", "0.48", token_index=i % 2).get("data")
+    finally:
+        polymarket_private.ClobClient, polymarket_private.r = original
+
+    print(f"warm-up: {warm}")
+    print(f"after 100 rounds: {reuse}")
+    assert warm["clients"] == 2 and warm["derive"] == 1, warm
+    assert reuse["clients"] == warm["clients"] and reuse["derive"] == warm["derive"], reuse
+    assert reuse["cancel"] == 101, reuse
+    print("ClobClient reuse OK: no client builds or creds derivation after warm-up")
+
+    print(f"orders warm-up: {placed}")
+    print(f"after {orders} place_order + {orders} place_order_v2: {counts}")
+    grew = {k: counts[k] - placed[k] for k in counts if counts[k] != placed[k]}
+    assert grew == {"create": 2 * orders, "post": 2 * orders}, grew
+    assert counts["gamma"] == 0, counts
+    print(f"order placement OK: {2 * orders} orders -> {grew['post']} post_order, "
+          f"no client builds, creds derivation, metadata fetches, Gamma or Redis calls")
+
+
 def main():
     client = PolymarketPrivate(API_KEY, SECRET_KEY, WALLET_ADDRESS, PASSPHRASE, PRIVATE_KEY, PROXY_ADDRESS)
     client_proxy = PolymarketPrivate(API_KEY, SECRET_KEY, PROXY_ADDRESS, PASSPHRASE, PRIVATE_KEY)
@@ -376,4 +503,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if "--clob-cache" in sys.argv:
+        check_clob_client_reuse()
+    else:
+        main()
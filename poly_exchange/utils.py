@@ -1,9 +1,31 @@
 import json
 import requests
 import time
+import threading
 from hashlib import sha256
 import hmac
 import base64
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# HTTP session settings (see configure_session)
+# Pool size per host; hosts not listed use DEFAULT_POOL_SIZE
+HOST_POOL_SIZES = {
+    'https://clob.polymarket.com': 32,
+    'https://gamma-api.polymarket.com': 16,
+    'https://data-api.polymarket.com': 8,
+}
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.1
+RETRY_STATUS = (429, 500, 502, 503, 504)
+# POST/PUT are not retried: a retried order POST could be placed twice
+RETRY_METHODS = ('GET', 'HEAD', 'OPTIONS', 'DELETE')
+
+_session = None
+_session_lock = threading.Lock()
 
 def parse_headers(api_key='', secret_key='', wallet_address='', passphrase=''):
     """
@@ -60,26 +82,106 @@ def get_signature(secret_key, timestamp):
     signature = hmac.new(secret_bytes, message, digestmod=sha256).hexdigest()
     return signature
 
-def send_request(method, url, params_or_data=None, headers=None, timeout=30):
+def _build_session(host_pool_sizes, default_pool_size, retries, backoff):
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=RETRY_METHODS,
+        raise_on_status=False
+    )
+
+    session = requests.Session()
+    default_adapter = HTTPAdapter(pool_connections=default_pool_size, pool_maxsize=default_pool_size, max_retries=retry)
+    session.mount('https://', default_adapter)
+    session.mount('http://', default_adapter)
+
+    for host, pool_size in host_pool_sizes.items():
+        session.mount(host, HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry))
+    return session
+
+
+def configure_session(host_pool_sizes=None, default_pool_size=None, retries=None, backoff=None, timeout=None):
     """
-    Sends an HTTP request to the Polymarket API.
+    Rebuilds the shared HTTP session used by send_request.
+    
+    Args:
+        host_pool_sizes (dict): Pool size per host (e.g. {'https://clob.polymarket.com': 32})
+        default_pool_size (int): Pool size for hosts not listed in host_pool_sizes
+        retries (int): Retries for 429/5xx responses and connection errors (idempotent methods only)
+        backoff (float): Exponential backoff factor in seconds
+        timeout (float or tuple): Default timeout, seconds or (connect, read)
+        
+    Returns:
+        requests.Session: The new shared session
+    """
+    global _session, HOST_POOL_SIZES, DEFAULT_POOL_SIZE, RETRY_TOTAL, RETRY_BACKOFF, DEFAULT_TIMEOUT
+
+    with _session_lock:
+        if host_pool_sizes is not None:
+            HOST_POOL_SIZES = dict(host_pool_sizes)
+        if default_pool_size is not None:
+            DEFAULT_POOL_SIZE = default_pool_size
+        if retries is not None:
+            RETRY_TOTAL = retries
+        if backoff is not None:
+            RETRY_BACKOFF = backoff
+        if timeout is not None:
+            DEFAULT_TIMEOUT = timeout
+
+        old_session = _session
+        _session = _build_session(HOST_POOL_SIZES, DEFAULT_POOL_SIZE, RETRY_TOTAL, RETRY_BACKOFF)
+
+    if old_session is not None:
+        old_session.close()
+    return _session
+
+
+def get_session():
+    """
+    Returns the shared keep-alive HTTP session, creating it on first use.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session(HOST_POOL_SIZES, DEFAULT_POOL_SIZE, RETRY_TOTAL, RETRY_BACKOFF)
+    return _session
+
+
+def send_request(method, url, params_or_data=None, headers=None, timeout=None, serialized_body=None):
+    """
+    Sends an HTTP request to the Polymarket API over the shared pooled session.
     
     Args:
         method (str): HTTP method (GET, POST, DELETE, etc.)
         url (str): Full URL for the request
         params_or_data (dict): Query parameters for GET or body for POST/DELETE
         headers (dict): HTTP headers for the request
-        timeout (int): Request timeout in seconds
+        timeout (float or tuple): Request timeout in seconds or (connect, read). Default: DEFAULT_TIMEOUT
+        serialized_body (str): Pre-serialized body to send as-is (e.g. the exact bytes that were signed)
         
     Returns:
         str: Response text from the API (JSON or error JSON)
     """
     if headers is None:
         headers = {}
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUT
+
+    session = get_session()
     
     try:
-        if method.upper() == 'GET':
-            response = requests.request(
+        if serialized_body is not None and method.upper() != 'GET':
+            response = session.request(
+                method,
+                url,
+                data=serialized_body,
+                headers=headers,
+                timeout=timeout
+            )
+        elif method.upper() == 'GET':
+            response = session.request(
                 method,
                 url,
                 params=params_or_data,
@@ -87,7 +189,7 @@ def send_request(method, url, params_or_data=None, headers=None, timeout=30):
                 timeout=timeout
             )
         elif method.upper() in ['POST', 'PUT']:
-            response = requests.request(
+            response = session.request(
                 method,
                 url,
                 json=params_or_data,
@@ -95,7 +197,7 @@ def send_request(method, url, params_or_data=None, headers=None, timeout=30):
                 timeout=timeout
             )
         elif method.upper() == 'DELETE':
-            response = requests.request(
+            response = session.request(
                 method,
                 url,
                 json=params_or_data if params_or_data else {},
@@ -103,7 +205,7 @@ def send_request(method, url, params_or_data=None, headers=None, timeout=30):
                 timeout=timeout
             )
         else:
-            response = requests.request(
+            response = session.request(
                 method,
                 url,
                 params=params_or_data,
@@ -119,3 +221,99 @@ def send_request(method, url, params_or_data=None, headers=None, timeout=30):
         return json.dumps({'error': str(e)})
     except Exception as e:
         return json.dumps({'error': str(e)})
+
+
+
+async def async_send_request(client, method, url, params_or_data=None, headers=None, timeout=None, serialized_body=None):
+    """
+    Async counterpart of send_request, sent through an httpx.AsyncClient.
+    
+    Args:
+        client (httpx.AsyncClient): Shared async client (keeps its own connection pool)
+        method (str): HTTP method (GET, POST, DELETE, etc.)
+        url (str): Full URL for the request
+        params_or_data (dict): Query parameters for GET or body for POST/DELETE
+        headers (dict): HTTP headers for the request
+        timeout (float or tuple): Request timeout in seconds or (connect, read). Default: DEFAULT_TIMEOUT
+        serialized_body (str): Pre-serialized body to send as-is
+        
+    Returns:
+        str: Response text from the API (JSON or error JSON)
+    """
+    import httpx
+
+    if headers is None:
+        headers = {}
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUT
+    if isinstance(timeout, tuple):
+        timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+
+    try:
+        if serialized_body is not None and method.upper() != 'GET':
+            response = await client.request(method, url, content=serialized_body, headers=headers, timeout=timeout)
+        elif method.upper() in ['POST', 'PUT']:
+            response = await client.request(method, url, json=params_or_data, headers=headers, timeout=timeout)
+        elif method.upper() == 'DELETE':
+            response = await client.request(method, url, json=params_or_data if params_or_data else {}, headers=headers, timeout=timeout)
+        else:
+            response = await client.request(method, url, params=params_or_data, headers=headers, timeout=timeout)
+
+        if response.status_code >= 400:
+            return json.dumps({'error': f'HTTP {response.status_code}: {response.text}'})
+
+        return response.text
+    except Exception as e:
+        return json.dumps({'error': str(e)})
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache with an optional TTL (default or per entry).
+    """
+    def __init__(self, maxsize=1024, ttl=None):
+        """
+        Args:
+            maxsize (int): Max number of entries before the least recently used is evicted
+            ttl (float): Default time-to-live in seconds (None = no expiry)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at is not None and time.time() >= expires_at:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+        return item[0] if item is not None else default
+
+    def keys(self):
+        with self._lock:
+            return list(self._data.keys())
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
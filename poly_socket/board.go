@@ -0,0 +1,184 @@
+package main
+
+import (
+	"bytes"
+	"encoding/binary"
+	"errors"
+	"fmt"
+	"os"
+	"runtime"
+	"sync/atomic"
+	"syscall"
+	"unsafe"
+)
+
+/* ============================
+   TICKER BOARD
+============================ */
+
+// The ticker board is an optional shared-memory copy of the active tickers
+// for consumers on the same host (ticker_board.py): a file of fixed slots,
+// one per Redis key, each guarded by a seqlock. Readers never block the
+// feeder; Redis stays the source for everything else.
+//
+// Layout (little-endian):
+//
+//	header  64 bytes   magic "PTBOARD1", version, slots, slot size, header size (u32)
+//	slot   192 bytes   seq u64 | key [40] | ts_wr_us i64 | ticker (ticker_codec.go, 134) | pad
+//
+// seq is odd while a writer is inside the slot. Writers take the slot by
+// CAS even -> odd (so any number of writers, in any process, can share a
+// board) and release it with the next even value; readers copy the slot
+// and retry unless seq was the same even value before and after.
+const (
+	// TICKER_BOARD_PATH enables the board ("" disables); /dev/shm keeps it in RAM
+	TICKER_BOARD_PATH = ""
+	BOARD_SLOTS       = 64
+
+	BOARD_MAGIC       = "PTBOARD1"
+	BOARD_VERSION     = 2
+	BOARD_HEADER_SIZE = 64
+	BOARD_SLOT_SIZE   = 192
+	BOARD_KEY_LEN     = 40
+
+	boardKeyOff     = 8
+	boardPayloadOff = boardKeyOff + BOARD_KEY_LEN
+)
+
+type tickerBoard struct {
+	file  *os.File
+	data  []byte
+	slots int
+	// key -> slot, cached per process
+	index map[string]int
+}
+
+// openTickerBoard maps the board at path, creating (or re-initializing, on a
+// layout mismatch) it as needed. An existing board keeps its slots, so a
+// restarted feeder writes to the same slots its readers already resolved.
+func openTickerBoard(path string, slots int) (*tickerBoard, error) {
+	size := BOARD_HEADER_SIZE + slots*BOARD_SLOT_SIZE
+
+	f, err := os.OpenFile(path, os.O_RDWR|os.O_CREATE, 0o644)
+	if err != nil {
+		return nil, err
+	}
+	st, err := f.Stat()
+	if err != nil {
+		f.Close()
+		return nil, err
+	}
+
+	header := make([]byte, BOARD_HEADER_SIZE)
+	copy(header, BOARD_MAGIC)
+	binary.LittleEndian.PutUint32(header[8:], BOARD_VERSION)
+	binary.LittleEndian.PutUint32(header[12:], uint32(slots))
+	binary.LittleEndian.PutUint32(header[16:], BOARD_SLOT_SIZE)
+	binary.LittleEndian.PutUint32(header[20:], BOARD_HEADER_SIZE)
+
+	existing := make([]byte, BOARD_HEADER_SIZE)
+	if st.Size() == int64(size) {
+		f.ReadAt(existing, 0)
+	}
+	if !bytes.Equal(existing, header) {
+		if err := f.Truncate(0); err == nil {
+			err = f.Truncate(int64(size))
+		}
+		if err != nil {
+			f.Close()
+			return nil, err
+		}
+		if _, err := f.WriteAt(header, 0); err != nil {
+			f.Close()
+			return nil, err
+		}
+	}
+
+	data, err := syscall.Mmap(int(f.Fd()), 0, size, syscall.PROT_READ|syscall.PROT_WRITE, syscall.MAP_SHARED)
+	if err != nil {
+		f.Close()
+		return nil, fmt.Errorf("mmap %s: %w", path, err)
+	}
+	return &tickerBoard{file: f, data: data, slots: slots, index: make(map[string]int)}, nil
+}
+
+func (b *tickerBoard) Close() error {
+	if b == nil {
+		return nil
+	}
+	err := syscall.Munmap(b.data)
+	b.file.Close()
+	return err
+}
+
+func (b *tickerBoard) seq(i int) *uint64 {
+	return (*uint64)(unsafe.Pointer(&b.data[BOARD_HEADER_SIZE+i*BOARD_SLOT_SIZE]))
+}
+
+// lock spins until this writer owns slot i and returns the odd seq it set.
+func (b *tickerBoard) lock(i int) uint64 {
+	seq := b.seq(i)
+	for {
+		s := atomic.LoadUint64(seq)
+		if s&1 == 0 && atomic.CompareAndSwapUint64(seq, s, s+1) {
+			return s + 1
+		}
+		runtime.Gosched()
+	}
+}
+
+// store copies src into slot i at off with 8-byte atomic stores, so no
+// store can become visible outside the seq odd/even window.
+func (b *tickerBoard) store(i, off int, src []byte) {
+	base := BOARD_HEADER_SIZE + i*BOARD_SLOT_SIZE + off
+	for w := 0; w+8 <= len(src); w += 8 {
+		atomic.StoreUint64((*uint64)(unsafe.Pointer(&b.data[base+w])), binary.LittleEndian.Uint64(src[w:]))
+	}
+}
+
+var errBoardFull = errors.New("ticker board full")
+
+// slot returns the slot of key, claiming the first free one on first use.
+// Callers hold p.mu (write).
+func (b *tickerBoard) slot(key string) (int, error) {
+	if i, ok := b.index[key]; ok {
+		return i, nil
+	}
+	if len(key) > BOARD_KEY_LEN {
+		return -1, fmt.Errorf("board key too long: %s", key)
+	}
+	var want [BOARD_KEY_LEN]byte
+	copy(want[:], key)
+
+	for i := 0; i < b.slots; i++ {
+		s := b.lock(i)
+		base := BOARD_HEADER_SIZE + i*BOARD_SLOT_SIZE + boardKeyOff
+		have := b.data[base : base+BOARD_KEY_LEN]
+		free := have[0] == 0
+		if free {
+			b.store(i, boardKeyOff, want[:])
+		}
+		mine := free || bytes.Equal(have, want[:])
+		atomic.StoreUint64(b.seq(i), s+1)
+
+		if mine {
+			b.index[key] = i
+			return i, nil
+		}
+	}
+	return -1, errBoardFull
+}
+
+// write publishes one ticker to its slot (-1: not on the board).
+func (b *tickerBoard) write(slot int, t *Ticker, info *tokenInfo) {
+	if b == nil || slot < 0 {
+		return
+	}
+	var payload [BOARD_SLOT_SIZE - boardPayloadOff]byte
+	binary.LittleEndian.PutUint64(payload[:8], uint64(t.TsWrUs))
+	encodeTicker(payload[8:], t.BestBid, t.BidSz, t.BestAsk, t.AskSz, t.Ts, t.TsSv, info.slotTs, info.tid)
+
+	s := b.lock(slot)
+	b.store(slot, boardPayloadOff, payload[:])
+	atomic.StoreUint64(b.seq(slot), s+1)
+}
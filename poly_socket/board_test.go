@@ -0,0 +1,111 @@
+package main
+
+import (
+	"bytes"
+	"encoding/binary"
+	"fmt"
+	"os"
+	"path/filepath"
+	"strconv"
+	"testing"
+	"time"
+)
+
+// go test -run '^$' -bench BoardWrite -benchmem
+
+func BenchmarkBoardWrite(b *testing.B) {
+	board, err := openTickerBoard(filepath.Join(b.TempDir(), "bench.board"), BOARD_SLOTS)
+	if err != nil {
+		b.Fatal(err)
+	}
+	defer board.Close()
+	slot, err := board.slot("BTC_up_15m_polymarket_ticker")
+	if err != nil {
+		b.Fatal(err)
+	}
+	t := &Ticker{BestBid: 0.45, BidSz: 120.5, BestAsk: 0.47, AskSz: 88, Ts: 1766378123456, TsSv: 1766378123460}
+	info := &tokenInfo{tid: benchTokenID, slotTs: 1766377800}
+	b.ReportAllocs()
+	b.ResetTimer()
+	for i := 0; i < b.N; i++ {
+		t.TsWrUs = int64(i)
+		board.write(slot, t, info)
+	}
+}
+
+// TestBoardHarnessWriter is a writer process for check_ticker_board.py --go:
+// it writes self-consistent records (every field derived from one counter)
+// to the harness board until BOARD_HARNESS_SECONDS have passed.
+func TestBoardHarnessWriter(t *testing.T) {
+	path := os.Getenv("BOARD_HARNESS_PATH")
+	if path == "" {
+		t.Skip("run by check_ticker_board.py --go")
+	}
+	id, _ := strconv.ParseInt(os.Getenv("BOARD_HARNESS_ID"), 10, 64)
+	slots, _ := strconv.Atoi(os.Getenv("BOARD_HARNESS_SLOTS"))
+	seconds, _ := strconv.ParseFloat(os.Getenv("BOARD_HARNESS_SECONDS"), 64)
+
+	// the harness created the board; the layout must match
+	board, err := openTickerBoard(path, BOARD_SLOTS)
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer board.Close()
+
+	var ids []int
+	for i := 0; i < slots; i++ {
+		slot, err := board.slot(fmt.Sprintf("H%d_up_15m_polymarket_ticker", i))
+		if err != nil {
+			t.Fatal(err)
+		}
+		ids = append(ids, slot)
+	}
+
+	n := id*1_000_000_000 + 1
+	end := time.Now().Add(time.Duration(seconds * float64(time.Second)))
+	for time.Now().Before(end) {
+		for _, slot := range ids {
+			tk := &Ticker{
+				BestBid: float64(n), BidSz: float64(n + 1), BestAsk: float64(n + 2), AskSz: float64(n + 3),
+				Ts: n, TsSv: n, TsWrUs: n,
+			}
+			board.write(slot, tk, &tokenInfo{tid: strconv.FormatInt(n, 10), slotTs: n})
+			n++
+		}
+	}
+}
+
+// TestBoardWriteSlotTs checks that a board record carries its market's slot,
+// so a reader can tell a new UP from an old DOWN mid-rollover.
+func TestBoardWriteSlotTs(t *testing.T) {
+	board, err := openTickerBoard(filepath.Join(t.TempDir(), "slot.board"), BOARD_SLOTS)
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer board.Close()
+
+	info := newTokenInfo(&Market{
+		Slug:            "btc-updown-15m-1766377800",
+		TokenOutcomeMap: map[string]string{benchTokenID: "Up"},
+	}, benchTokenID)
+	if info.slotTs != 1766377800 {
+		t.Fatalf("slotTs = %d, want 1766377800", info.slotTs)
+	}
+	slot, err := board.slot(info.key)
+	if err != nil {
+		t.Fatal(err)
+	}
+	board.write(slot, &Ticker{BestBid: 0.45, Ts: 1766378123456, TsSv: 1766378123460}, info)
+
+	base := BOARD_HEADER_SIZE + slot*BOARD_SLOT_SIZE + boardPayloadOff + 8
+	if got := int64(binary.LittleEndian.Uint64(board.data[base+48:])); got != info.slotTs {
+		t.Errorf("board slot_ts = %d, want %d", got, info.slotTs)
+	}
+	tid := string(bytes.TrimRight(board.data[base+56:base+TICKER_BIN_SIZE], "\x00"))
+	if tid != benchTokenID {
+		t.Errorf("board token_id = %q", tid)
+	}
+	if got := slugSlotTs("not-a-slot-market"); got != 0 {
+		t.Errorf("slugSlotTs(non-slot slug) = %d, want 0", got)
+	}
+}
@@ -1,50 +1,91 @@
 package main
 
 import (
-	"fmt"
 	"log"
 	"time"
 )
 
-func runOnce() {
-	// Redis
-	redisClient := NewRedis()
-	defer redisClient.Close()
-
-	// Time slot (UTC, 15m aligned)
-	now := time.Now().UTC()
-	currentSlot := now.Truncate(15 * time.Minute)
+const (
+	SLOT = 15 * time.Minute
+	// resolve and pre-subscribe the next slot this long before the boundary
+	PRESUBSCRIBE_LEAD = 2 * time.Minute
+	// retry interval while the next slot's markets are not listed yet
+	RESOLVE_RETRY = 5 * time.Second
+)
 
-	// Assets
-	assets := []string{"xrp", "eth", "btc", "sol"}
+// runRollover keeps the WS connections alive across slots: ahead of every
+// boundary it resolves the next slot's markets and subscribes them on the
+// live connection, then swaps the active tokens exactly at the boundary.
+func runRollover(ws *PolymarketWS, assets []string, slot time.Time) {
+	for {
+		boundary := slot.Add(SLOT)
 
-	// Fetch initial markets
-	markets, slot := fetch15mMarkets(assets, currentSlot, false)
-	if len(markets) == 0 {
-		log.Println("No markets found for slot", slot)
-		return
-	}
+		// pre-subscribe window
+		sleepUntil(boundary.Add(-PRESUBSCRIBE_LEAD))
+		var next []*Market
+		for time.Now().Before(boundary) {
+			next, _ = fetch15mMarkets(assets, slot, true)
+			if len(next) == len(assets) {
+				break
+			}
+			time.Sleep(RESOLVE_RETRY)
+		}
+		if len(next) > 0 {
+			ws.addPending(next)
+		}
 
-	// Init WS client
-	ws := NewWS(assets, slot, redisClient)
+		sleepUntil(boundary)
 
-	// Start WS (blocking or non-blocking depending on your impl)
-	ws.Start(markets)
+		if len(next) < len(assets) {
+			// late listing: resolve what is still missing now, on the boundary slot
+			if late, _ := fetch15mMarkets(assets, boundary, false); len(late) > 0 {
+				ws.addPending(late)
+			}
+		}
+		ws.SwapToPending(boundary)
+		slot = boundary
+	}
 }
 
-func waitUntilNext15m() {
-	now := time.Now().UTC()
-	next := now.Add(5 * time.Minute).Truncate(5 * time.Minute).Add(10 * time.Second)
-	d := time.Until(next)
-	if d > 0 {
+func sleepUntil(t time.Time) {
+	if d := time.Until(t); d > 0 {
 		time.Sleep(d)
 	}
-	fmt.Println("Woke up at:", time.Now().UTC())
 }
 
 func main() {
+	// Redis: one client for the process lifetime
+	redisClient := NewRedis()
+	defer redisClient.Close()
+
+	// Assets
+	assets := []string{"xrp", "eth", "btc", "sol"}
+
+	// Time slot (UTC, 15m aligned); wait for the current markets once at startup
+	var markets []*Market
+	var slot time.Time
 	for {
-		go runOnce()
-		waitUntilNext15m()
+		slot = time.Now().UTC().Truncate(SLOT)
+		markets, slot = fetch15mMarkets(assets, slot, false)
+		if len(markets) > 0 {
+			break
+		}
+		log.Println("No markets found for slot", slot)
+		time.Sleep(RESOLVE_RETRY)
+	}
+
+	ws := NewWS(assets, slot, redisClient)
+	if TICKER_BOARD_PATH != "" {
+		board, err := openTickerBoard(TICKER_BOARD_PATH, BOARD_SLOTS)
+		if err != nil {
+			log.Println("[BOARD] disabled:", err)
+		} else {
+			defer board.Close()
+			ws.board = board
+		}
 	}
+	go runRollover(ws, assets, slot)
+
+	// sharded connections (shard.go), each reconnecting in place; blocks
+	ws.Start(markets)
 }
@@ -0,0 +1,162 @@
+package main
+
+import (
+	"bytes"
+	"encoding/json"
+	"math"
+	"strconv"
+)
+
+/* ============================
+   WS MESSAGES
+============================ */
+
+// BOOK_FULL_DEPTH decodes every level of book snapshots with encoding/json;
+// off, only the best bid/ask are scanned out of the raw level arrays.
+const BOOK_FULL_DEPTH = false
+
+// marketMsg is one market channel event. Events other than book and
+// price_change (last_trade_price, tick_size_change) decode to their
+// EventType only.
+type marketMsg struct {
+	EventType    string        `json:"event_type"`
+	AssetID      string        `json:"asset_id"`
+	Timestamp    jsonNum       `json:"timestamp"`
+	Bids         bookSide      `json:"bids"`
+	Asks         bookSide      `json:"asks"`
+	PriceChanges []priceChange `json:"price_changes"`
+}
+
+// priceChange is one entry of a price_change event. The best_* / *_size
+// fields are optional: a missing one keeps the previous ticker value.
+type priceChange struct {
+	AssetID string  `json:"asset_id"`
+	Price   jsonNum `json:"price"`
+	Size    jsonNum `json:"size"`
+	Side    string  `json:"side"`
+	BestBid jsonNum `json:"best_bid"`
+	BestAsk jsonNum `json:"best_ask"`
+	BidSize jsonNum `json:"bid_size"`
+	AskSize jsonNum `json:"ask_size"`
+}
+
+type bookLevel struct {
+	Price jsonNum `json:"price"`
+	Size  jsonNum `json:"size"`
+}
+
+// jsonNum is a number the exchange sends either as a JSON number or as a
+// numeric string. ok records presence, so a present 0 differs from missing.
+type jsonNum struct {
+	v  float64
+	ok bool
+}
+
+func (n *jsonNum) UnmarshalJSON(b []byte) error {
+	if string(b) == "null" {
+		return nil
+	}
+	n.v, n.ok = parseNum(b), true
+	return nil
+}
+
+// or returns the value if present, else prev.
+func (n jsonNum) or(prev float64) float64 {
+	if n.ok {
+		return n.v
+	}
+	return prev
+}
+
+// parseNum parses a JSON number or numeric string, 0 if it is neither.
+func parseNum(b []byte) float64 {
+	if len(b) >= 2 && b[0] == '"' {
+		b = b[1 : len(b)-1]
+	}
+	f, err := strconv.ParseFloat(string(b), 64)
+	if err != nil {
+		return 0
+	}
+	return f
+}
+
+// bookSide is a bids/asks array decoded lazily: the raw array is only
+// scanned for its highest and lowest priced levels (best bid / best ask),
+// without allocating. With BOOK_FULL_DEPTH every level is decoded.
+type bookSide struct {
+	hiPrice, hiSize float64
+	loPrice, loSize float64
+	levels          []bookLevel
+}
+
+func (s *bookSide) UnmarshalJSON(b []byte) error {
+	*s = bookSide{loPrice: math.MaxFloat64}
+	if BOOK_FULL_DEPTH {
+		if err := json.Unmarshal(b, &s.levels); err != nil {
+			return err
+		}
+		for _, l := range s.levels {
+			s.add(l.Price.v, l.Size.v)
+		}
+		return nil
+	}
+
+	// levels are flat objects: {"price":"0.48","size":"30"}
+	for {
+		i := bytes.IndexByte(b, '{')
+		if i < 0 {
+			return nil
+		}
+		j := bytes.IndexByte(b[i:], '}')
+		if j < 0 {
+			return nil
+		}
+		obj := b[i+1 : i+j]
+		s.add(levelField(obj, `"price"`), levelField(obj, `"size"`))
+		b = b[i+j+1:]
+	}
+}
+
+// add keeps the extreme levels; empty levels (price or size 0) are skipped.
+func (s *bookSide) add(price, size float64) {
+	if price <= 0 || size <= 0 {
+		return
+	}
+	if price > s.hiPrice {
+		s.hiPrice, s.hiSize = price, size
+	}
+	if price < s.loPrice {
+		s.loPrice, s.loSize = price, size
+	}
+}
+
+// best returns the best bid (highest) or best ask (lowest) level, 0, 0 if empty.
+func (s *bookSide) best(bid bool) (float64, float64) {
+	if bid {
+		return s.hiPrice, s.hiSize
+	}
+	if s.loPrice == math.MaxFloat64 {
+		return 0, 0
+	}
+	return s.loPrice, s.loSize
+}
+
+// levelField returns the value of key in one flat level object, 0 if missing.
+func levelField(obj []byte, key string) float64 {
+	i := bytes.Index(obj, []byte(key))
+	if i < 0 {
+		return 0
+	}
+	v := bytes.TrimLeft(obj[i+len(key):], " \t\r\n:")
+	if len(v) > 0 && v[0] == '"' {
+		end := bytes.IndexByte(v[1:], '"')
+		if end < 0 {
+			return 0
+		}
+		return parseNum(v[1 : end+1])
+	}
+	if end := bytes.IndexAny(v, ", \t\r\n"); end >= 0 {
+		v = v[:end]
+	}
+	return parseNum(v)
+}
@@ -0,0 +1,368 @@
+package main
+
+import (
+	"bufio"
+	"encoding/json"
+	"fmt"
+	"io"
+	"log"
+	"os"
+	"strconv"
+	"testing"
+	"time"
+)
+
+// go test -run '^$' -bench 'Decode|HandleMsg' -benchmem
+//
+// testdata/market_frames.jsonl is a market channel session for 4 markets
+// (8 tokens): the initial book snapshot array, then price_change (most),
+// book and last_trade_price frames. One op is one frame.
+
+func loadFrames(tb testing.TB) [][]byte {
+	f, err := os.Open("testdata/market_frames.jsonl")
+	if err != nil {
+		tb.Fatal(err)
+	}
+	defer f.Close()
+
+	var frames [][]byte
+	sc := bufio.NewScanner(f)
+	sc.Buffer(make([]byte, 1<<20), 1<<20)
+	for sc.Scan() {
+		frames = append(frames, append([]byte(nil), sc.Bytes()...))
+	}
+	return frames
+}
+
+// BenchmarkDecodeMap is the previous decoding: map[string]any per frame.
+func BenchmarkDecodeMap(b *testing.B) {
+	frames := loadFrames(b)
+	b.ReportAllocs()
+	b.ResetTimer()
+	for i := 0; i < b.N; i++ {
+		msg := frames[i%len(frames)]
+		if msg[0] == '[' {
+			var arr []map[string]any
+			json.Unmarshal(msg, &arr)
+			continue
+		}
+		var d map[string]any
+		json.Unmarshal(msg, &d)
+	}
+}
+
+func BenchmarkDecodeTyped(b *testing.B) {
+	frames := loadFrames(b)
+	var m marketMsg
+	var arr []marketMsg
+	b.ReportAllocs()
+	b.ResetTimer()
+	for i := 0; i < b.N; i++ {
+		msg := frames[i%len(frames)]
+		if msg[0] == '[' {
+			arr = reset(arr)
+			json.Unmarshal(msg, &arr)
+			continue
+		}
+		m = marketMsg{PriceChanges: reset(m.PriceChanges)}
+		json.Unmarshal(msg, &m)
+	}
+}
+
+// snapshotTokens returns the token ids of the initial snapshot frame.
+func snapshotTokens(tb testing.TB, frame []byte) []string {
+	var snapshot []marketMsg
+	if err := json.Unmarshal(frame, &snapshot); err != nil {
+		tb.Fatal(err)
+	}
+	var tids []string
+	for _, m := range snapshot {
+		tids = append(tids, m.AssetID)
+	}
+	return tids
+}
+
+// frameShard returns a one-shard feed tracking tids (paired into UP/DOWN
+// markets) whose writer discards every write.
+func frameShard(tb testing.TB, tids []string) *wsShard {
+	var markets []*Market
+	for i := 0; i+1 < len(tids); i += 2 {
+		up, down := tids[i], tids[i+1]
+		markets = append(markets, &Market{
+			Slug:            fmt.Sprintf("m%d-updown-15m-1766377800", i/2),
+			TokenIDs:        []string{up, down},
+			Outcomes:        []string{"Up", "Down"},
+			TokenOutcomeMap: map[string]string{up: "Up", down: "Down"},
+		})
+	}
+
+	log.SetOutput(io.Discard)
+	tb.Cleanup(func() { log.SetOutput(os.Stderr) })
+	p := NewWS([]string{}, time.Now(), nil)
+	p.writer = newRedisWriter(func([]writeBatch) {})
+	go p.writer.run()
+	p.updateMarkets(markets)
+	p.shards = []*wsShard{{p: p, tickers: make(map[string]*Ticker)}}
+	return p.shards[0]
+}
+
+// BenchmarkHandleMsg is the whole shard path: decode, ticker update and
+// encoding the writes (the writer itself discards them).
+func BenchmarkHandleMsg(b *testing.B) {
+	frames := loadFrames(b)
+	s := frameShard(b, snapshotTokens(b, frames[0]))
+
+	b.ReportAllocs()
+	b.ResetTimer()
+	for i := 0; i < b.N; i++ {
+		s.handleMsg(frames[i%len(frames)])
+	}
+}
+
+// top is the part of a ticker both decoders must agree on.
+type top struct {
+	bestBid, bidSz, bestAsk, askSz float64
+	ts                             int64
+}
+
+// mapDecode applies one frame to tops the way the feeder did before the
+// typed decoder: map[string]any per frame, every book level parsed.
+func mapDecode(msg []byte, tops map[string]top) error {
+	var events []map[string]any
+	if msg[0] == '[' {
+		if err := json.Unmarshal(msg, &events); err != nil {
+			return err
+		}
+	} else {
+		var d map[string]any
+		if err := json.Unmarshal(msg, &d); err != nil {
+			return err
+		}
+		events = append(events, d)
+	}
+
+	for _, d := range events {
+		ts := int64(mapNum(d["timestamp"]))
+		switch d["event_type"] {
+		case "book":
+			tid, _ := d["asset_id"].(string)
+			t := top{ts: ts}
+			t.bestBid, t.bidSz = mapBest(d["bids"], true)
+			t.bestAsk, t.askSz = mapBest(d["asks"], false)
+			tops[tid] = t
+
+		case "price_change":
+			changes, _ := d["price_changes"].([]any)
+			for _, v := range changes {
+				pc, _ := v.(map[string]any)
+				tid, _ := pc["asset_id"].(string)
+				prev := tops[tid]
+				t := top{
+					bestBid: mapOr(pc, "best_bid", prev.bestBid),
+					bidSz:   mapOr(pc, "bid_size", prev.bidSz),
+					bestAsk: mapOr(pc, "best_ask", prev.bestAsk),
+					askSz:   mapOr(pc, "ask_size", prev.askSz),
+					ts:      ts,
+				}
+				if pc["bid_size"] == nil && pc["side"] == "BUY" && mapNum(pc["price"]) == t.bestBid {
+					t.bidSz = mapNum(pc["size"])
+				}
+				if pc["ask_size"] == nil && pc["side"] == "SELL" && mapNum(pc["price"]) == t.bestAsk {
+					t.askSz = mapNum(pc["size"])
+				}
+				if t.bestBid == 0 {
+					t.bidSz = 0
+				}
+				if t.bestAsk == 0 {
+					t.askSz = 0
+				}
+				tops[tid] = t
+			}
+		}
+	}
+	return nil
+}
+
+func mapNum(v any) float64 {
+	switch x := v.(type) {
+	case float64:
+		return x
+	case string:
+		f, _ := strconv.ParseFloat(x, 64)
+		return f
+	}
+	return 0
+}
+
+func mapOr(obj map[string]any, field string, prev float64) float64 {
+	if v := obj[field]; v != nil {
+		return mapNum(v)
+	}
+	return prev
+}
+
+// mapBest returns the highest (bid) or lowest (ask) level with price and size > 0.
+func mapBest(raw any, bid bool) (float64, float64) {
+	levels, _ := raw.([]any)
+	var price, size float64
+	for _, v := range levels {
+		l, _ := v.(map[string]any)
+		p, sz := mapNum(l["price"]), mapNum(l["size"])
+		if p <= 0 || sz <= 0 {
+			continue
+		}
+		if price == 0 || (bid && p > price) || (!bid && p < price) {
+			price, size = p, sz
+		}
+	}
+	return price, size
+}
+
+// checkTops compares the shard's tickers of tids with the map decoder's.
+func checkTops(t *testing.T, where string, s *wsShard, tids []string, tops map[string]top) {
+	t.Helper()
+	for _, tid := range tids {
+		var got top
+		if tk := s.tickers[tid]; tk != nil {
+			got = top{tk.BestBid, tk.BidSz, tk.BestAsk, tk.AskSz, tk.Ts}
+		}
+		if want := tops[tid]; got != want {
+			t.Fatalf("%s token %.12s: typed %+v, map %+v", where, tid, got, want)
+		}
+	}
+}
+
+// TestDecodeMatchesMap replays the recorded session through the typed
+// decoder (the shard's handleMsg) and the map decoder it replaced, and
+// requires the same top of book for every token after every frame.
+func TestDecodeMatchesMap(t *testing.T) {
+	frames := loadFrames(t)
+	tids := snapshotTokens(t, frames[0])
+	s := frameShard(t, tids)
+	tops := make(map[string]top)
+
+	for i, frame := range frames {
+		if err := mapDecode(frame, tops); err != nil {
+			t.Fatalf("frame %d: %v", i, err)
+		}
+		s.handleMsg(frame)
+		checkTops(t, fmt.Sprintf("frame %d", i), s, tids, tops)
+	}
+}
+
+// TestDecodeEdgeCases runs frames the recorded session does not cover
+// through both decoders, with the expected top of book spelled out.
+func TestDecodeEdgeCases(t *testing.T) {
+	cases := []struct {
+		name  string
+		frame string
+		want  top
+	}{
+		{"unquoted numbers",
+			`{"event_type":"book","asset_id":"A","timestamp":1766377812000,"bids":[{"price":0.47,"size":30},{"price":0.48,"size":12.5}],"asks":[{"price":0.51,"size":7}]}`,
+			top{0.48, 12.5, 0.51, 7, 1766377812000}},
+		{"extra whitespace",
+			"{ \"event_type\" : \"book\" ,\n \"asset_id\" : \"A\", \"timestamp\" : \"1766377812001\",\n\t\"bids\" : [ { \"price\" : \"0.46\" , \"size\" : \"10\" } ,\n { \"size\" :\"5\", \"price\": 0.45 } ],\n \"asks\" : [ {\"price\":\"0.5\" ,\"size\": 9 } ] }",
+			top{0.46, 10, 0.5, 9, 1766377812001}},
+		{"empty levels skipped",
+			`{"event_type":"book","asset_id":"A","timestamp":"1766377812002","bids":[{"price":"0.49","size":"0"},{"price":"0.44","size":"3"}],"asks":[{"price":"0","size":"4"},{"price":"0.52","size":"2"}]}`,
+			top{0.44, 3, 0.52, 2, 1766377812002}},
+		{"missing fields keep previous",
+			`{"event_type":"price_change","timestamp":"1766377812003","price_changes":[{"asset_id":"A","price":"0.53","size":"8","side":"SELL"}]}`,
+			top{0.44, 3, 0.52, 2, 1766377812003}},
+		{"null is missing",
+			`{"event_type":"price_change","timestamp":"1766377812004","price_changes":[{"asset_id":"A","price":"0.44","size":"6","side":"BUY","best_bid":null,"best_ask":"0.52"}]}`,
+			top{0.44, 6, 0.52, 2, 1766377812004}},
+		{"present zero overrides",
+			`{"event_type":"price_change","timestamp":"1766377812005","price_changes":[{"asset_id":"A","price":"0.44","size":"0","side":"BUY","best_bid":"0","best_ask":"0.52","ask_size":"11"}]}`,
+			top{0, 0, 0.52, 11, 1766377812005}},
+		{"empty sides",
+			`{"event_type":"book","asset_id":"A","timestamp":"1766377812006","bids":[],"asks":[ ]}`,
+			top{0, 0, 0, 0, 1766377812006}},
+		{"other events ignored",
+			`{"event_type":"last_trade_price","asset_id":"A","timestamp":"1766377812007","price":"0.5","size":"1"}`,
+			top{0, 0, 0, 0, 1766377812006}},
+	}
+
+	tids := []string{"A", "B"}
+	s := frameShard(t, tids)
+	tops := make(map[string]top)
+	for _, c := range cases {
+		if err := mapDecode([]byte(c.frame), tops); err != nil {
+			t.Fatalf("%s: %v", c.name, err)
+		}
+		s.handleMsg([]byte(c.frame))
+		checkTops(t, c.name, s, tids, tops)
+		if got := tops["A"]; got != c.want {
+			t.Fatalf("%s: got %+v, want %+v", c.name, got, c.want)
+		}
+	}
+}
+
+func TestJSONNum(t *testing.T) {
+	var pc priceChange
+	if err := json.Unmarshal([]byte(`{"price":"0.48","size":12,"best_bid":0,"best_ask":null}`), &pc); err != nil {
+		t.Fatal(err)
+	}
+	if pc.Price != (jsonNum{0.48, true}) || pc.Size != (jsonNum{12, true}) {
+		t.Errorf("quoted / unquoted: price %+v size %+v", pc.Price, pc.Size)
+	}
+	// present 0 overrides the previous value, missing or null keeps it
+	if got := pc.BestBid.or(0.5); got != 0 {
+		t.Errorf("present 0: or(0.5) = %v, want 0", got)
+	}
+	if got := pc.BestAsk.or(0.5); got != 0.5 {
+		t.Errorf("null: or(0.5) = %v, want 0.5", got)
+	}
+	if got := pc.BidSize.or(7); got != 7 {
+		t.Errorf("missing: or(7) = %v, want 7", got)
+	}
+	if got := parseNum([]byte(`"x"`)); got != 0 {
+		t.Errorf("parseNum(non-number) = %v, want 0", got)
+	}
+}
+
+func TestLevelField(t *testing.T) {
+	cases := []struct {
+		obj, key string
+		want     float64
+	}{
+		{`"price":"0.48","size":"30"`, `"price"`, 0.48},
+		{`"price":"0.48","size":"30"`, `"size"`, 30},
+		{`"price" : 0.48 , "size":30`, `"price"`, 0.48},
+		{`"price" : 0.48 , "size":30`, `"size"`, 30},
+		{"\n \"size\":\t\"1.5\"", `"size"`, 1.5},
+		{`"size":"30"`, `"price"`, 0},
+		{`"price":"0.48`, `"price"`, 0},
+		{`"price":"abc"`, `"price"`, 0},
+	}
+	for _, c := range cases {
+		if got := levelField([]byte(c.obj), c.key); got != c.want {
+			t.Errorf("levelField(%q, %s) = %v, want %v", c.obj, c.key, got, c.want)
+		}
+	}
+}
+
+func TestBookSide(t *testing.T) {
+	var side bookSide
+	raw := `[{"price":"0.45","size":"3"}, {"price":0.47,"size":"0"}, {"price":"0.46","size":1}, {"price":"0.44","size":"2"}]`
+	if err := json.Unmarshal([]byte(raw), &side); err != nil {
+		t.Fatal(err)
+	}
+	if p, sz := side.best(true); p != 0.46 || sz != 1 {
+		t.Errorf("best bid = %v@%v, want 1@0.46", sz, p)
+	}
+	if p, sz := side.best(false); p != 0.44 || sz != 2 {
+		t.Errorf("best ask = %v@%v, want 2@0.44", sz, p)
+	}
+
+	if err := json.Unmarshal([]byte(`[]`), &side); err != nil {
+		t.Fatal(err)
+	}
+	if p, sz := side.best(true); p != 0 || sz != 0 {
+		t.Errorf("empty best bid = %v@%v", sz, p)
+	}
+	if p, sz := side.best(false); p != 0 || sz != 0 {
+		t.Errorf("empty best ask = %v@%v", sz, p)
+	}
+}
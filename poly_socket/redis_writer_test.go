@@ -0,0 +1,249 @@
+package main
+
+import (
+	"context"
+	"fmt"
+	"os"
+	"sync"
+	"testing"
+	"time"
+
+	"github.com/redis/go-redis/v9"
+)
+
+// REDIS_ADDR=localhost:6379 go test -run '^$' -bench RedisWrites -benchtime 100000x
+//
+// Messages/sec into a local Redis (DB 15, keys prefixed bench_) for one
+// ticker write per message over `keys` tickers:
+//   per-message  one pipelined SET+PUBLISH round trip per message (before)
+//   coalesced    redisWriter: WRITER_WINDOW micro-batches, latest per key,
+//                one MSET + PUBLISHes per flush (after)
+
+func benchRedis(b *testing.B) *redis.Client {
+	addr := os.Getenv("REDIS_ADDR")
+	if addr == "" {
+		addr = "localhost:6379"
+	}
+	r := redis.NewClient(&redis.Options{Addr: addr, DB: 15})
+	if err := r.Ping(context.Background()).Err(); err != nil {
+		b.Skip("no redis at", addr, err)
+	}
+	return r
+}
+
+func benchWrites(keys int) []tickerWrite {
+	writes := make([]tickerWrite, keys)
+	for i := range writes {
+		writes[i] = tickerWrite{
+			key:  fmt.Sprintf("bench_A%d_up_15m_polymarket_ticker", i),
+			json: []byte(`{"askSz":88,"bestAsk":0.47,"bestBid":0.45,"bidSz":120.5,"slug":"btc-updown-15m-1766377800","token_id":"` + benchTokenID + `","ts":1766378123456,"ts_sv":1766378123460}`),
+		}
+	}
+	return writes
+}
+
+func BenchmarkRedisWrites(b *testing.B) {
+	for _, keys := range []int{8, 1000} {
+		b.Run(fmt.Sprintf("keys=%d/per-message", keys), func(b *testing.B) {
+			r := benchRedis(b)
+			defer r.Close()
+			ctx := context.Background()
+			writes := benchWrites(keys)
+
+			b.ResetTimer()
+			start := time.Now()
+			for i := 0; i < b.N; i++ {
+				w := writes[i%keys]
+				pipe := r.Pipeline()
+				pipe.Set(ctx, w.key, w.json, 0)
+				pipe.Publish(ctx, w.key, w.json)
+				pipe.Exec(ctx)
+			}
+			b.ReportMetric(float64(b.N)/time.Since(start).Seconds(), "msgs/s")
+		})
+
+		b.Run(fmt.Sprintf("keys=%d/coalesced", keys), func(b *testing.B) {
+			r := benchRedis(b)
+			defer r.Close()
+			writes := benchWrites(keys)
+
+			p := NewWS([]string{}, time.Now(), r)
+			done := make(chan struct{})
+			flushes := 0
+			p.writer = newRedisWriter(func(batches []writeBatch) {
+				flushes++
+				p.flushRedis(batches)
+				// the tx sentinel is flushed after everything sent before it
+				if last := batches[len(batches)-1]; last.tx && len(last.writes) == 0 {
+					close(done)
+				}
+			})
+			go p.writer.run()
+
+			b.ResetTimer()
+			start := time.Now()
+			for i := 0; i < b.N; i++ {
+				p.writer.send(writeBatch{writes: writes[i%keys : i%keys+1]})
+			}
+			p.writer.send(writeBatch{tx: true})
+			<-done
+			b.ReportMetric(float64(b.N)/time.Since(start).Seconds(), "msgs/s")
+			b.ReportMetric(float64(b.N)/float64(flushes), "msgs/flush")
+		})
+	}
+}
+
+// recordSink keeps every batch the writer flushes, in order.
+type recordSink struct {
+	mu      sync.Mutex
+	batches []writeBatch
+}
+
+func (s *recordSink) flush(batches []writeBatch) {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+	s.batches = append(s.batches, batches...)
+}
+
+func tw(key, v string) tickerWrite {
+	return tickerWrite{key: key, json: []byte(v)}
+}
+
+// flat renders batches as "tx:" / "plain:" followed by key=value pairs,
+// then the book events as ev=frame.
+func flat(batches []writeBatch) []string {
+	var out []string
+	for _, b := range batches {
+		s := "plain:"
+		if b.tx {
+			s = "tx:"
+		}
+		for _, w := range b.writes {
+			s += " " + w.key + "=" + string(w.json)
+		}
+		for _, ev := range b.events {
+			s += " ev=" + string(ev)
+		}
+		out = append(out, s)
+	}
+	return out
+}
+
+// TestRedisWriterCoalesce queues batches before the writer runs, so they
+// are all collected into one flush: each run of plain batches becomes one
+// batch of the latest write per key, and the rollover tx batch is passed
+// through as sent, between the writes before and after it.
+func TestRedisWriterCoalesce(t *testing.T) {
+	sink := &recordSink{}
+	w := newRedisWriter(sink.flush)
+	for _, b := range []writeBatch{
+		{writes: []tickerWrite{tw("A", "1"), tw("B", "1")}},
+		{writes: []tickerWrite{tw("A", "2")}},
+		{writes: []tickerWrite{tw("C", "1"), tw("B", "2")}},
+		{writes: []tickerWrite{tw("A", "3"), tw("B", "3")}, tx: true},
+		{writes: []tickerWrite{tw("A", "4")}},
+		{writes: []tickerWrite{tw("A", "5"), tw("C", "2")}},
+	} {
+		w.send(b)
+	}
+	close(w.ch)
+	w.run()
+
+	got := flat(sink.batches)
+	want := []string{"plain: A=2 B=2 C=1", "tx: A=3 B=3", "plain: A=5 C=2"}
+	if fmt.Sprint(got) != fmt.Sprint(want) {
+		t.Fatalf("flushed %q, want %q", got, want)
+	}
+}
+
+// TestRedisWriterBookEvents checks that raw book frames ride along with
+// the plain run they were sent in: every frame is kept, in order, even
+// when the ticker writes around them coalesce.
+func TestRedisWriterBookEvents(t *testing.T) {
+	sink := &recordSink{}
+	w := newRedisWriter(sink.flush)
+	for _, b := range []writeBatch{
+		{events: [][]byte{[]byte("f1")}},
+		{writes: []tickerWrite{tw("A", "1")}},
+		{events: [][]byte{[]byte("f2")}},
+		{writes: []tickerWrite{tw("A", "2")}},
+		{writes: []tickerWrite{tw("A", "3")}, tx: true},
+		{events: [][]byte{[]byte("f3")}},
+	} {
+		w.send(b)
+	}
+	close(w.ch)
+	w.run()
+
+	got := flat(sink.batches)
+	want := []string{"plain: A=2 ev=f1 ev=f2", "tx: A=3", "plain: ev=f3"}
+	if fmt.Sprint(got) != fmt.Sprint(want) {
+		t.Fatalf("flushed %q, want %q", got, want)
+	}
+}
+
+// TestRedisWriterLatestWins sends from several goroutines while the writer
+// runs: whatever the flush boundaries, the last write of every key is its
+// last value, no plain batch repeats a key, and tx batches arrive intact.
+func TestRedisWriterLatestWins(t *testing.T) {
+	const senders, perSender, keys = 4, 2000, 16
+	sink := &recordSink{}
+	w := newRedisWriter(sink.flush)
+	done := make(chan struct{})
+	go func() {
+		w.run()
+		close(done)
+	}()
+
+	var wg sync.WaitGroup
+	for g := 0; g < senders; g++ {
+		wg.Add(1)
+		go func(g int) {
+			defer wg.Done()
+			for i := 0; i < perSender; i++ {
+				key := fmt.Sprintf("S%d_K%d", g, i%keys)
+				b := writeBatch{writes: []tickerWrite{tw(key, fmt.Sprint(i))}}
+				if i%500 == 499 {
+					b = writeBatch{writes: []tickerWrite{tw(key, fmt.Sprint(i)), tw(key+"_tx", fmt.Sprint(i))}, tx: true}
+				}
+				w.send(b)
+			}
+		}(g)
+	}
+	wg.Wait()
+	close(w.ch)
+	<-done
+
+	last := make(map[string]string)
+	txs := 0
+	for _, b := range sink.batches {
+		if b.tx {
+			txs++
+			if len(b.writes) != 2 || b.writes[1].key != b.writes[0].key+"_tx" {
+				t.Fatalf("tx batch changed: %q", flat([]writeBatch{b}))
+			}
+		} else {
+			seen := make(map[string]bool)
+			for _, w := range b.writes {
+				if seen[w.key] {
+					t.Fatalf("plain batch repeats %s", w.key)
+				}
+				seen[w.key] = true
+			}
+		}
+		for _, w := range b.writes {
+			last[w.key] = string(w.json)
+		}
+	}
+	if want := senders * perSender / 500; txs != want {
+		t.Errorf("%d tx batches flushed, want %d", txs, want)
+	}
+	for g := 0; g < senders; g++ {
+		for k := 0; k < keys; k++ {
+			key := fmt.Sprintf("S%d_K%d", g, k)
+			if want := fmt.Sprint(perSender - keys + k); last[key] != want {
+				t.Errorf("%s: last write %s, want %s", key, last[key], want)
+			}
+		}
+	}
+}
@@ -0,0 +1,382 @@
+package main
+
+import (
+	"encoding/json"
+	"fmt"
+	"hash/fnv"
+	"log"
+	"math"
+	"sync"
+	"time"
+
+	"github.com/gorilla/websocket"
+)
+
+/* ============================
+   SHARDING
+============================ */
+
+const (
+	// TOKENS_PER_CONN is the target number of tokens per WS connection; the
+	// shard count is sized for twice the tracked tokens so pre-subscribed
+	// next-slot tokens fit without resharding
+	TOKENS_PER_CONN = 100
+	// WS_SHARDS > 0 forces the number of connections
+	WS_SHARDS = 0
+
+	// redisWriter queue (batches) and how many queued batches one flush may take
+	WRITER_QUEUE     = 4096
+	WRITER_MAX_BATCH = 256
+)
+
+// WRITER_WINDOW is how long the writer keeps collecting after the first
+// batch of a flush; 0 takes only what is already queued.
+const WRITER_WINDOW = time.Millisecond
+
+// numShards returns the connection count for n tracked tokens.
+func numShards(n int) int {
+	if WS_SHARDS > 0 {
+		return WS_SHARDS
+	}
+	shards := int(math.Ceil(float64(2*n) / TOKENS_PER_CONN))
+	if shards < 1 {
+		return 1
+	}
+	return shards
+}
+
+// shardIndex maps a token id to one of n shards; stable for the process
+// lifetime so a token's ticker state always lives on the same shard.
+func shardIndex(tid string, n int) int {
+	h := fnv.New32a()
+	h.Write([]byte(tid))
+	return int(h.Sum32() % uint32(n))
+}
+
+// shardFor returns the shard owning tid, nil before Start. Callers hold p.mu.
+func (p *PolymarketWS) shardFor(tid string) *wsShard {
+	if len(p.shards) == 0 {
+		return nil
+	}
+	return p.shards[shardIndex(tid, len(p.shards))]
+}
+
+// shardTokens returns the tracked tokens that belong to shard i. Callers hold p.mu.
+func (p *PolymarketWS) shardTokens(i int) []string {
+	ids := []string{}
+	for _, tid := range p.assetIDs {
+		if shardIndex(tid, len(p.shards)) == i {
+			ids = append(ids, tid)
+		}
+	}
+	return ids
+}
+
+// startShards opens n connections, each reading and decoding on its own
+// goroutine, and blocks until all of them give up.
+func (p *PolymarketWS) startShards(n int) {
+	shards := make([]*wsShard, n)
+	for i := range shards {
+		shards[i] = &wsShard{
+			id:      i,
+			p:       p,
+			tickers: make(map[string]*Ticker),
+		}
+	}
+
+	p.mu.Lock()
+	p.shards = shards
+	log.Println("[WS] sharding", len(p.assetIDs), "tokens over", n, "connections")
+	p.mu.Unlock()
+
+	p.running = true
+	go p.writer.run()
+
+	var wg sync.WaitGroup
+	for _, s := range shards {
+		wg.Add(1)
+		go func(s *wsShard) {
+			defer wg.Done()
+			s.connect()
+		}(s)
+	}
+	wg.Wait()
+}
+
+/* ============================
+   SHARD CONNECTION
+============================ */
+
+// wsShard is one WS connection subscribed to a subset of the tokens. It owns
+// the ticker state of those tokens, so shards never contend with each other
+// on the update path.
+type wsShard struct {
+	id int
+	p  *PolymarketWS
+
+	// mu guards tickers
+	mu      sync.Mutex
+	tickers map[string]*Ticker
+
+	// decode scratch, reused by the read goroutine across frames
+	msg     marketMsg
+	msgs    []marketMsg
+	touched []string
+
+	// writeMu serializes writes on conn (subscribe ops vs pinger)
+	writeMu    sync.Mutex
+	conn       *websocket.Conn
+	reconnects int
+}
+
+func (s *wsShard) sendOperation(op string, ids []string) {
+	msg, _ := json.Marshal(map[string]any{
+		"assets_ids": ids,
+		"operation":  op,
+	})
+
+	s.writeMu.Lock()
+	defer s.writeMu.Unlock()
+	if s.conn == nil {
+		return
+	}
+	if err := s.conn.WriteMessage(websocket.TextMessage, msg); err != nil {
+		log.Println("[WS] shard", s.id, op, "error:", err)
+	}
+}
+
+func (s *wsShard) handleMsg(msg []byte) {
+	if string(msg) == "PONG" {
+		return
+	}
+
+	// published by the writer; ReadMessage hands out a fresh buffer per frame
+	if PUBLISH_BOOK_EVENTS {
+		s.p.writer.send(writeBatch{events: [][]byte{msg}})
+	}
+
+	// Handle array messages (multiple book updates)
+	if len(msg) > 0 && msg[0] == '[' {
+		s.msgs = reset(s.msgs)
+		if err := json.Unmarshal(msg, &s.msgs); err != nil {
+			fmt.Println("unmarshal array error:", err)
+			return
+		}
+		for i := range s.msgs {
+			s.processTickerUpdate(&s.msgs[i])
+		}
+		return
+	}
+
+	// Handle single object messages
+	s.msg = marketMsg{PriceChanges: reset(s.msg.PriceChanges)}
+	if err := json.Unmarshal(msg, &s.msg); err != nil {
+		fmt.Println("unmarshal object error:", err)
+		return
+	}
+
+	s.processTickerUpdate(&s.msg)
+}
+
+// reset empties a decode scratch slice for reuse. json decodes into the
+// old elements in place and leaves absent fields as they were, so every
+// element up to cap is zeroed first.
+func reset[T any](v []T) []T {
+	v = v[:cap(v)]
+	clear(v)
+	return v[:0]
+}
+
+func (s *wsShard) connect() {
+	p := s.p
+	for p.running && s.reconnects < MAX_RECONNECTS {
+		c, _, err := websocket.DefaultDialer.Dial(p.url, nil)
+		if err != nil {
+			s.reconnects++
+			time.Sleep(time.Duration(math.Pow(2, float64(s.reconnects))) * time.Second)
+			continue
+		}
+
+		s.reconnects = 0
+
+		// (re)subscribe this shard's tokens, active and pending
+		p.mu.RLock()
+		sub, _ := json.Marshal(map[string]any{
+			"type":       "market",
+			"assets_ids": p.shardTokens(s.id),
+		})
+		p.mu.RUnlock()
+
+		s.writeMu.Lock()
+		s.conn = c
+		c.WriteMessage(websocket.TextMessage, sub)
+		s.writeMu.Unlock()
+
+		done := make(chan struct{})
+		go s.ping(c, done)
+		for {
+			_, msg, err := c.ReadMessage()
+			if err != nil {
+				break
+			}
+			s.handleMsg(msg)
+		}
+
+		// stop this connection's pinger before dialing again
+		close(done)
+		s.writeMu.Lock()
+		s.conn = nil
+		s.writeMu.Unlock()
+		c.Close()
+	}
+}
+
+func (s *wsShard) ping(c *websocket.Conn, done chan struct{}) {
+	ticker := time.NewTicker(WS_PING_SECONDS)
+	defer ticker.Stop()
+	for {
+		s.writeMu.Lock()
+		c.WriteMessage(websocket.TextMessage, []byte("PING"))
+		s.writeMu.Unlock()
+
+		select {
+		case <-done:
+			return
+		case <-ticker.C:
+		}
+	}
+}
+
+// close drops the current connection; connect returns once p.running is false.
+func (s *wsShard) close() {
+	s.writeMu.Lock()
+	defer s.writeMu.Unlock()
+	if s.conn != nil {
+		s.conn.Close()
+	}
+}
+
+/* ============================
+   REDIS WRITER
+============================ */
+
+// tickerWrite is one encoded ticker: json under key and/or bin under
+// binKey, per TICKER_ENCODING.
+type tickerWrite struct {
+	key    string
+	binKey string
+	json   []byte
+	bin    []byte
+}
+
+// writeBatch is the writes of one WS message (or one rollover swap, tx).
+// events are raw frames for BOOK_EVENTS_CHANNEL; unlike writes, every one
+// is published.
+type writeBatch struct {
+	writes []tickerWrite
+	events [][]byte
+	tx     bool
+}
+
+// redisWriter funnels every shard's writes through one goroutine. Each flush
+// collects batches for up to WRITER_WINDOW and coalesces them to the latest
+// write per key (a ticker supersedes every earlier one), so the Redis round
+// trips per second stay flat as shards, tokens and update rates grow.
+type redisWriter struct {
+	ch    chan writeBatch
+	flush func([]writeBatch)
+
+	// coalesce scratch, owned by run
+	index map[string]int
+}
+
+func newRedisWriter(flush func([]writeBatch)) *redisWriter {
+	return &redisWriter{
+		ch:    make(chan writeBatch, WRITER_QUEUE),
+		flush: flush,
+		index: make(map[string]int),
+	}
+}
+
+func (w *redisWriter) send(b writeBatch) {
+	w.ch <- b
+}
+
+func (w *redisWriter) run() {
+	batches := make([]writeBatch, 0, WRITER_MAX_BATCH)
+	window := time.NewTimer(WRITER_WINDOW)
+	window.Stop()
+
+	for b := range w.ch {
+		batches = append(batches[:0], b)
+		if WRITER_WINDOW > 0 {
+			window.Reset(WRITER_WINDOW)
+		}
+	collect:
+		for len(batches) < WRITER_MAX_BATCH {
+			if WRITER_WINDOW > 0 {
+				select {
+				case b, ok := <-w.ch:
+					if !ok {
+						break collect
+					}
+					batches = append(batches, b)
+				case <-window.C:
+					break collect
+				}
+				continue
+			}
+			select {
+			case b, ok := <-w.ch:
+				if !ok {
+					break collect
+				}
+				batches = append(batches, b)
+			default:
+				break collect
+			}
+		}
+		if WRITER_WINDOW > 0 && !window.Stop() {
+			select {
+			case <-window.C:
+			default:
+			}
+		}
+		w.flush(w.coalesce(batches))
+	}
+}
+
+// coalesce merges each run of plain batches into one holding the latest
+// write per key, in first-seen key order, and all of the run's events in
+// order; tx batches stay where they are.
+func (w *redisWriter) coalesce(batches []writeBatch) []writeBatch {
+	var out []writeBatch
+	var plain []tickerWrite
+	var events [][]byte
+	clear(w.index)
+
+	for _, b := range batches {
+		if b.tx {
+			if len(plain) > 0 || len(events) > 0 {
+				out = append(out, writeBatch{writes: plain, events: events})
+				plain, events = nil, nil
+				clear(w.index)
+			}
+			out = append(out, b)
+			continue
+		}
+		events = append(events, b.events...)
+		for _, tw := range b.writes {
+			if i, ok := w.index[tw.key]; ok {
+				plain[i] = tw
+				continue
+			}
+			w.index[tw.key] = len(plain)
+			plain = append(plain, tw)
+		}
+	}
+	if len(plain) > 0 || len(events) > 0 {
+		out = append(out, writeBatch{writes: plain, events: events})
+	}
+	return out
+}
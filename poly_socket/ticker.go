@@ -0,0 +1,116 @@
+package main
+
+import (
+	"encoding/json"
+	"fmt"
+	"strconv"
+	"strings"
+)
+
+/* ============================
+   TICKER STATE
+============================ */
+
+// TICKER_HEARTBEAT_MS rewrites an unchanged ticker once its last write is
+// this old, so consumers checking ts freshness (500ms in arbitrage_poly)
+// do not see a quiet but valid book as stale.
+const TICKER_HEARTBEAT_MS = 250
+
+// tokenInfo is everything static about one token, built once when the
+// token starts being tracked: the Redis keys and the pre-encoded JSON tail.
+type tokenInfo struct {
+	tid    string
+	market *Market
+	key    string
+	binKey string
+	// ticker board slot, -1 when the board is off (board.go)
+	slot int
+	// start of the market's 15m slot (unix seconds, from the slug; 0 if
+	// the slug has none): consumers pair UP and DOWN only on equal slotTs
+	slotTs int64
+	// `"slot_ts":...,"slug":"...","token_id":"..."}`: appended verbatim after the numbers
+	static []byte
+}
+
+func newTokenInfo(m *Market, tid string) *tokenInfo {
+	asset := strings.ToUpper(strings.Split(m.Slug, "-")[0])
+	outcome := strings.ToLower(m.TokenOutcomeMap[tid])
+	key := fmt.Sprintf("%s_%s_15m_polymarket_ticker", asset, outcome)
+
+	slotTs := slugSlotTs(m.Slug)
+
+	slug, _ := json.Marshal(m.Slug)
+	token, _ := json.Marshal(tid)
+	static := make([]byte, 0, len(slug)+len(token)+48)
+	static = append(static, `"slot_ts":`...)
+	static = strconv.AppendInt(static, slotTs, 10)
+	static = append(static, `,"slug":`...)
+	static = append(static, slug...)
+	static = append(static, `,"token_id":`...)
+	static = append(static, token...)
+	static = append(static, '}')
+
+	return &tokenInfo{
+		tid:    tid,
+		market: m,
+		key:    key,
+		binKey: key + TICKER_BIN_SUFFIX,
+		slot:   -1,
+		slotTs: slotTs,
+		static: static,
+	}
+}
+
+// slugSlotTs is the slot start of a recurring market slug
+// ("btc-updown-15m-1766377800" -> 1766377800), 0 for any other slug.
+func slugSlotTs(slug string) int64 {
+	ts, err := strconv.ParseInt(slug[strings.LastIndexByte(slug, '-')+1:], 10, 64)
+	if err != nil {
+		return 0
+	}
+	return ts
+}
+
+// Ticker is the top of book of one token as last seen by the feeder.
+type Ticker struct {
+	BestBid float64
+	BidSz   float64
+	BestAsk float64
+	AskSz   float64
+	Ts      int64 // exchange timestamp, ms
+	TsSv    int64 // feeder receive time, ms
+	TsWrUs  int64 // feeder write time, us (latency.py feeder_redis stage)
+
+	// TsSv of the last write, 0 before the first
+	written int64
+}
+
+// set applies one update and reports whether the ticker should be written:
+// the top of book moved, it was never written, or the heartbeat is due.
+func (t *Ticker) set(bestBid, bidSz, bestAsk, askSz float64, ts, tsSv int64) bool {
+	moved := bestBid != t.BestBid || bidSz != t.BidSz || bestAsk != t.BestAsk || askSz != t.AskSz
+	t.BestBid, t.BidSz, t.BestAsk, t.AskSz = bestBid, bidSz, bestAsk, askSz
+	t.Ts, t.TsSv = ts, tsSv
+	return moved || t.written == 0 || tsSv-t.written >= TICKER_HEARTBEAT_MS
+}
+
+// appendJSON encodes the ticker in the feeder's JSON layout (same fields
+// the map encoding had) without reflection.
+func (t *Ticker) appendJSON(buf []byte, info *tokenInfo) []byte {
+	buf = append(buf, `{"bestBid":`...)
+	buf = strconv.AppendFloat(buf, t.BestBid, 'f', -1, 64)
+	buf = append(buf, `,"bidSz":`...)
+	buf = strconv.AppendFloat(buf, t.BidSz, 'f', -1, 64)
+	buf = append(buf, `,"bestAsk":`...)
+	buf = strconv.AppendFloat(buf, t.BestAsk, 'f', -1, 64)
+	buf = append(buf, `,"askSz":`...)
+	buf = strconv.AppendFloat(buf, t.AskSz, 'f', -1, 64)
+	buf = append(buf, `,"ts":`...)
+	buf = strconv.AppendInt(buf, t.Ts, 10)
+	buf = append(buf, `,"ts_sv":`...)
+	buf = strconv.AppendInt(buf, t.TsSv, 10)
+	buf = append(buf, `,"ts_wr_us":`...)
+	buf = strconv.AppendInt(buf, t.TsWrUs, 10)
+	buf = append(buf, ',')
+	return append(buf, info.static...)
+}
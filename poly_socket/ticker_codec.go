@@ -0,0 +1,47 @@
+package main
+
+import (
+	"encoding/binary"
+	"math"
+)
+
+/* ============================
+   BINARY TICKER ENCODING
+============================ */
+
+// Fixed little-endian layout shared with ticker_codec.py:
+//
+//	offset  size  field
+//	0       8     bestBid  float64
+//	8       8     bidSz    float64
+//	16      8     bestAsk  float64
+//	24      8     askSz    float64
+//	32      8     ts       int64 (exchange, ms)
+//	40      8     ts_sv    int64 (feeder receive, ms)
+//	48      8     slot_ts  int64 (market slot start, unix seconds; 0: unknown)
+//	56      78    token_id ASCII, NUL padded
+const (
+	TICKER_BIN_TOKEN_LEN = 78
+	TICKER_BIN_SIZE      = 56 + TICKER_BIN_TOKEN_LEN
+	TICKER_BIN_SUFFIX    = "_bin"
+)
+
+// encodeTicker writes the binary ticker into buf (len >= TICKER_BIN_SIZE) and
+// returns buf[:TICKER_BIN_SIZE]. It does not allocate.
+func encodeTicker(buf []byte, bestBid, bidSz, bestAsk, askSz float64, ts, tsSv, slotTs int64, tokenID string) []byte {
+	buf = buf[:TICKER_BIN_SIZE]
+	le := binary.LittleEndian
+	le.PutUint64(buf[0:], math.Float64bits(bestBid))
+	le.PutUint64(buf[8:], math.Float64bits(bidSz))
+	le.PutUint64(buf[16:], math.Float64bits(bestAsk))
+	le.PutUint64(buf[24:], math.Float64bits(askSz))
+	le.PutUint64(buf[32:], uint64(ts))
+	le.PutUint64(buf[40:], uint64(tsSv))
+	le.PutUint64(buf[48:], uint64(slotTs))
+
+	n := copy(buf[56:], tokenID)
+	for i := 56 + n; i < TICKER_BIN_SIZE; i++ {
+		buf[i] = 0
+	}
+	return buf
+}
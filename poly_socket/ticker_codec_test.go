@@ -0,0 +1,50 @@
+package main
+
+import (
+	"encoding/json"
+	"testing"
+)
+
+const benchTokenID = "87142374061000861551796777015507582795011030012469790923844501037328154887367"
+
+// go test -bench Ticker -benchmem
+
+func BenchmarkTickerEncodeJSON(b *testing.B) {
+	t := map[string]any{}
+	b.ReportAllocs()
+	for i := 0; i < b.N; i++ {
+		t["bestBid"] = 0.45
+		t["bidSz"] = 120.5
+		t["bestAsk"] = 0.47
+		t["askSz"] = 88.0
+		t["token_id"] = benchTokenID
+		t["slug"] = "btc-updown-15m-1766377800"
+		t["ts"] = int64(1766378123456)
+		t["ts_sv"] = int64(1766378123460)
+		if _, err := json.Marshal(t); err != nil {
+			b.Fatal(err)
+		}
+	}
+}
+
+func BenchmarkTickerEncodeBinary(b *testing.B) {
+	buf := make([]byte, TICKER_BIN_SIZE)
+	b.ReportAllocs()
+	for i := 0; i < b.N; i++ {
+		encodeTicker(buf, 0.45, 120.5, 0.47, 88.0, 1766378123456, 1766378123460, 1766377800, benchTokenID)
+	}
+}
+
+func BenchmarkTickerEncodeTyped(b *testing.B) {
+	info := newTokenInfo(&Market{
+		Slug:            "btc-updown-15m-1766377800",
+		TokenOutcomeMap: map[string]string{benchTokenID: "Up"},
+	}, benchTokenID)
+	t := &Ticker{}
+	buf := make([]byte, 0, 256)
+	b.ReportAllocs()
+	for i := 0; i < b.N; i++ {
+		t.set(0.45, 120.5, 0.47, 88.0, 1766378123456, 1766378123460)
+		buf = t.appendJSON(buf[:0], info)
+	}
+}
@@ -6,13 +6,11 @@ import (
 	"fmt"
 	"io"
 	"log"
-	"math"
 	"net/http"
-	"strconv"
-	"strings"
+	"slices"
+	"sync"
 	"time"
 
-	"github.com/gorilla/websocket"
 	"github.com/redis/go-redis/v9"
 )
 
@@ -26,6 +24,24 @@ const (
 	HTTP_TIMEOUT    = 20 * time.Second
 	WS_PING_SECONDS = 10 * time.Second
 	MAX_RECONNECTS  = 10
+
+	// market discovery: per-slug retry interval while a slot is not listed yet,
+	// and the overall deadline for one fetch15mMarkets call
+	FETCH_RETRY    = 500 * time.Millisecond
+	FETCH_DEADLINE = 15 * time.Second
+
+	// PUBLISH_TICKERS also publishes every ticker on a channel named after
+	// its Redis key, so consumers can block on updates instead of polling.
+	PUBLISH_TICKERS = true
+
+	// TICKER_ENCODING selects what is written per ticker update:
+	// "json" (key), "binary" (key + TICKER_BIN_SUFFIX, see ticker_codec.go) or "both".
+	TICKER_ENCODING = "json"
+
+	// PUBLISH_BOOK_EVENTS forwards every raw market frame on BOOK_EVENTS_CHANNEL
+	// so orderbook_store.OrderBookStore can keep full-depth books.
+	PUBLISH_BOOK_EVENTS = false
+	BOOK_EVENTS_CHANNEL = "polymarket_book_events"
 )
 
 /* ============================
@@ -66,22 +82,37 @@ type MarketResponse struct {
 	EndDateIso   string `json:"endDateIso"`
 }
 
-type OrderBook map[float64]float64
-
 /* ============================
    GAMMA API
 ============================ */
 
-func fetchMarket(slug string) (*Market, error) {
+// gammaClient is shared so discovery reuses keep-alive connections to Gamma.
+var gammaClient = &http.Client{
+	Timeout: HTTP_TIMEOUT,
+	Transport: &http.Transport{
+		Proxy:               http.ProxyFromEnvironment,
+		MaxIdleConns:        32,
+		MaxIdleConnsPerHost: 16,
+		IdleConnTimeout:     90 * time.Second,
+		ForceAttemptHTTP2:   true,
+	},
+}
+
+func fetchMarket(ctx context.Context, slug string) (*Market, error) {
 	url := fmt.Sprintf("%s/markets/slug/%s", GAMMA_API_URL, slug)
 
-	resp, err := http.Get(url)
+	req, err := http.NewRequestWithContext(ctx, http.MethodGet, url, nil)
+	if err != nil {
+		return nil, err
+	}
+	resp, err := gammaClient.Do(req)
 	if err != nil {
 		return nil, err
 	}
 	defer resp.Body.Close()
 
 	if resp.StatusCode != 200 {
+		io.Copy(io.Discard, resp.Body) // keep the connection reusable
 		return nil, fmt.Errorf("unexpected status code: %d", resp.StatusCode)
 	}
 
@@ -153,47 +184,46 @@ func fetch15mMarkets(
 
 	ts := targetSlot.Unix()
 
+	ctx, cancel := context.WithTimeout(context.Background(), FETCH_DEADLINE)
+	defer cancel()
+
+	// one goroutine per asset; slugs that are not live yet are retried until the deadline
+	found := make([]*Market, len(assets))
+	var wg sync.WaitGroup
+	for i, a := range assets {
+		wg.Add(1)
+		go func(i int, a string) {
+			defer wg.Done()
+			slug := fmt.Sprintf("%s-updown-15m-%d", a, ts)
+			for {
+				m, err := fetchMarket(ctx, slug)
+				if err == nil && m != nil {
+					log.Println("[OK]", slug)
+					found[i] = m
+					return
+				}
+				select {
+				case <-ctx.Done():
+					log.Println("[WAIT]", slug, err)
+					return
+				case <-time.After(FETCH_RETRY):
+				}
+			}
+		}(i, a)
+	}
+	wg.Wait()
+
+	// keep the assets' order
 	var markets []*Market
-	for _, a := range assets {
-		slug := fmt.Sprintf("%s-updown-15m-%d", a, ts)
-		m, err := fetchMarket(slug)
-		if err == nil && m != nil {
-			log.Println("[OK]", slug)
+	for _, m := range found {
+		if m != nil {
 			markets = append(markets, m)
-		} else {
-			log.Println("[WAIT]", slug)
 		}
 	}
 
 	return markets, targetSlot
 }
 
-/* ============================
-   ORDERBOOK
-============================ */
-
-func parseOrderBook(raw any) OrderBook {
-	book := make(OrderBook)
-	arr, ok := raw.([]any)
-	if !ok {
-		return book
-	}
-
-	for _, v := range arr {
-		x, ok := v.(map[string]any)
-		if !ok {
-			continue
-		}
-		price := toFloat(x["price"])
-		size := toFloat(x["size"])
-
-		if price > 0 && size > 0 {
-			book[price] = size
-		}
-	}
-	return book
-}
-
 /* ============================
    WS CLIENT
 ============================ */
@@ -202,284 +232,353 @@ type PolymarketWS struct {
 	assets      []string
 	currentSlot time.Time
 	redis       *redis.Client
-
-	marketMap  map[string]*Market
-	tokenMap   map[string]string
-	assetIDs   []string
-	tickers    map[string]map[string]any
-	conn       *websocket.Conn
-	running    bool
-	reconnects int
+	url         string
+
+	// mu guards the maps below: every shard reads them per update, the
+	// rollover scheduler writes them
+	mu        sync.RWMutex
+	marketMap map[string]*Market
+	tokens    map[string]*tokenInfo
+	assetIDs  []string
+	// active tokens are written to Redis; the rest are the next slot's,
+	// subscribed ahead of the boundary so their books are warm at the swap
+	active  map[string]bool
+	pending []string
+
+	// one connection + decode goroutine per shard (see shard.go); all
+	// Redis writes go through one batching writer
+	shards  []*wsShard
+	writer  *redisWriter
+	running bool
+
+	// optional same-host copy of the active tickers (board.go); set before Start
+	board *tickerBoard
 }
 
 func NewWS(assets []string, slot time.Time, r *redis.Client) *PolymarketWS {
-	return &PolymarketWS{
+	p := &PolymarketWS{
 		assets:      assets,
 		currentSlot: slot.UTC(),
 		redis:       r,
+		url:         WSS_URL,
 		marketMap:   make(map[string]*Market),
-		tokenMap:    make(map[string]string),
-		tickers:     make(map[string]map[string]any),
+		tokens:      make(map[string]*tokenInfo),
+		active:      make(map[string]bool),
 	}
+	p.writer = newRedisWriter(p.flushRedis)
+	return p
 }
 
 func (p *PolymarketWS) updateMarkets(markets []*Market) {
+	p.mu.Lock()
+	defer p.mu.Unlock()
+
 	p.marketMap = make(map[string]*Market)
-	p.tokenMap = make(map[string]string)
+	p.tokens = make(map[string]*tokenInfo)
+	p.active = make(map[string]bool)
 	p.assetIDs = []string{}
+	p.pending = nil
 
 	for _, m := range markets {
 		for _, tid := range m.TokenIDs {
 			p.marketMap[tid] = m
-			p.tokenMap[tid] = m.TokenOutcomeMap[tid]
+			p.tokens[tid] = p.newTokenInfo(m, tid)
+			p.active[tid] = true
 			p.assetIDs = append(p.assetIDs, tid)
 		}
 	}
 	log.Println("[STATE] tracking", len(p.assetIDs), "tokens")
 }
 
-func (p *PolymarketWS) handleMsg(msg []byte) {
-	if string(msg) == "PONG" {
-		return
+// newTokenInfo builds a token's static info and resolves its board slot.
+// Callers hold p.mu.
+func (p *PolymarketWS) newTokenInfo(m *Market, tid string) *tokenInfo {
+	info := newTokenInfo(m, tid)
+	if p.board != nil {
+		slot, err := p.board.slot(info.key)
+		if err != nil {
+			log.Println("[BOARD]", err)
+		}
+		info.slot = slot
 	}
+	return info
+}
 
-	strMsg := string(msg)
-
-	// Handle array messages (multiple book updates)
-	if strings.HasPrefix(strMsg, "[") {
-		var arr []map[string]any
-		if err := json.Unmarshal(msg, &arr); err != nil {
-			fmt.Println("unmarshal array error:", err)
-			return
-		}
-		for _, d := range arr {
-			p.processTickerUpdate(d)
+// addPending registers the next slot's markets and subscribes them on the
+// live connections. Their tickers are tracked but not written until SwapToPending.
+func (p *PolymarketWS) addPending(markets []*Market) {
+	p.mu.Lock()
+	var ids []string
+	for _, m := range markets {
+		for _, tid := range m.TokenIDs {
+			if _, ok := p.marketMap[tid]; ok {
+				continue
+			}
+			p.marketMap[tid] = m
+			p.tokens[tid] = p.newTokenInfo(m, tid)
+			p.assetIDs = append(p.assetIDs, tid)
+			p.pending = append(p.pending, tid)
+			ids = append(ids, tid)
 		}
-		return
 	}
+	p.mu.Unlock()
 
-	// Handle single object messages
-	var d map[string]any
-	if err := json.Unmarshal(msg, &d); err != nil {
-		fmt.Println("unmarshal object error:", err)
-		return
+	if len(ids) > 0 {
+		p.sendOperation("subscribe", ids)
+		log.Println("[ROLLOVER] pre-subscribed", len(ids), "tokens")
 	}
-
-	p.processTickerUpdate(d)
 }
 
-// processTickerUpdate handles a single update, updating existing ticker values
-func (p *PolymarketWS) processTickerUpdate(d map[string]any) {
-	eventType := str(d["event_type"])
-
-	if eventType != "book" && eventType != "price_change" {
+// SwapToPending makes the pre-subscribed tokens active at the slot boundary:
+// their latest tickers are written in one MULTI/EXEC (an MGET never sees a
+// mix of old and new tokens), then the old tokens are unsubscribed and forgotten.
+func (p *PolymarketWS) SwapToPending(slot time.Time) {
+	p.mu.Lock()
+	if len(p.pending) == 0 {
+		p.mu.Unlock()
 		return
 	}
 
-	// Collect per-asset update objects
-	type pcObj struct {
-		tid string
-		obj map[string]any
+	var old []string
+	for tid := range p.active {
+		old = append(old, tid)
 	}
 
-	var updates []pcObj
-
-	switch eventType {
-
-	case "book":
-		tid := str(d["asset_id"])
-		if tid == "" {
-			return
+	p.active = make(map[string]bool)
+	for _, tid := range p.pending {
+		p.active[tid] = true
+	}
+	p.pending = nil
+	p.currentSlot = slot.UTC()
+
+	var writes []tickerWrite
+	for tid := range p.active {
+		if s := p.shardFor(tid); s != nil {
+			s.mu.Lock()
+			if t := s.tickers[tid]; t != nil {
+				info := p.tokens[tid]
+				writes = append(writes, encodeWrite(info, t))
+				p.board.write(info.slot, t, info)
+			}
+			s.mu.Unlock()
 		}
-		updates = append(updates, pcObj{tid: tid, obj: d})
+	}
 
-	case "price_change":
-		raw, ok := d["price_changes"].([]any)
-		if !ok {
-			return
+	for _, tid := range old {
+		if s := p.shardFor(tid); s != nil {
+			s.mu.Lock()
+			delete(s.tickers, tid)
+			s.mu.Unlock()
 		}
+		delete(p.marketMap, tid)
+		delete(p.tokens, tid)
+	}
+	p.assetIDs = p.assetIDs[:0]
+	for tid := range p.marketMap {
+		p.assetIDs = append(p.assetIDs, tid)
+	}
+	p.mu.Unlock()
 
-		for _, v := range raw {
-			m, ok := v.(map[string]any)
-			if !ok {
-				continue
-			}
-
-			tid := str(m["asset_id"])
-			if tid == "" {
-				continue
-			}
+	// queued behind every earlier write, so no old-slot ticker lands after it
+	p.writer.send(writeBatch{writes: writes, tx: true})
+	if len(old) > 0 {
+		p.sendOperation("unsubscribe", old)
+	}
+	log.Println("[ROLLOVER] swapped to slot", slot.UTC(), "retired", len(old), "tokens")
+}
 
-			updates = append(updates, pcObj{tid: tid, obj: m})
+// sendOperation subscribes/unsubscribes token ids, each on its own shard's
+// connection. Before Start there is nothing to send: connect subscribes everything tracked.
+func (p *PolymarketWS) sendOperation(op string, ids []string) {
+	p.mu.RLock()
+	byShard := make(map[*wsShard][]string)
+	for _, tid := range ids {
+		if s := p.shardFor(tid); s != nil {
+			byShard[s] = append(byShard[s], tid)
 		}
 	}
+	p.mu.RUnlock()
 
-	// Apply updates
-	for _, u := range updates {
-		market, ok := p.marketMap[u.tid]
-		if !ok {
-			continue
-		}
+	for s, shardIDs := range byShard {
+		s.sendOperation(op, shardIDs)
+	}
+}
 
-		t := p.tickers[u.tid]
-		if t == nil {
-			t = make(map[string]any)
-			p.tickers[u.tid] = t
-		}
+// processTickerUpdate handles a single update, updating existing ticker values
+func (s *wsShard) processTickerUpdate(m *marketMsg) {
+	p := s.p
+	if m.EventType != "book" && m.EventType != "price_change" {
+		return
+	}
 
-		var bestBid, bidSz, bestAsk, askSz float64
+	ts := int64(m.Timestamp.v)
+	tsSv := time.Now().UnixMilli()
 
-		switch eventType {
+	// Apply updates; each touched active token is encoded once, with its
+	// final state, and the message's writes go to the writer as one batch
+	touched := s.touched[:0]
 
-		case "price_change":
-			if v := toFloat(u.obj["best_bid"]); v != 0 {
-				bestBid = v
-			} else if prev, ok := t["bestBid"].(float64); ok {
-				bestBid = prev
-			}
+	p.mu.RLock()
+	s.mu.Lock()
+
+	switch m.EventType {
 
-			if v := toFloat(u.obj["bid_size"]); v != 0 {
-				bidSz = v
-			} else if prev, ok := t["bidSz"].(float64); ok {
-				bidSz = prev
+	case "book":
+		if t := s.ticker(m.AssetID); t != nil {
+			bestBid, bidSz := m.Bids.best(true)
+			bestAsk, askSz := m.Asks.best(false)
+			if t.set(bestBid, bidSz, bestAsk, askSz, ts, tsSv) && p.active[m.AssetID] {
+				touched = append(touched, m.AssetID)
 			}
+		}
 
-			if v := toFloat(u.obj["best_ask"]); v != 0 {
-				bestAsk = v
-			} else if prev, ok := t["bestAsk"].(float64); ok {
-				bestAsk = prev
+	case "price_change":
+		for i := range m.PriceChanges {
+			pc := &m.PriceChanges[i]
+			t := s.ticker(pc.AssetID)
+			if t == nil {
+				continue
 			}
 
-			if v := toFloat(u.obj["ask_size"]); v != 0 {
-				askSz = v
-			} else if prev, ok := t["askSz"].(float64); ok {
-				askSz = prev
+			// A field that is present wins even when it is 0 (the side emptied);
+			// only a missing field keeps the previous value.
+			bestBid := pc.BestBid.or(t.BestBid)
+			bestAsk := pc.BestAsk.or(t.BestAsk)
+			bidSz := pc.BidSize.or(t.BidSz)
+			askSz := pc.AskSize.or(t.AskSz)
+
+			// price_change carries the changed level, not the size at the top:
+			// take it when the change is at the (new) best price.
+			if !pc.BidSize.ok && pc.Side == "BUY" && pc.Price.v == bestBid {
+				bidSz = pc.Size.v
+			}
+			if !pc.AskSize.ok && pc.Side == "SELL" && pc.Price.v == bestAsk {
+				askSz = pc.Size.v
+			}
+			if bestBid == 0 {
+				bidSz = 0
+			}
+			if bestAsk == 0 {
+				askSz = 0
 			}
 
-		case "book":
-			bids := parseOrderBook(u.obj["bids"])
-			asks := parseOrderBook(u.obj["asks"])
-			bestBid, bidSz = maxBook(bids)
-			bestAsk, askSz = minBook(asks)
+			// Persist ticker; an update that leaves the top of book as it was
+			// is not written (see Ticker.set).
+			// Next-slot tokens only keep their state until SwapToPending.
+			if t.set(bestBid, bidSz, bestAsk, askSz, ts, tsSv) && p.active[pc.AssetID] && !slices.Contains(touched, pc.AssetID) {
+				touched = append(touched, pc.AssetID)
+			}
 		}
-
-		// Persist ticker
-		t["bestBid"] = bestBid
-		t["bidSz"] = bidSz
-		t["bestAsk"] = bestAsk
-		t["askSz"] = askSz
-		t["token_id"] = u.tid
-		t["slug"] = market.Slug
-		t["ts"] = int64(toFloat(d["timestamp"]))
-		t["ts_sv"] = time.Now().UnixMilli()
-
-		asset := strings.ToUpper(strings.Split(market.Slug, "-")[0])
-		outcome := strings.ToLower(p.tokenMap[u.tid])
-		key := fmt.Sprintf("%s_%s_15m_polymarket_ticker", asset, outcome)
-
-		b, _ := json.Marshal(t)
-		p.redis.Set(context.Background(), key, b, 0)
 	}
-}
 
-func (p *PolymarketWS) connect() {
-	for p.running && p.reconnects < MAX_RECONNECTS {
-		c, _, err := websocket.DefaultDialer.Dial(WSS_URL, nil)
-		if err != nil {
-			p.reconnects++
-			time.Sleep(time.Duration(math.Pow(2, float64(p.reconnects))) * time.Second)
-			continue
+	var writes []tickerWrite
+	if len(touched) > 0 {
+		writes = make([]tickerWrite, 0, len(touched))
+		for _, tid := range touched {
+			info, t := p.tokens[tid], s.tickers[tid]
+			writes = append(writes, encodeWrite(info, t))
+			p.board.write(info.slot, t, info)
 		}
+	}
+	s.touched = touched
+	s.mu.Unlock()
+	p.mu.RUnlock()
 
-		p.conn = c
-		p.reconnects = 0
-
-		sub, _ := json.Marshal(map[string]any{
-			"type":       "market",
-			"assets_ids": p.assetIDs,
-		})
-		c.WriteMessage(websocket.TextMessage, sub)
-
-		go p.ping()
-		for {
-			_, msg, err := c.ReadMessage()
-			if err != nil {
-				break
-			}
-			p.handleMsg(msg)
-		}
+	if len(writes) > 0 {
+		p.writer.send(writeBatch{writes: writes})
 	}
 }
 
-func (p *PolymarketWS) ping() {
-	for p.running {
-		p.conn.WriteMessage(websocket.TextMessage, []byte("PING"))
-		time.Sleep(WS_PING_SECONDS)
+// ticker returns the state of a tracked token, nil for anything else.
+// Callers hold p.mu and s.mu.
+func (s *wsShard) ticker(tid string) *Ticker {
+	if _, ok := s.p.tokens[tid]; !ok {
+		return nil
+	}
+	t := s.tickers[tid]
+	if t == nil {
+		t = &Ticker{}
+		s.tickers[tid] = t
 	}
+	return t
 }
 
-func (p *PolymarketWS) Start(markets []*Market) {
-	p.updateMarkets(markets)
-	p.running = true
-	p.connect()
-}
+// encodeWrite encodes one ticker in the configured encoding(s) and marks it
+// written. Callers hold the shard's mu.
+func encodeWrite(info *tokenInfo, t *Ticker) tickerWrite {
+	w := tickerWrite{key: info.key, binKey: info.binKey}
 
-/*
-	============================
-	  HELPERS
+	// feeder->redis stage for latency.py (us: the stage is sub-millisecond)
+	t.TsWrUs = time.Now().UnixMicro()
+	t.written = t.TsSv
 
-============================
-*/
-func str(v any) string {
-	if v == nil {
-		return ""
+	if TICKER_ENCODING != "binary" {
+		// fresh buffer per write: the writer holds it until Exec
+		w.json = t.appendJSON(make([]byte, 0, 160+len(info.static)), info)
 	}
-	return fmt.Sprintf("%v", v)
-}
 
-func toFloat(v any) float64 {
-	if v == nil {
-		return 0
+	if TICKER_ENCODING != "json" {
+		w.bin = encodeTicker(make([]byte, TICKER_BIN_SIZE), t.BestBid, t.BidSz, t.BestAsk, t.AskSz, t.Ts, t.TsSv, info.slotTs, info.tid)
 	}
+	return w
+}
 
-	switch val := v.(type) {
-	case float64:
-		return val
-	case string:
-		f, err := strconv.ParseFloat(val, 64)
-		if err != nil {
-			return 0
+// flushRedis writes one coalesced micro-batch (see redisWriter): the plain
+// writes as one MSET plus their PUBLISHes in a single pipeline, a tx batch
+// (rollover) as MULTI/EXEC after what precedes it.
+func (p *PolymarketWS) flushRedis(batches []writeBatch) {
+	ctx := context.Background()
+	for _, b := range batches {
+		var pipe redis.Pipeliner
+		if b.tx {
+			pipe = p.redis.TxPipeline()
+		} else {
+			pipe = p.redis.Pipeline()
+		}
+		queueWrites(ctx, pipe, b.writes)
+		for _, ev := range b.events {
+			pipe.Publish(ctx, BOOK_EVENTS_CHANNEL, ev)
+		}
+		if pipe.Len() > 0 {
+			pipe.Exec(ctx)
 		}
-		return f
-	case int:
-		return float64(val)
-	case int64:
-		return float64(val)
-	default:
-		return 0
 	}
 }
 
-func maxBook(b OrderBook) (float64, float64) {
-	var p, s float64
-	for k, v := range b {
-		if k > p {
-			p, s = k, v
+// queueWrites queues one MSET of every key, then one PUBLISH per key, so a
+// subscriber woken by the publish always reads the new value.
+func queueWrites(ctx context.Context, pipe redis.Pipeliner, writes []tickerWrite) {
+	if len(writes) == 0 {
+		return
+	}
+	args := make([]any, 0, 4*len(writes))
+	for _, w := range writes {
+		if w.json != nil {
+			args = append(args, w.key, w.json)
+		}
+		if w.bin != nil {
+			args = append(args, w.binKey, w.bin)
 		}
 	}
-	return p, s
-}
+	pipe.MSet(ctx, args...)
 
-func minBook(a OrderBook) (float64, float64) {
-	p := math.MaxFloat64
-	var s float64
-	for k, v := range a {
-		if k < p {
-			p, s = k, v
+	if PUBLISH_TICKERS {
+		for i := 0; i < len(args); i += 2 {
+			pipe.Publish(ctx, args[i].(string), args[i+1])
 		}
 	}
-	if p == math.MaxFloat64 {
-		return 0, 0
+}
+
+// Start opens the shard connections and blocks until all of them give up.
+func (p *PolymarketWS) Start(markets []*Market) {
+	p.updateMarkets(markets)
+	p.startShards(numShards(len(p.assetIDs)))
+}
+
+// Stop closes every shard connection and ends Start.
+func (p *PolymarketWS) Stop() {
+	p.running = false
+	for _, s := range p.shards {
+		s.close()
 	}
-	return p, s
 }
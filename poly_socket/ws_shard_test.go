@@ -0,0 +1,209 @@
+package main
+
+import (
+	"bytes"
+	"encoding/json"
+	"fmt"
+	"io"
+	"log"
+	"net/http"
+	"net/http/httptest"
+	"os"
+	"sort"
+	"strconv"
+	"strings"
+	"sync"
+	"testing"
+	"time"
+
+	"github.com/gorilla/websocket"
+)
+
+// go test -run '^$' -bench ShardedFeed -benchtime 50000x
+//
+// A local fake market WS server streams one-change price_change frames for
+// every token a connection subscribed to; the Redis writer is replaced by a
+// counting sink, so the numbers are the WS read + decode + ticker path
+// (including the writer's micro-batch window and coalescing).
+// BenchmarkShardedFeed floods (throughput); BenchmarkShardedFeedLatency
+// paces the server at a fixed total rate and reports per-update latency:
+// "timestamp" carries the server send time in us, the sink compares it
+// with the time the batch reaches the writer.
+
+const benchFeedRate = 20000 // msgs/s, whole server, for the latency run
+
+// best bid of every token's last frame: writes are coalesced per key, so
+// the run is over once every key has carried it
+const benchLastBid = 0.999
+
+// fakeMarketServer sends perToken frames per subscribed token, as fast as
+// possible (rate 0) or at rate msgs/s spread over tokens.
+func fakeMarketServer(perToken int, rate float64, tokens int) *httptest.Server {
+	upgrader := websocket.Upgrader{CheckOrigin: func(r *http.Request) bool { return true }}
+	return httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		c, err := upgrader.Upgrade(w, r, nil)
+		if err != nil {
+			return
+		}
+		defer c.Close()
+
+		_, raw, err := c.ReadMessage()
+		if err != nil {
+			return
+		}
+		var sub struct {
+			AssetIDs []string `json:"assets_ids"`
+		}
+		json.Unmarshal(raw, &sub)
+
+		// pacing: frames owed to this connection per 1ms tick
+		var pace *time.Ticker
+		var perTick, owed float64
+		if rate > 0 {
+			pace = time.NewTicker(time.Millisecond)
+			defer pace.Stop()
+			perTick = rate * float64(len(sub.AssetIDs)) / float64(tokens) / 1000
+		}
+
+		for i := 0; i < perToken; i++ {
+			for _, tid := range sub.AssetIDs {
+				for pace != nil && owed < 1 {
+					<-pace.C
+					owed += perTick
+				}
+				owed--
+				px := 0.40 + float64(i%50)/1000
+				if i == perToken-1 {
+					px = benchLastBid
+				}
+				frame := fmt.Sprintf(
+					`{"event_type":"price_change","market":"0x1","timestamp":"%d","price_changes":[{"asset_id":"%s","price":"%.3f","size":"100","side":"BUY","best_bid":"%.3f","best_ask":"%.3f"}]}`,
+					time.Now().UnixMicro(), tid, px, px, px+0.02,
+				)
+				if err := c.WriteMessage(websocket.TextMessage, []byte(frame)); err != nil {
+					return
+				}
+			}
+		}
+
+		// hold the connection (pings only) until the client closes it
+		for {
+			if _, _, err := c.ReadMessage(); err != nil {
+				return
+			}
+		}
+	}))
+}
+
+func benchMarkets(tokens int) []*Market {
+	var markets []*Market
+	for i := 0; i < tokens/2; i++ {
+		up, down := strconv.Itoa(2*i)+benchTokenID[:60], strconv.Itoa(2*i+1)+benchTokenID[:60]
+		markets = append(markets, &Market{
+			Slug:            fmt.Sprintf("a%d-updown-15m-1766377800", i),
+			TokenIDs:        []string{up, down},
+			Outcomes:        []string{"Up", "Down"},
+			TokenOutcomeMap: map[string]string{up: "Up", down: "Down"},
+		})
+	}
+	return markets
+}
+
+// feedSink collects what the writer would send to Redis.
+type feedSink struct {
+	mu       sync.Mutex
+	want     int
+	finished map[string]bool
+	writes   int
+	flushes  int
+	lat      []int64
+	done     chan struct{}
+}
+
+var lastBid = []byte(fmt.Sprintf(`"bestBid":%g,`, benchLastBid))
+
+func (s *feedSink) flush(batches []writeBatch) {
+	now := time.Now().UnixMicro()
+	s.mu.Lock()
+	defer s.mu.Unlock()
+	s.flushes++
+	for _, b := range batches {
+		for _, w := range b.writes {
+			// appendJSON writes a fixed field order; `"ts":` (with the colon,
+			// so not ts_sv / ts_wr_us / slot_ts) is the exchange timestamp
+			if i := bytes.Index(w.json, []byte(`"ts":`)); i >= 0 {
+				v := w.json[i+5:]
+				if j := bytes.IndexByte(v, ','); j >= 0 {
+					ts, _ := strconv.ParseInt(string(v[:j]), 10, 64)
+					s.lat = append(s.lat, now-ts)
+				}
+			}
+			if bytes.Contains(w.json, lastBid) {
+				s.finished[w.key] = true
+			}
+			s.writes++
+		}
+	}
+	if len(s.finished) >= s.want && s.done != nil {
+		close(s.done)
+		s.done = nil
+	}
+}
+
+func benchShardedFeed(b *testing.B, tokens, shards int, rate float64) {
+	perToken := (b.N + tokens - 1) / tokens
+	srv := fakeMarketServer(perToken, rate, tokens)
+	defer srv.Close()
+
+	done := make(chan struct{})
+	sink := &feedSink{want: tokens, finished: make(map[string]bool), done: done}
+
+	p := NewWS([]string{}, time.Now(), nil)
+	p.url = "ws" + strings.TrimPrefix(srv.URL, "http")
+	p.writer = newRedisWriter(sink.flush)
+	p.updateMarkets(benchMarkets(tokens))
+
+	b.ResetTimer()
+	start := time.Now()
+	go p.startShards(shards)
+	select {
+	case <-done:
+	case <-time.After(2 * time.Minute):
+		b.Fatalf("timed out: %d/%d tokens finished", len(sink.finished), sink.want)
+	}
+	elapsed := time.Since(start)
+	b.StopTimer()
+	p.Stop()
+
+	sink.mu.Lock()
+	defer sink.mu.Unlock()
+	sort.Slice(sink.lat, func(i, j int) bool { return sink.lat[i] < sink.lat[j] })
+	b.ReportMetric(float64(perToken*tokens)/elapsed.Seconds(), "msgs/s")
+	b.ReportMetric(float64(sink.lat[len(sink.lat)/2]), "p50-us")
+	b.ReportMetric(float64(sink.lat[len(sink.lat)*99/100]), "p99-us")
+	b.ReportMetric(float64(sink.writes)/float64(sink.flushes), "writes/flush")
+}
+
+func BenchmarkShardedFeed(b *testing.B) {
+	runShardedFeed(b, 0)
+}
+
+func BenchmarkShardedFeedLatency(b *testing.B) {
+	runShardedFeed(b, benchFeedRate)
+}
+
+func runShardedFeed(b *testing.B, rate float64) {
+	log.SetOutput(io.Discard)
+	defer log.SetOutput(os.Stderr)
+	for _, tokens := range []int{8, 1000} {
+		conns := []int{1}
+		if n := numShards(tokens); n > 1 {
+			conns = append(conns, n)
+		}
+		for _, shards := range conns {
+			b.Run(fmt.Sprintf("tokens=%d/conns=%d", tokens, shards), func(b *testing.B) {
+				benchShardedFeed(b, tokens, shards, rate)
+			})
+		}
+	}
+}
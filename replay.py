@@ -0,0 +1,252 @@
+import time
+from datetime import datetime
+
+import numpy as np
+from arbitrage_poly import PolyArbitrage, BLACKOUT_MINUTES
+from freshness import FRESH_MAX_AGE_MS
+from ticker_recorder import load_recording, OUTCOMES
+
+
+class ReplayArbitrage(PolyArbitrage):
+    """
+    PolyArbitrage with a simulated clock and exchange.
+
+    _evaluate (the live decision logic) is untouched; _execute is replaced by a
+    fill model that looks at the recorded book `latency_ms` after the signal:
+    each leg fills in full (FOK) if the touch is still at or better than the
+    signal price with enough size, else it is rejected.
+    """
+
+    def __init__(self, symbol, params, sim):
+        params = {**params, "dry_run": True}
+        super().__init__(None, symbol, params, redis=None, executor=_NoExecutor())
+        self.sim = sim
+        self.now_ms = 0.0
+        self.busy_until = 0.0
+        self.trades = []
+
+    def _on_rollover(self, retired=()):
+        pass
+
+    def is_executing(self):
+        return self.now_ms < self.busy_until
+
+    def _execute(self, mkt_1, mkt_2, side, size, buy_px, sell_px, edge):
+        ack_ms = self.now_ms + self.sim.latency_ms
+        up, down = self.sim.state_at(self.symbol, ack_ms)
+        legs = {}
+        for name, limit, t in (("up", buy_px, up), ("down", sell_px, down)):
+            if side == "BUY":
+                ok = t is not None and 0 < t["bestAsk"] <= limit and t["askSz"] >= size
+                px = t["bestAsk"] if ok else None
+            else:
+                ok = t is not None and t["bestBid"] >= limit > 0 and t["bidSz"] >= size
+                px = t["bestBid"] if ok else None
+            legs[name] = {"ok": ok, "price": px}
+
+        fees = sum(
+            self.sim.fee_rate * min(leg["price"], 1 - leg["price"]) * size
+            for leg in legs.values() if leg["ok"]
+        )
+        if legs["up"]["ok"] and legs["down"]["ok"]:
+            status = "FILLED"
+            gross = legs["up"]["price"] + legs["down"]["price"]
+            pnl = size * ((1.0 - gross) if side == "BUY" else (gross - 1.0)) - fees
+        elif legs["up"]["ok"] or legs["down"]["ok"]:
+            status = "ONE_LEG"
+            pnl = -fees
+        else:
+            status = "FAILED"
+            pnl = 0.0
+
+        trade = {
+            "symbol": self.symbol,
+            "signal_ts": self.now_ms,
+            "ack_ts": ack_ms,
+            "side": side,
+            "size": size,
+            "signal_edge": edge,
+            "up_px": legs["up"]["price"],
+            "down_px": legs["down"]["price"],
+            "status": status,
+            "fees": fees,
+            "pnl": pnl,
+        }
+        self.trades.append(trade)
+        self.busy_until = ack_ms
+        return trade
+
+
+class _NoExecutor:
+    """Stand-in so ReplayArbitrage never starts threads."""
+
+    def submit(self, *args, **kwargs):
+        raise RuntimeError("ReplayArbitrage does not submit work")
+
+    def shutdown(self, *args, **kwargs):
+        pass
+
+
+class _SymbolView:
+    """Forward-filled UP/DOWN state of one symbol at every one of its rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.clock = np.ascontiguousarray(rows["ts_rd"])
+        idx = np.arange(len(rows))
+        is_up = rows["outcome"] == OUTCOMES["up"]
+        is_down = rows["outcome"] == OUTCOMES["down"]
+        self.last_up = np.maximum.accumulate(np.where(is_up, idx, -1))
+        self.last_down = np.maximum.accumulate(np.where(is_down, idx, -1))
+
+    def ticker(self, i):
+        if i < 0:
+            return None
+        r = self.rows[i]
+        return {
+            "bestBid": float(r["bestBid"]),
+            "bidSz": float(r["bidSz"]),
+            "bestAsk": float(r["bestAsk"]),
+            "askSz": float(r["askSz"]),
+            "ts": int(r["ts"]),
+            "ts_sv": int(r["ts_sv"]),
+            "token_id": r["token_id"].decode(),
+            "ts_rd": float(r["ts_rd"]),
+        }
+
+    def state(self, i):
+        return self.ticker(self.last_up[i]), self.ticker(self.last_down[i])
+
+
+class ReplayEngine:
+    """
+    Replays a TickerRecorder file through ReplayArbitrage faster than real time.
+
+    Every row is a point where the live engine could evaluate. Rows are
+    prefiltered with NumPy (both legs present and fresh, outside the blackout
+    minutes, top-of-book edge above `edge` in either direction); only the
+    survivors reach _evaluate / check_run_time, which is what makes a full
+    day replay in seconds.
+    """
+
+    def __init__(self, records, params, latency_ms=50.0, fee_rate=0.0):
+        self.records = records
+        self.params = params
+        self.latency_ms = latency_ms
+        self.fee_rate = fee_rate
+        self.blackout = tuple(params.get("blackout_minutes", BLACKOUT_MINUTES))
+        self.views = {}
+        self.arbs = {}
+
+    def state_at(self, symbol, ts_ms):
+        """(up, down) tickers as last recorded at or before ts_ms."""
+        view = self.views[symbol]
+        i = int(np.searchsorted(view.clock, ts_ms, side="right")) - 1
+        if i < 0:
+            return None, None
+        return view.state(i)
+
+    def _candidates(self, view):
+        rows = view.rows
+        has_both = (view.last_up >= 0) & (view.last_down >= 0)
+        up_i = np.maximum(view.last_up, 0)
+        down_i = np.maximum(view.last_down, 0)
+        now = view.clock
+
+        # superset of FreshnessModel: it accepts now - ts - offset <= limit with
+        # limit at most max_age_ms. Its offset only ever moves part way towards
+        # a sample of ts_sv - ts, so it never exceeds the largest sample it has
+        # seen, and it has seen none past this row: bound now - ts by max_age_ms
+        # plus the running maximum of ts_sv - ts. Legs without ts_sv are held
+        # to the raw now - ts <= max_age_ms. The model itself only sees
+        # candidate rows, so its intervals read long and its limits sit near
+        # max_age_ms.
+        max_age = self.params.get("fresh_max_age_ms", FRESH_MAX_AGE_MS)
+        has_sv = rows["ts_sv"] != 0
+        spread = np.where(has_sv, rows["ts_sv"] - rows["ts"], np.iinfo(np.int64).min)
+        offset_max = np.maximum.accumulate(spread)
+
+        def fresh_leg(i):
+            slack = np.where(has_sv[i], offset_max, 0)
+            return now - rows["ts"][i] <= max_age + slack
+
+        fresh = fresh_leg(up_i) & fresh_leg(down_i)
+
+        # UTC minute; same minute % 15 as check_run_time's local clock for whole-hour offsets
+        minute = (now // 60000).astype(np.int64) % 60
+        running = ~np.isin(minute % 15, self.blackout)
+
+        edge = self.params["edge"]
+        miss_b = 1.0 - (rows["bestAsk"][up_i] + rows["bestAsk"][down_i])
+        miss_s = (rows["bestBid"][up_i] + rows["bestBid"][down_i]) - 1.0
+        signal = (miss_b > edge) | (miss_s > edge)
+
+        return np.flatnonzero(has_both & fresh & running & signal)
+
+    def run(self):
+        """
+        Returns:
+            dict: {'rows', 'candidates', 'elapsed', 'trades' (list), 'summary' (per symbol)}
+        """
+        start = time.perf_counter()
+        records = self.records
+        candidates = 0
+
+        symbols = np.unique(records["symbol"])
+        for sym in symbols:
+            symbol = sym.decode()
+            rows = np.asarray(records[records["symbol"] == sym])
+            order = np.argsort(rows["ts_rd"], kind="stable")
+            view = self.views[symbol] = _SymbolView(rows[order])
+            arb = self.arbs[symbol] = ReplayArbitrage(symbol, self.params, self)
+
+            idx = self._candidates(view)
+            candidates += len(idx)
+            for i in idx:
+                now_ms = float(view.clock[i])
+                arb.now_ms = now_ms
+                if arb.is_executing():
+                    continue
+                if not arb.check_run_time(now=datetime.fromtimestamp(now_ms / 1000)):
+                    continue
+                up, down = view.state(i)
+                if not arb._fresh(up, now_ms) or not arb._fresh(down, now_ms):
+                    continue
+                arb._evaluate(up, down)
+
+        trades = [t for arb in self.arbs.values() for t in arb.trades]
+        trades.sort(key=lambda t: t["signal_ts"])
+        return {
+            "rows": len(records),
+            "candidates": candidates,
+            "elapsed": time.perf_counter() - start,
+            "trades": trades,
+            "summary": self.summary(trades),
+        }
+
+    @staticmethod
+    def summary(trades):
+        out = {}
+        for t in trades:
+            s = out.setdefault(t["symbol"], {"signals": 0, "filled": 0, "one_leg": 0, "failed": 0, "volume": 0.0, "fees": 0.0, "pnl": 0.0})
+            s["signals"] += 1
+            s[{"FILLED": "filled", "ONE_LEG": "one_leg", "FAILED": "failed"}[t["status"]]] += 1
+            if t["status"] == "FILLED":
+                s["volume"] += t["size"]
+            s["fees"] += t["fees"]
+            s["pnl"] += t["pnl"]
+        return out
+
+
+def replay_file(path, params, **kwargs):
+    """Loads a recording and replays it (see ReplayEngine)."""
+    return ReplayEngine(load_recording(path), params, **kwargs).run()
+
+
+if __name__ == "__main__":
+    import sys
+
+    result = replay_file(sys.argv[1], {"edge": 0.002}, latency_ms=50.0)
+    print(f"{result['rows']} rows, {result['candidates']} candidates, {len(result['trades'])} trades in {result['elapsed']:.2f}s")
+    for symbol, s in result["summary"].items():
+        print(symbol, s)
@@ -0,0 +1,228 @@
+import fcntl
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+from ticker_codec import TICKER_TOKEN_LEN
+
+# Shared-memory ticker board written by poly_socket (see poly_socket/board.go,
+# TICKER_BOARD_PATH): fixed slots, one per ticker key, each guarded by a seqlock.
+# Same-host readers skip the Redis round trip and the JSON parse; Redis stays
+# the source for other hosts and the fallback when a key is not on the board.
+DEFAULT_BOARD_PATH = "/dev/shm/poly_tickers.board"
+
+BOARD_MAGIC = b"PTBOARD1"
+BOARD_VERSION = 2
+BOARD_HEADER = struct.Struct("<8sIIII")     # magic, version, slots, slot size, header size
+BOARD_HEADER_SIZE = 64
+BOARD_SLOT_SIZE = 192
+BOARD_KEY_LEN = 40
+BOARD_PAYLOAD_OFF = 8 + BOARD_KEY_LEN       # ts_wr_us, then the binary ticker
+
+BOARD_SLOT_DTYPE = np.dtype([
+    ("seq", "<u8"),          # odd while a writer is inside the slot
+    ("key", f"S{BOARD_KEY_LEN}"),
+    ("ts_wr_us", "<i8"),
+    ("bestBid", "<f8"),
+    ("bidSz", "<f8"),
+    ("bestAsk", "<f8"),
+    ("askSz", "<f8"),
+    ("ts", "<i8"),
+    ("ts_sv", "<i8"),
+    ("slot_ts", "<i8"),
+    ("token_id", f"S{TICKER_TOKEN_LEN}"),
+    ("pad", "V2"),
+])
+assert BOARD_SLOT_DTYPE.itemsize == BOARD_SLOT_SIZE
+
+_SEQ = struct.Struct("<Q")
+_PAYLOAD = struct.Struct(f"<q4d3q{TICKER_TOKEN_LEN}s")
+
+# a writer holds a slot for well under a microsecond; this many failed
+# attempts means the slot is being hammered (or its writer died mid-write)
+READ_RETRIES = 1000
+
+
+class TickerBoard:
+    """
+    Lock-free reader (and test writer) of a poly_socket ticker board.
+
+    Reads copy the slot between two loads of its seq and retry unless both
+    saw the same even value, so a reader never sees a half-written ticker
+    and never blocks the feeder.
+
+    Python writers (write(), used by tools and check_ticker_board.py) exclude
+    each other with a per-slot file lock, not the feeder's CAS: do not point
+    them at slots the feeder writes. Ordering relies on x86-64 store order.
+    """
+
+    def __init__(self, path=DEFAULT_BOARD_PATH, writable=False, slots=64):
+        """
+        Args:
+            path: board file
+            writable: map read-write (needed for write()); creates the board if missing
+            slots: slot count when creating
+        """
+        self.path = path
+        self.writable = writable
+        if writable and not os.path.exists(path):
+            self._create(path, slots)
+
+        self.fd = os.open(path, os.O_RDWR if writable else os.O_RDONLY)
+        size = os.fstat(self.fd).st_size
+        self.mm = mmap.mmap(self.fd, size, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+
+        magic, version, n_slots, slot_size, header_size = BOARD_HEADER.unpack_from(self.mm, 0)
+        if magic != BOARD_MAGIC or version != BOARD_VERSION or slot_size != BOARD_SLOT_SIZE or header_size != BOARD_HEADER_SIZE:
+            self.close()
+            raise ValueError(f"{path}: not a version {BOARD_VERSION} ticker board")
+
+        self.slots = n_slots
+        self.view = np.frombuffer(self.mm, dtype=BOARD_SLOT_DTYPE, count=n_slots, offset=BOARD_HEADER_SIZE)
+        self.index = {}
+
+    @staticmethod
+    def _create(path, slots):
+        header = BOARD_HEADER.pack(BOARD_MAGIC, BOARD_VERSION, slots, BOARD_SLOT_SIZE, BOARD_HEADER_SIZE)
+        with open(path, "wb") as f:
+            f.write(header.ljust(BOARD_HEADER_SIZE, b"\x00"))
+            f.truncate(BOARD_HEADER_SIZE + slots * BOARD_SLOT_SIZE)
+
+    def close(self):
+        self.view = None
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+        os.close(self.fd)
+
+    def slot(self, key):
+        """Slot index of key, or None if the feeder has not put it on the board."""
+        i = self.index.get(key)
+        if i is not None:
+            return i
+        want = key.encode()
+        hits = np.flatnonzero(self.view["key"] == want)
+        if len(hits) == 0:
+            return None
+        i = self.index[key] = int(hits[0])
+        return i
+
+    def read_tuple(self, i, retries=READ_RETRIES):
+        """
+        Consistent read of slot i, unpacked straight from the mapping.
+
+        Returns:
+            (ts_wr_us, bestBid, bidSz, bestAsk, askSz, ts, ts_sv, slot_ts, token_id bytes),
+            or None if no stable copy was seen within `retries`
+        """
+        mm = self.mm
+        off = BOARD_HEADER_SIZE + i * BOARD_SLOT_SIZE
+        payload = off + BOARD_PAYLOAD_OFF
+        unpack_seq = _SEQ.unpack_from
+        unpack = _PAYLOAD.unpack_from
+        for _ in range(retries):
+            s1 = unpack_seq(mm, off)[0]
+            if s1 & 1:
+                continue
+            values = unpack(mm, payload)
+            if unpack_seq(mm, off)[0] == s1:
+                return values
+        return None
+
+    def read(self, key):
+        """
+        Latest ticker of key, in the feeder's JSON ticker shape plus ts_rd.
+
+        Returns:
+            dict, or None if key is not on the board (fall back to Redis) or the
+            slot was never written
+        """
+        i = self.index.get(key)
+        if i is None:
+            i = self.slot(key)
+            if i is None:
+                return None
+        values = self.read_tuple(i)
+        if values is None or not values[5]:
+            return None
+        ts_wr_us, best_bid, bid_sz, best_ask, ask_sz, ts, ts_sv, slot_ts, token = values
+        return {
+            "bestBid": best_bid,
+            "bidSz": bid_sz,
+            "bestAsk": best_ask,
+            "askSz": ask_sz,
+            "ts": ts,
+            "ts_sv": ts_sv,
+            "slot_ts": slot_ts,
+            "ts_wr_us": ts_wr_us,
+            "token_id": token.rstrip(b"\x00").decode("ascii"),
+            "ts_rd": time.time() * 1000,
+        }
+
+    def snapshot(self, retries=100):
+        """
+        Consistent copy of every slot (vectorized seqlock check over the NumPy view).
+
+        Returns:
+            np.ndarray of BOARD_SLOT_DTYPE; slots still unstable after `retries`
+            rounds have seq set to 1 (odd)
+        """
+        view = self.view
+        out = np.zeros(len(view), dtype=BOARD_SLOT_DTYPE)
+        todo = np.arange(len(view))
+        for _ in range(retries):
+            before = view["seq"][todo]
+            out[todo] = view[todo]
+            ok = (before == view["seq"][todo]) & (before & 1 == 0)
+            todo = todo[~ok]
+            if len(todo) == 0:
+                break
+        out["seq"][todo] = 1
+        return out
+
+    def write(self, key, t):
+        """
+        Writes one ticker dict (bestBid, bidSz, bestAsk, askSz, ts, ts_sv,
+        token_id, optional slot_ts and ts_wr_us) to key's slot, claiming a free slot on first use.
+        """
+        i = self.slot(key)
+        if i is None:
+            i = self._claim(key)
+        off = BOARD_HEADER_SIZE + i * BOARD_SLOT_SIZE
+        ts_wr_us = t.get("ts_wr_us")
+        if ts_wr_us is None:
+            ts_wr_us = int(time.time() * 1e6)
+        payload = _PAYLOAD.pack(
+            ts_wr_us,
+            t["bestBid"], t["bidSz"], t["bestAsk"], t["askSz"], t["ts"], t["ts_sv"], t.get("slot_ts") or 0,
+            t["token_id"].encode("ascii"),
+        )
+        fcntl.lockf(self.fd, fcntl.LOCK_EX, BOARD_SLOT_SIZE, off)
+        try:
+            seq = _SEQ.unpack_from(self.mm, off)[0]
+            _SEQ.pack_into(self.mm, off, seq + 1)
+            self.mm[off + BOARD_PAYLOAD_OFF:off + BOARD_PAYLOAD_OFF + len(payload)] = payload
+            _SEQ.pack_into(self.mm, off, seq + 2)
+        finally:
+            fcntl.lockf(self.fd, fcntl.LOCK_UN, BOARD_SLOT_SIZE, off)
+
+    def _claim(self, key):
+        want = key.encode()
+        if len(want) > BOARD_KEY_LEN:
+            raise ValueError(f"board key too long: {key}")
+        for i in range(self.slots):
+            off = BOARD_HEADER_SIZE + i * BOARD_SLOT_SIZE
+            fcntl.lockf(self.fd, fcntl.LOCK_EX, BOARD_SLOT_SIZE, off)
+            try:
+                have = bytes(self.mm[off + 8:off + BOARD_PAYLOAD_OFF]).rstrip(b"\x00")
+                if not have:
+                    self.mm[off + 8:off + BOARD_PAYLOAD_OFF] = want.ljust(BOARD_KEY_LEN, b"\x00")
+                    have = want
+            finally:
+                fcntl.lockf(self.fd, fcntl.LOCK_UN, BOARD_SLOT_SIZE, off)
+            if have == want:
+                self.index[key] = i
+                return i
+        raise ValueError(f"{self.path}: board full")
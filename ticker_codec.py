@@ -0,0 +1,82 @@
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # batch decoding is optional
+    np = None
+
+# Binary ticker layout written by poly_socket (see poly_socket/ticker_codec.go)
+# to "<key>_bin" when TICKER_ENCODING is "binary" or "both".
+TICKER_BIN_SUFFIX = "_bin"
+TICKER_TOKEN_LEN = 78
+TICKER_STRUCT = struct.Struct(f"<4d3q{TICKER_TOKEN_LEN}s")
+TICKER_SIZE = TICKER_STRUCT.size
+
+TICKER_DTYPE = None
+if np is not None:
+    TICKER_DTYPE = np.dtype([
+        ("bestBid", "<f8"),
+        ("bidSz", "<f8"),
+        ("bestAsk", "<f8"),
+        ("askSz", "<f8"),
+        ("ts", "<i8"),
+        ("ts_sv", "<i8"),
+        ("slot_ts", "<i8"),
+        ("token_id", f"S{TICKER_TOKEN_LEN}"),
+    ])
+
+
+def decode_ticker(buf, offset=0):
+    """
+    Decode one binary ticker into the same dict shape as the JSON ticker.
+
+    Args:
+        buf: bytes / bytearray / memoryview holding the record
+        offset: byte offset of the record in buf
+
+    Returns:
+        dict with bestBid, bidSz, bestAsk, askSz, ts, ts_sv, slot_ts, token_id, or None if buf is empty
+    """
+    if not buf:
+        return None
+    best_bid, bid_sz, best_ask, ask_sz, ts, ts_sv, slot_ts, token = TICKER_STRUCT.unpack_from(buf, offset)
+    return {
+        "bestBid": best_bid,
+        "bidSz": bid_sz,
+        "bestAsk": best_ask,
+        "askSz": ask_sz,
+        "ts": ts,
+        "ts_sv": ts_sv,
+        "slot_ts": slot_ts,
+        "token_id": token.rstrip(b"\x00").decode("ascii"),
+    }
+
+
+def encode_ticker(best_bid, bid_sz, best_ask, ask_sz, ts, ts_sv, token_id, slot_ts=0):
+    """
+    Encode a ticker in the feeder's binary layout (used by tests, benchmarks and replay).
+
+    Args:
+        slot_ts: start of the token's 15m slot (unix seconds), 0 if unknown
+
+    Returns:
+        bytes of length TICKER_SIZE
+    """
+    return TICKER_STRUCT.pack(best_bid, bid_sz, best_ask, ask_sz, ts, ts_sv, slot_ts, token_id.encode("ascii"))
+
+
+def decode_tickers(raws):
+    """
+    Decode many binary tickers (e.g. an MGET result) into a NumPy structured array
+    without building per-ticker dicts.
+
+    Args:
+        raws: iterable of bytes; missing values (None/empty) become zeroed rows
+
+    Returns:
+        np.ndarray of TICKER_DTYPE
+    """
+    if np is None:
+        raise ImportError("numpy is required for decode_tickers")
+    raws = [raw if raw else b"\x00" * TICKER_SIZE for raw in raws]
+    return np.frombuffer(b"".join(raws), dtype=TICKER_DTYPE)
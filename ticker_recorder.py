@@ -0,0 +1,148 @@
+import json
+import os
+import time
+
+import numpy as np
+from logger import logger_arb
+from ticker_codec import decode_ticker, TICKER_TOKEN_LEN
+
+# Pattern matching every JSON ticker channel the feeder publishes (PUBLISH_TICKERS)
+TICKER_PATTERN = "*_15m_polymarket_ticker"
+
+OUTCOMES = {"up": 0, "down": 1}
+
+# One row per ticker update, appended raw (no header) so the file can be
+# np.memmap'ed while it is still being written.
+RECORD_DTYPE = np.dtype([
+    ("ts_rd", "<f8"),      # recorder receive time, ms (the replay clock)
+    ("symbol", "S8"),
+    ("outcome", "u1"),     # OUTCOMES
+    ("bestBid", "<f8"),
+    ("bidSz", "<f8"),
+    ("bestAsk", "<f8"),
+    ("askSz", "<f8"),
+    ("ts", "<i8"),
+    ("ts_sv", "<i8"),
+    ("token_id", f"S{TICKER_TOKEN_LEN}"),
+])
+
+
+def load_recording(path, mmap=True):
+    """
+    Opens a recording written by TickerRecorder.
+
+    Args:
+        path: .bin file
+        mmap: memory-map instead of reading it into memory
+
+    Returns:
+        np.ndarray of RECORD_DTYPE (a trailing partial row, if any, is ignored)
+    """
+    rows = os.path.getsize(path) // RECORD_DTYPE.itemsize
+    if rows == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    if mmap:
+        return np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(rows,))
+    return np.fromfile(path, dtype=RECORD_DTYPE, count=rows)
+
+
+class TickerRecorder:
+    """
+    Appends every feeder ticker update to a columnar binary file for replay.py.
+
+    Rows are buffered in a NumPy array and written in blocks, so recording
+    costs one array assignment per update.
+    """
+
+    def __init__(self, redis, path, pattern=TICKER_PATTERN, flush_rows=4096, flush_seconds=1.0):
+        self.redis = redis
+        self.path = path
+        self.pattern = pattern
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.buffer = np.zeros(flush_rows, dtype=RECORD_DTYPE)
+        self.pending = 0
+        self.last_flush = time.time()
+        self.rows = 0
+        self.running = False
+        self.file = None
+
+    def _channel_fields(self, channel):
+        """'BTC_up_15m_polymarket_ticker[_bin]' -> ('BTC', 0)"""
+        parts = channel.split("_")
+        return parts[0], OUTCOMES.get(parts[1].lower(), 255)
+
+    def append(self, channel, raw, ts_rd=None):
+        """Buffers one update (raw JSON or binary ticker payload)."""
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        t = decode_ticker(raw) if channel.endswith("_bin") else json.loads(raw)
+        symbol, outcome = self._channel_fields(channel)
+
+        row = self.buffer[self.pending]
+        row["ts_rd"] = ts_rd if ts_rd is not None else time.time() * 1000
+        row["symbol"] = symbol
+        row["outcome"] = outcome
+        row["bestBid"] = t.get("bestBid") or 0.0
+        row["bidSz"] = t.get("bidSz") or 0.0
+        row["bestAsk"] = t.get("bestAsk") or 0.0
+        row["askSz"] = t.get("askSz") or 0.0
+        row["ts"] = t.get("ts") or 0
+        row["ts_sv"] = t.get("ts_sv") or 0
+        row["token_id"] = (t.get("token_id") or "").encode()
+        self.pending += 1
+
+        if self.pending >= self.flush_rows or time.time() - self.last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        if self.pending == 0:
+            return
+        if self.file is None:
+            self.file = open(self.path, "ab")
+        self.file.write(self.buffer[:self.pending].tobytes())
+        self.file.flush()
+        self.rows += self.pending
+        self.pending = 0
+        self.last_flush = time.time()
+
+    def run(self):
+        """Blocks on the feeder's ticker channels and records until stop()."""
+        self.running = True
+        logger_arb.info(f"TickerRecorder {self.pattern} -> {self.path}")
+        while self.running:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.psubscribe(self.pattern)
+                while self.running:
+                    msg = pubsub.get_message(timeout=self.flush_seconds)
+                    if msg is None:
+                        self.flush()
+                        continue
+                    self.append(msg["channel"], msg["data"])
+            except Exception as e:
+                logger_arb.error(f"TickerRecorder error {e} line: {e.__traceback__.tb_lineno}")
+                time.sleep(1)
+            finally:
+                pubsub.close()
+        self.close()
+
+    def stop(self):
+        self.running = False
+
+    def close(self):
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+if __name__ == "__main__":
+    import redis
+
+    day = time.strftime("%Y%m%d")
+    recorder = TickerRecorder(redis.Redis(host='localhost', port=6379, db=0), f"./tickers_{day}.bin")
+    try:
+        recorder.run()
+    except KeyboardInterrupt:
+        recorder.close()